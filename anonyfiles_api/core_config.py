@@ -4,7 +4,7 @@ import os
 import sys
 from contextvars import ContextVar
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import yaml
 from pydantic import BaseModel, ConfigDict, Field
@@ -14,6 +14,23 @@ from pydantic_settings import (
     SettingsConfigDict,
 )
 
+from anonyfiles_core.anonymizer.column_profiler import DEFAULT_COLUMN_PROFILING
+from anonyfiles_core.anonymizer.engine import (
+    DEFAULT_NER_PARALLEL_MIN_BLOCKS,
+    DEFAULT_NER_WORKERS,
+    DEFAULT_STREAM_CHUNK_ROWS,
+)
+from anonyfiles_core.anonymizer.ner_processor import (
+    DEFAULT_NER_BATCH_SIZE,
+    DEFAULT_NER_GATE,
+    DEFAULT_NER_MEMO_SIZE,
+    DEFAULT_NER_PACK_SIZE,
+    DEFAULT_NER_WINDOW_OVERLAP,
+    DEFAULT_NER_WINDOW_SIZE,
+)
+from anonyfiles_core.anonymizer.regex_safety import DEFAULT_CUSTOM_REGEX_TIMEOUT
+from anonyfiles_core.anonymizer.word_processor import DEFAULT_DOCX_ENGINE
+
 # Configuration du Logger
 logging.basicConfig(
     level=logging.INFO,
@@ -62,6 +79,8 @@ DEFAULT_PURGE_INTERVAL_MINUTES = 60
 DEFAULT_JOB_WORKER_COUNT = 1
 DEFAULT_JOB_TIMEOUT_SECONDS = 1800
 DEFAULT_JOB_RETRY_ATTEMPTS = 0
+# Les valeurs par défaut du moteur (NER, flux, regex, DOCX) sont importées
+# d'anonyfiles_core : API et moteur ne peuvent pas diverger.
 
 
 # --- Modèles de Configuration ---
@@ -99,6 +118,10 @@ class AnonymizationOptions(BaseModel):
     anonymizeIbans: bool = True
     anonymizeAddresses: bool = True
     strictMode: bool = False
+    # Anonymisation sélective : colonnes CSV/XLSX (nom d'en-tête, référence
+    # ou numéro 1-based) et chemins JSON (``clients.*.email``).
+    anonymizeColumns: list[str | int] | None = None
+    anonymizeJsonPaths: list[str] | None = None
     # Par défaut `True` comme l'ancien code, sauf en présence de custom rules
     # où l'appelant (router) choisit d'inverser la valeur par défaut.
     anonymizeMisc: bool = True
@@ -112,6 +135,91 @@ class AppConfig(BaseSettings):
         default="fr_core_news_md", description="Modèle spaCy par défaut"
     )
 
+    ner_batch_size: int = Field(
+        default=DEFAULT_NER_BATCH_SIZE,
+        description="Nombre de blocs envoyés à spaCy par lot (nlp.pipe).",
+        ge=1,
+    )
+    ner_workers: int = Field(
+        default=DEFAULT_NER_WORKERS,
+        description=(
+            "Nombre de processus de détection NER (modèle préchargé par processus). "
+            "1 désactive le mode multi-processus."
+        ),
+        ge=1,
+    )
+    ner_parallel_min_blocks: int = Field(
+        default=DEFAULT_NER_PARALLEL_MIN_BLOCKS,
+        description="Nombre minimal de blocs pour activer la détection multi-processus.",
+        ge=1,
+    )
+    ner_window_size: int = Field(
+        default=DEFAULT_NER_WINDOW_SIZE,
+        description=(
+            "Taille (caractères) au-delà de laquelle un bloc est analysé par "
+            "fenêtres (ex. fichier TXT/LOG volumineux)."
+        ),
+        ge=1,
+    )
+    ner_window_overlap: int = Field(
+        default=DEFAULT_NER_WINDOW_OVERLAP,
+        description="Contexte (caractères) ajouté de part et d'autre de chaque fenêtre.",
+        ge=0,
+    )
+    ner_gate: bool = Field(
+        default=DEFAULT_NER_GATE,
+        description=(
+            "Filtre pré-NER : n'appelle pas spaCy sur les blocs sans majuscule, "
+            "réduits à un jeton court ou à des placeholders (regex seules)."
+        ),
+    )
+    ner_pack_size: int = Field(
+        default=DEFAULT_NER_PACK_SIZE,
+        description=(
+            "Taille cible (caractères) des documents regroupant les petits blocs "
+            "consécutifs avant spaCy. 0 désactive le regroupement."
+        ),
+        ge=0,
+    )
+    column_profiling: Literal["regex", "skip", "off"] = Field(
+        default=DEFAULT_COLUMN_PROFILING,
+        description=(
+            "CSV/XLSX : traitement des colonnes numériques/dates détectées par "
+            "profilage (regex seules, ignorées, ou profilage désactivé)."
+        ),
+    )
+    ner_memo_size: int = Field(
+        default=DEFAULT_NER_MEMO_SIZE,
+        description=(
+            "Nombre de blocs distincts gardés en cache (LRU) pour réutiliser la "
+            "détection des cellules répétées. 0 désactive le cache."
+        ),
+        ge=0,
+    )
+    stream_chunk_rows: int = Field(
+        default=DEFAULT_STREAM_CHUNK_ROWS,
+        description=(
+            "CSV, XLSX : nombre de lignes lues, anonymisées et écrites par tranche "
+            "(mémoire bornée par la tranche). 0 traite le fichier en une fois."
+        ),
+        ge=0,
+    )
+    docx_engine: Literal["ooxml", "python-docx"] = Field(
+        default=DEFAULT_DOCX_ENGINE,
+        description=(
+            "DOCX : lecture/réécriture en flux des parties XML (ooxml) ou modèle "
+            "objet python-docx (ancien chemin)."
+        ),
+    )
+    custom_regex_timeout: float = Field(
+        default=DEFAULT_CUSTOM_REGEX_TIMEOUT,
+        description=(
+            "Budget (secondes) d'une règle personnalisée regex sur un bloc ; "
+            "au-delà, la recherche est interrompue et le job échoue. 0 désactive."
+        ),
+        ge=0,
+    )
+
     # Configuration des actions de remplacement pour chaque entité
     replacements: dict[str, EntityConfig] = Field(default_factory=dict)
 
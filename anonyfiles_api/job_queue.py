@@ -351,6 +351,7 @@ class JobQueue:
             file_type=status_payload.get("file_type"),
             entities_detected_count=status_payload.get("entities_detected_count"),
             total_replacements=status_payload.get("total_replacements"),
+            detection_stats=status_payload.get("detection_stats"),
             error=status_payload.get("error"),
         )
 
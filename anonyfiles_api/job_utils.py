@@ -357,6 +357,8 @@ class Job:
                 total_replacements=engine_result.get("total_replacements"),
                 privacy_warnings=engine_result.get("privacy_warnings", []),
                 privacy_warnings_count=engine_result.get("privacy_warnings_count", 0),
+                detection_stats=engine_result.get("detection_stats"),
+                column_profiles=engine_result.get("column_profiles"),
                 completed_at=utc_now_iso(),
             ):
                 return False
@@ -31,6 +31,10 @@ from anonyfiles_core.anonymizer.file_utils import (
     default_mapping,
     default_output,
 )
+from anonyfiles_core.anonymizer.regex_safety import (
+    UnsafeCustomRuleError,
+    screen_custom_rules,
+)
 from anonyfiles_core.anonymizer.run_logger import log_run_event
 
 from ..core_config import AnonymizationOptions, logger, set_job_id
@@ -71,6 +75,8 @@ def _prepare_engine_options(
         "strict_mode": bool(
             config_options.get("strictMode", config_options.get("strict_mode", False))
         ),
+        "anonymize_columns": config_options.get("anonymizeColumns"),
+        "anonymize_json_paths": config_options.get("anonymizeJsonPaths"),
     }
 
 
@@ -518,6 +524,10 @@ async def anonymize_preview_endpoint(
         custom_rules_list = parse_custom_replacement_rules(custom_replacement_rules)
     except ValueError:
         custom_rules_list = []
+    try:
+        screen_custom_rules(custom_rules_list)
+    except UnsafeCustomRuleError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
     has_header_bool: bool | None = None
     if has_header is not None:
@@ -741,6 +751,13 @@ async def anonymize_file_endpoint(
         logger.warning(
             f"Tâche {job_id}: custom_replacement_rules fournies mais non parsables; ignorées."
         )
+    try:
+        screen_custom_rules(custom_rules_list)
+    except UnsafeCustomRuleError as e_unsafe:
+        error_msg = str(e_unsafe)
+        logger.error(f"Tâche {job_id}: {error_msg}")
+        await current_job.set_status_as_error_async(error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
 
     try:
         entity_decisions_list = _parse_entity_decisions(entity_decisions)
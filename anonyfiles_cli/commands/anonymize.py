@@ -96,6 +96,16 @@ def process_anonymize(
         "--exclude-entities",
         help="Types d'entités à exclure, séparés par des virgules (ex: PER,LOC).",
     ),
+    columns: list[str] | None = typer.Option(
+        None,
+        "--columns",
+        help="CSV/XLSX : colonnes à anonymiser (nom d'en-tête, référence ou numéro à partir de 1), séparées par des virgules ; les autres sont recopiées telles quelles.",
+    ),
+    json_paths: list[str] | None = typer.Option(
+        None,
+        "--json-paths",
+        help="JSON : chemins à anonymiser, séparés par des virgules (ex: clients.*.email) ; le reste du document est recopié tel quel.",
+    ),
     interactive: bool = typer.Option(
         False,
         "--interactive",
@@ -155,6 +165,8 @@ def process_anonymize(
             custom_replacements_json=custom_replacements_json,
             append_timestamp=append_timestamp,
             force=force,
+            columns=columns,
+            json_paths=json_paths,
         )
 
         if not success:
@@ -81,6 +81,11 @@ def spacy_status(
         "--json",
         help="Affiche le diagnostic complet au format JSON.",
     ),
+    measure_load: bool = typer.Option(
+        False,
+        "--load",
+        help="Charge le modèle pour mesurer le démarrage à froid (instantané).",
+    ),
 ):
     """Affiche un diagnostic actionnable pour spaCy et son modèle."""
     from anonyfiles_core.anonymizer.spacy_status import get_spacy_status
@@ -90,7 +95,11 @@ def spacy_status(
         effective_config = ConfigManager.get_effective_config(config)
         effective_model = effective_config.get("spacy_model", "fr_core_news_md")
 
-    status = get_spacy_status(effective_model)
+    status = (
+        get_spacy_status(effective_model, measure_load=True)
+        if measure_load
+        else get_spacy_status(effective_model)
+    )
     if json_output:
         typer.echo(json.dumps(status, indent=2, ensure_ascii=False))
     else:
@@ -182,6 +191,21 @@ def _print_spacy_status(status):
         f"({model.get('spacy_version_constraint') or 'contrainte inconnue'})"
     )
     console.console.print(f"Message: {status['message']}")
+    cold_start = status.get("cold_start") or {}
+    if cold_start.get("loaded"):
+        source_text = (
+            "instantané" if cold_start["source"] == "snapshot" else "modèle complet"
+        )
+        console.console.print(
+            f"Chargement: {cold_start['seconds']:.2f} s ({source_text})"
+        )
+        if cold_start.get("snapshot_path"):
+            saved_text = " (créé)" if cold_start.get("snapshot_saved") else ""
+            console.console.print(
+                f"Instantané: {cold_start['snapshot_path']}{saved_text}"
+            )
+    elif cold_start.get("error"):
+        console.console.print(f"Chargement: échec ({cold_start['error']})")
     if not status["ready"]:
         console.console.print(f"Réparation: {commands['repair_model']}")
     console.console.print(f"Validation: {commands['validate_models']}")
@@ -6,6 +6,10 @@ from anonyfiles_core import AnonyfilesEngine
 from anonyfiles_core.anonymizer.file_utils import (
     timestamp,
 )
+from anonyfiles_core.anonymizer.regex_safety import (
+    UnsafeCustomRuleError,
+    screen_custom_rules,
+)
 from anonyfiles_core.anonymizer.run_logger import log_run_event
 
 from ..cli_logger import CLIUsageLogger
@@ -21,6 +25,15 @@ from ..managers.validation_manager import ValidationManager
 from ..ui.console_display import ConsoleDisplay
 
 
+def _split_option_values(values: list[str] | None) -> list[str] | None:
+    """``["a,b", "c"]`` -> ``["a", "b", "c"]`` ; ``None`` si rien n'est fourni."""
+    if not values:
+        return None
+    return [
+        part.strip() for value in values for part in value.split(",") if part.strip()
+    ]
+
+
 class AnonymizeHandler:
     def __init__(self, console: ConsoleDisplay):
         self.console = console
@@ -41,6 +54,8 @@ class AnonymizeHandler:
         custom_replacements_json: str | None,
         append_timestamp: bool,
         force: bool,
+        columns: list[str] | None = None,
+        json_paths: list[str] | None = None,
     ):
         """Launch anonymization for ``input_file``.
 
@@ -59,6 +74,8 @@ class AnonymizeHandler:
             custom_replacements_json (Optional[str]): JSON with custom replacement rules.
             append_timestamp (bool): Append run timestamp to file names.
             force (bool): Overwrite existing files without confirmation.
+            columns (Optional[List[str]]): CSV/XLSX columns to anonymize (comma-separated).
+            json_paths (Optional[List[str]]): JSON paths to anonymize (comma-separated).
 
         Returns:
             bool: ``True`` on success, ``False`` otherwise.
@@ -131,11 +148,17 @@ class AnonymizeHandler:
             custom_rules_list = list(
                 effective_config.get("custom_rules", [])
             ) + ValidationManager.parse_custom_replacements(custom_replacements_json)
+            try:
+                screen_custom_rules(custom_rules_list)
+            except UnsafeCustomRuleError as exc:
+                raise ConfigurationError(str(exc)) from exc
 
             engine = AnonyfilesEngine(
                 config=effective_config,
                 exclude_entities_cli=exclude_entities,
                 custom_replacement_rules=custom_rules_list,
+                anonymize_columns=_split_option_values(columns),
+                anonymize_json_paths=_split_option_values(json_paths),
             )
 
             processor_kwargs = {}
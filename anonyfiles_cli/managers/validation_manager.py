@@ -12,6 +12,7 @@ from anonyfiles_core.anonymizer.engine_options import (
     CustomRulesParseError,
     parse_custom_replacement_rules,
 )
+from anonyfiles_core.anonymizer.word_processor import DOCX_ENGINES
 
 from ..exceptions import ConfigurationError, FileIOError
 
@@ -60,6 +61,36 @@ SCHEMA = {
         },
         "default": [],
     },
+    "ner_batch_size": {"type": "integer", "required": False, "min": 1},
+    "ner_workers": {"type": "integer", "required": False, "min": 1},
+    "ner_parallel_min_blocks": {"type": "integer", "required": False, "min": 1},
+    "ner_window_size": {"type": "integer", "required": False, "min": 1},
+    "ner_window_overlap": {"type": "integer", "required": False, "min": 0},
+    "ner_memo_size": {"type": "integer", "required": False, "min": 0},
+    "custom_regex_timeout": {"type": "number", "required": False, "min": 0},
+    "ner_gate": {"type": "boolean", "required": False},
+    "ner_pack_size": {"type": "integer", "required": False, "min": 0},
+    "stream_chunk_rows": {"type": "integer", "required": False, "min": 0},
+    "anonymize_columns": {
+        "type": "list",
+        "required": False,
+        "schema": {"type": ["string", "integer"]},
+    },
+    "anonymize_json_paths": {
+        "type": "list",
+        "required": False,
+        "schema": {"type": "string"},
+    },
+    "column_profiling": {
+        "type": "string",
+        "required": False,
+        "allowed": ["regex", "skip", "off"],
+    },
+    "docx_engine": {
+        "type": "string",
+        "required": False,
+        "allowed": list(DOCX_ENGINES),
+    },
     "description": {"type": "string", "required": False},
     "default_output_dir": {"type": "string", "required": False},
     "backup_original": {"type": "boolean", "required": False},
@@ -0,0 +1,76 @@
+# anonyfiles_core/anonymizer/aho_corasick.py
+"""Automate d'Aho-Corasick pour rechercher de nombreux littéraux en une passe.
+
+Construit une fois par exécution (ex. les centaines d'entités manuelles
+saisies dans la GUI), il trouve toutes les occurrences — chevauchantes
+comprises — de tous les motifs en un seul parcours du texte, au lieu d'un
+``str.find`` par motif et par bloc.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+
+class AhoCorasickAutomaton:
+    """Trie des motifs + liens d'échec (recherche de littéraux exacts)."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: list[str] = []
+        self.pattern_indices: dict[str, int] = {}
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Indices des motifs reconnus en arrivant sur chaque nœud (suffixes inclus).
+        self._outputs: list[list[int]] = [[]]
+
+        for pattern in patterns:
+            if not pattern or pattern in self.pattern_indices:
+                continue
+            self.pattern_indices[pattern] = len(self.patterns)
+            self._insert(pattern, len(self.patterns))
+            self.patterns.append(pattern)
+        self._build_failure_links()
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def _insert(self, pattern: str, pattern_index: int) -> None:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append(pattern_index)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child].extend(self._outputs[self._fail[child]])
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Itère sur les ``(indice du motif, début)`` par position de fin croissante."""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        patterns = self.patterns
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_index in outputs[node]:
+                yield pattern_index, position + 1 - len(patterns[pattern_index])
@@ -1,12 +1,83 @@
 # anonymizer/base_processor.py
 import asyncio
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple, Protocol
 
 from .type_defs import TextBlocks
 
 
+class RowWriter(Protocol):
+    """Écrit des lignes dans le fichier de sortie ouvert par ``open_row_writer``
+    (dans la feuille ``sheet`` pour les classeurs)."""
+
+    def __call__(self, rows: list[list[Any]], sheet: str | None = None) -> None: ...
+
+
+class RowChunk(NamedTuple):
+    """Tranche de lignes lue par ``iter_row_chunks``.
+
+    ``rows`` sont les lignes à réécrire telles quelles (en-tête compris pour
+    la première tranche) ; ``blocks`` les cellules non vides à traiter, dont
+    ``positions`` donne la ligne et la colonne dans ``rows``. ``sheet`` nomme
+    la feuille d'origine (XLSX) : une tranche ne chevauche jamais deux feuilles.
+    """
+
+    rows: list[list[Any]]
+    blocks: TextBlocks
+    block_columns: list[str]
+    positions: list[tuple[int, int]]
+    cell_count: int
+    sheet: str | None = None
+
+    def filled_rows(self, final_blocks: TextBlocks) -> list[list[Any]]:
+        """Lignes de la tranche, cellules traitées remises à leur place."""
+        for (row_index, column_index), block_text in zip(
+            self.positions, final_blocks, strict=True
+        ):
+            self.rows[row_index][column_index] = block_text
+        return self.rows
+
+
 class BaseProcessor:
+    # Formats tabulaires : colonne d'origine de chaque bloc extrait (renseignée
+    # par ``extract_blocks``), utilisée pour le profilage des colonnes.
+    block_columns: list[str] | None = None
+    # Formats à cellules (CSV, XLSX) : l'engine n'y fait circuler que les
+    # cellules non vides via ``extract_sparse_blocks``.
+    supports_sparse_blocks: bool = False
+    # Indices (dans l'extraction complète) des blocs retenus par
+    # ``extract_sparse_blocks`` ; ``None`` tant que l'extraction est dense.
+    sparse_block_ids: list[int] | None = None
+    block_count: int = 0
+    # Formats lisibles par tranches de lignes (CSV, XLSX) : avec ``stream_chunk_rows``,
+    # l'engine lit, traite et écrit le fichier tranche par tranche.
+    supports_row_chunks: bool = False
+    # Formats en parties indépendantes (feuilles XLSX) : nom et nombre de blocs
+    # extraits de chaque partie, dans l'ordre ; la détection multi-processus
+    # aligne ses tranches dessus.
+    block_parts: list[tuple[str, int]] | None = None
+    # Formats à colonnes (CSV, XLSX) : ``extract_*`` accepte ``columns`` et
+    # n'extrait que les cellules des colonnes sélectionnées.
+    supports_column_selection: bool = False
+
+    def iter_row_chunks(
+        self, input_path: Path, chunk_rows: int, **kwargs: Any
+    ) -> Iterator[RowChunk]:
+        """Parcourt le fichier par tranches d'au plus ``chunk_rows`` lignes."""
+        raise NotImplementedError(
+            "iter_row_chunks doit être implémenté par la sous-classe."
+        )
+
+    def open_row_writer(
+        self, output_path: Path, **kwargs: Any
+    ) -> AbstractContextManager[RowWriter]:
+        """Ouvre le fichier de sortie pour y ajouter les tranches traitées."""
+        raise NotImplementedError(
+            "open_row_writer doit être implémenté par la sous-classe."
+        )
+
     def extract_blocks(self, input_path: Path, **kwargs: Any) -> TextBlocks:
         """
         Extrait les blocs de texte bruts du fichier d'entrée.
@@ -17,6 +88,44 @@ class BaseProcessor:
             "extract_blocks doit être implémenté par la sous-classe."
         )
 
+    def extract_sparse_blocks(self, input_path: Path, **kwargs: Any) -> TextBlocks:
+        """
+        Extrait uniquement les blocs non vides. Leurs indices dans l'extraction
+        complète sont conservés dans ``sparse_block_ids`` (et ``block_columns``
+        est restreint aux mêmes blocs) ; ``dense_blocks`` reconstitue la liste
+        complète à l'écriture. Les processors à cellules surchargent cette
+        méthode pour ne jamais matérialiser les cellules vides.
+        """
+        blocks = self.extract_blocks(input_path, **kwargs)
+        self.block_count = len(blocks)
+        self.sparse_block_ids = [
+            index for index, block_text in enumerate(blocks) if block_text
+        ]
+        if self.block_columns is not None:
+            self.block_columns = [
+                self.block_columns[index] for index in self.sparse_block_ids
+            ]
+        return [blocks[index] for index in self.sparse_block_ids]
+
+    def dense_blocks(self, final_processed_blocks: TextBlocks) -> TextBlocks:
+        """Replace les blocs traités à leur indice d'origine (``""`` ailleurs).
+
+        Une liste vide (contenu vide) donne un document vide ; une longueur
+        incohérente est renvoyée telle quelle pour que le processor signale
+        le désalignement comme en extraction dense.
+        """
+        if self.sparse_block_ids is None or (
+            final_processed_blocks
+            and len(final_processed_blocks) != len(self.sparse_block_ids)
+        ):
+            return final_processed_blocks
+        dense: TextBlocks = [""] * self.block_count
+        for index, block_text in zip(
+            self.sparse_block_ids, final_processed_blocks, strict=False
+        ):
+            dense[index] = block_text
+        return dense
+
     def reconstruct_and_write_anonymized_file(
         self,
         output_path: Path,
@@ -39,6 +148,12 @@ class BaseProcessor:
         """Asynchronous wrapper calling :meth:`extract_blocks` in a thread."""
         return await asyncio.to_thread(self.extract_blocks, input_path, **kwargs)
 
+    async def extract_sparse_blocks_async(
+        self, input_path: Path, **kwargs: Any
+    ) -> TextBlocks:
+        """Asynchronous wrapper calling :meth:`extract_sparse_blocks` in a thread."""
+        return await asyncio.to_thread(self.extract_sparse_blocks, input_path, **kwargs)
+
     async def reconstruct_and_write_anonymized_file_async(
         self,
         output_path: Path,
@@ -0,0 +1,132 @@
+# anonyfiles_core/anonymizer/column_profiler.py
+"""Profilage des colonnes des fichiers tabulaires (CSV, XLSX).
+
+Chaque colonne est classée à partir d'un échantillon de ses cellules :
+
+- ``numeric`` : identifiants, montants, booléens (``0/1``, ``true/false``, ``oui/non``) ;
+- ``date`` : dates et horodatages (ISO 8601, ``JJ/MM/AAAA``) ;
+- ``categorical`` : valeurs courtes et répétées (villes, statuts, sociétés) ;
+- ``free_text`` : texte libre.
+
+Les colonnes ``numeric`` et ``date`` sont dites non textuelles : spaCy n'y
+apporte rien, seules les regex (téléphone, IBAN, date...) y sont utiles. Le
+classement ne s'applique qu'aux cellules qui ressemblent effectivement au
+type de la colonne : une cellule atypique (en-tête, commentaire glissé dans
+une colonne de montants) repasse par la détection complète.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+COLUMN_KIND_NUMERIC = "numeric"
+COLUMN_KIND_DATE = "date"
+COLUMN_KIND_CATEGORICAL = "categorical"
+COLUMN_KIND_FREE_TEXT = "free_text"
+
+NON_TEXT_COLUMN_KINDS = frozenset({COLUMN_KIND_NUMERIC, COLUMN_KIND_DATE})
+
+DEFAULT_COLUMN_PROFILING = "regex"
+
+# Nombre de cellules non vides examinées par colonne.
+DEFAULT_PROFILE_SAMPLE_SIZE = 200
+
+# Part minimale de cellules typées pour classer une colonne numérique/date :
+# tolère un en-tête ou quelques valeurs atypiques dans l'échantillon.
+_NON_TEXT_MIN_RATIO = 0.9
+
+# Colonne "catégorielle" : valeurs courtes et peu de valeurs distinctes.
+_CATEGORICAL_MAX_AVG_LENGTH = 30
+_CATEGORICAL_MAX_DISTINCT_RATIO = 0.5
+
+_NUMERIC_VALUE_RE = re.compile(
+    r"[+-]?(?:\d[\d   ]*(?:[.,]\d+)?|[.,]\d+)(?:[eE][+-]?\d+)?[  ]?[%€$£]?"
+)
+_BOOLEAN_VALUES = frozenset(
+    {"true", "false", "vrai", "faux", "oui", "non", "yes", "no"}
+)
+_DATE_VALUE_RE = re.compile(
+    r"\d{4}-\d{2}-\d{2}"
+    r"(?:[T ]\d{2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?"
+    r"|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}(?:[ T]\d{1,2}:\d{2}(?::\d{2})?)?"
+)
+
+
+def classify_value(value: str) -> str | None:
+    """Retourne ``numeric``/``date`` pour une cellule non textuelle, ``None`` sinon."""
+    stripped = value.strip()
+    if not stripped:
+        return None
+    if _DATE_VALUE_RE.fullmatch(stripped):
+        return COLUMN_KIND_DATE
+    if _NUMERIC_VALUE_RE.fullmatch(stripped) or stripped.lower() in _BOOLEAN_VALUES:
+        return COLUMN_KIND_NUMERIC
+    return None
+
+
+def _classify_sample(sample: list[str]) -> str:
+    if not sample:
+        return COLUMN_KIND_CATEGORICAL
+
+    kinds = [classify_value(value) for value in sample]
+    for kind in (COLUMN_KIND_NUMERIC, COLUMN_KIND_DATE):
+        if kinds.count(kind) >= _NON_TEXT_MIN_RATIO * len(sample):
+            return kind
+
+    avg_length = sum(len(value) for value in sample) / len(sample)
+    distinct_ratio = len(set(sample)) / len(sample)
+    if (
+        avg_length <= _CATEGORICAL_MAX_AVG_LENGTH
+        and distinct_ratio <= _CATEGORICAL_MAX_DISTINCT_RATIO
+    ):
+        return COLUMN_KIND_CATEGORICAL
+    return COLUMN_KIND_FREE_TEXT
+
+
+def profile_columns(
+    blocks: list[str],
+    block_columns: list[str],
+    sample_size: int = DEFAULT_PROFILE_SAMPLE_SIZE,
+) -> dict[str, dict[str, Any]]:
+    """Classe chaque colonne à partir des ``sample_size`` premières cellules non vides.
+
+    ``block_columns[i]`` est la colonne d'origine de ``blocks[i]``. Retourne,
+    dans l'ordre d'apparition des colonnes, ``{colonne: {"column", "kind",
+    "cells", "sampled"}}``.
+    """
+    samples: dict[str, list[str]] = {}
+    cells: dict[str, int] = {}
+    for block_text, column in zip(blocks, block_columns):
+        cells[column] = cells.get(column, 0) + 1
+        sample = samples.setdefault(column, [])
+        if len(sample) < sample_size and block_text.strip():
+            sample.append(block_text.strip())
+
+    return {
+        column: {
+            "column": column,
+            "kind": _classify_sample(sample),
+            "cells": cells[column],
+            "sampled": len(sample),
+        }
+        for column, sample in samples.items()
+    }
+
+
+def non_text_block_indices(
+    blocks: list[str],
+    block_columns: list[str],
+    profiles: dict[str, dict[str, Any]],
+) -> list[int]:
+    """Indices des cellules à traiter sans spaCy.
+
+    Une cellule est retenue si sa colonne est non textuelle *et* si elle
+    ressemble elle-même au type de la colonne.
+    """
+    indices = []
+    for index, (block_text, column) in enumerate(zip(blocks, block_columns)):
+        kind = profiles[column]["kind"]
+        if kind in NON_TEXT_COLUMN_KINDS and classify_value(block_text) == kind:
+            indices.append(index)
+    return indices
@@ -0,0 +1,145 @@
+# anonyfiles_core/anonymizer/column_selection.py
+"""Sélection des colonnes (CSV, XLSX) et des chemins JSON à anonymiser.
+
+Quand seules quelques colonnes portent des données personnelles, les autres
+ne deviennent jamais des blocs : elles sont recopiées telles quelles à
+l'écriture, sans passer par les règles, la détection ni le scanner.
+
+Une colonne se désigne par :
+
+- son nom d'en-tête (CSV avec en-tête, première ligne d'une feuille XLSX) ;
+- sa référence telle qu'affichée dans ``column_profiles`` (``#3`` en CSV,
+  ``B`` ou ``Feuille1!B`` en XLSX) ;
+- son numéro, à partir de 1 (entier, ou chaîne de chiffres).
+
+Un chemin JSON est une suite de clés séparées par des points ; ``*`` désigne
+n'importe quelle clé ou n'importe quel élément de liste et un indice désigne
+un élément précis (``clients.*.email``, ``dossier.contacts.0``). Tout le
+sous-arbre d'un chemin sélectionné est anonymisé.
+
+Un sélecteur ou un chemin qui ne désigne rien lève ``ColumnSelectionError`` :
+l'engine fait alors échouer le job plutôt que d'écrire le fichier en clair.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+ColumnSelector = str | int
+JsonPathPattern = tuple[str, ...]
+
+JSON_PATH_WILDCARD = "*"
+
+
+class ColumnSelectionError(ValueError):
+    """Sélecteur de colonne qui ne désigne aucune colonne du fichier."""
+
+
+class ColumnSelection:
+    """Colonnes retenues, par nom/référence ou par numéro (1-based)."""
+
+    def __init__(self, selectors: Iterable[ColumnSelector]):
+        self.selectors: list[ColumnSelector] = []
+        self.names: set[str] = set()
+        self.numbers: set[int] = set()
+        for selector in selectors:
+            if isinstance(selector, int):
+                self.numbers.add(selector)
+            else:
+                selector = str(selector).strip()
+                if not selector:
+                    continue
+                self.names.add(selector)
+                if selector.isdigit():
+                    self.numbers.add(int(selector))
+            self.selectors.append(selector)
+        self._matched: set[ColumnSelector] = set()
+
+    def matches(self, index: int, names: Iterable[str]) -> bool:
+        """Colonne d'indice ``index`` (0-based) connue sous les noms ``names``."""
+        matched = False
+        if index + 1 in self.numbers:
+            self._matched.add(index + 1)
+            matched = True
+        for name in names:
+            if name in self.names:
+                self._matched.add(name)
+                matched = True
+        return matched
+
+    def check_all_matched(self, source: str) -> None:
+        """Refuse un sélecteur sans colonne : la faute de frappe laisserait
+        la colonne visée en clair."""
+        unmatched = [
+            selector
+            for selector in self.selectors
+            if selector not in self._matched
+            and not (
+                isinstance(selector, str) and _int_or_none(selector) in self._matched
+            )
+        ]
+        if unmatched:
+            raise ColumnSelectionError(
+                f"Colonnes à anonymiser introuvables dans {source} : "
+                + ", ".join(str(selector) for selector in unmatched)
+            )
+
+
+def _int_or_none(value: str) -> int | None:
+    return int(value) if value.isdigit() else None
+
+
+def parse_json_paths(paths: Iterable[str]) -> list[JsonPathPattern]:
+    """``["clients.*.email"]`` -> ``[("clients", "*", "email")]``."""
+    patterns = []
+    for path in paths:
+        segments = tuple(segment.strip() for segment in str(path).split("."))
+        if any(not segment for segment in segments):
+            raise ColumnSelectionError(f"Chemin JSON invalide : {path!r}")
+        patterns.append(segments)
+    return patterns
+
+
+class JsonPathSelection:
+    """Chemins JSON retenus ; chaque suffixe en cours de parcours garde
+    l'indice de son chemin d'origine pour savoir lesquels ont abouti."""
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = [str(path) for path in paths]
+        self.patterns: list[tuple[int, JsonPathPattern]] = list(
+            enumerate(parse_json_paths(self.paths))
+        )
+        self._matched: set[int] = set()
+
+    def mark_reached(self, patterns: list[tuple[int, JsonPathPattern]]) -> bool:
+        """Note les chemins entièrement parcourus ; vrai s'il y en a un."""
+        reached = False
+        for index, pattern in patterns:
+            if not pattern:
+                self._matched.add(index)
+                reached = True
+        return reached
+
+    def check_all_matched(self, source: str) -> None:
+        """Refuse un chemin sans valeur : la faute de frappe laisserait
+        le document en clair."""
+        unmatched = [
+            path for index, path in enumerate(self.paths) if index not in self._matched
+        ]
+        if unmatched:
+            raise ColumnSelectionError(
+                f"Chemins JSON à anonymiser introuvables dans {source} : "
+                + ", ".join(unmatched)
+            )
+
+
+def advance_json_paths(
+    patterns: list[tuple[int, JsonPathPattern]], key: str | int
+) -> list[tuple[int, JsonPathPattern]]:
+    """Suffixes des chemins encore possibles après être descendu dans ``key``."""
+    key_text = str(key)
+    return [
+        (index, pattern[1:])
+        for index, pattern in patterns
+        if pattern[0] == JSON_PATH_WILDCARD or pattern[0] == key_text
+    ]
@@ -1,68 +1,185 @@
 # anonyfiles_cli/anonymizer/csv_processor.py
 
 import csv
-import io
 import logging
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path  # Corrected: Removed invalid non-printable character
 from typing import Any
 
-import aiofiles
-
-from .base_processor import BaseProcessor
+from .base_processor import BaseProcessor, RowChunk, RowWriter
+from .column_selection import ColumnSelection, ColumnSelectionError, ColumnSelector
 from .type_defs import TextBlocks
 
 logger = logging.getLogger(__name__)
 # apply_positional_replacements n'est plus nécessaire ici car le traitement se fait dans anonyfiles_core
 
 
+def _column_name(header: list[str], index: int) -> str:
+    """Nom de colonne : en-tête si disponible, sinon numéro 1-based."""
+    if index < len(header) and header[index]:
+        return header[index]
+    return f"#{index + 1}"
+
+
+def _column_names(header: list[str], width: int) -> list[str]:
+    """Nom de colonne (en-tête si disponible, sinon numéro 1-based) par cellule."""
+    return [_column_name(header, index) for index in range(width)]
+
+
+def _selected_columns(
+    columns: list[ColumnSelector] | None, header: list[str], width: int
+) -> set[int] | None:
+    """
+    Indices des colonnes à anonymiser (``None`` : toutes). ``width`` est la
+    largeur de l'en-tête, ou de la première ligne d'un CSV sans en-tête.
+    """
+    if not columns:
+        return None
+    selection = ColumnSelection(columns)
+    selected = {
+        index
+        for index in range(width)
+        if selection.matches(index, (_column_name(header, index), f"#{index + 1}"))
+    }
+    selection.check_all_matched("le CSV")
+    return selected
+
+
+def _is_selected(selected: set[int] | None, column_index: int) -> bool:
+    return selected is None or column_index in selected
+
+
+def _fill_row(
+    row_orig: list[str],
+    blocks: TextBlocks,
+    block_index: int,
+    selected: set[int] | None,
+) -> tuple[list[str], int]:
+    """Ligne originale dont les cellules sélectionnées reprennent les blocs
+    traités à partir de ``block_index`` ; renvoie aussi l'indice suivant. Les
+    cellules hors sélection sont recopiées depuis le fichier original."""
+    row_block_count = (
+        len(row_orig)
+        if selected is None
+        else sum(1 for index in range(len(row_orig)) if index in selected)
+    )
+    if block_index + row_block_count > len(blocks):
+        logger.warning(
+            "Pas assez de blocs traités pour reconstruire la ligne avec %s colonnes. Index actuel: %s, Blocs restants: %s",
+            row_block_count,
+            block_index,
+            len(blocks) - block_index,
+        )
+    new_row = list(row_orig)
+    for column_index in range(len(row_orig)):
+        if not _is_selected(selected, column_index):
+            continue
+        new_row[column_index] = blocks[block_index] if block_index < len(blocks) else ""
+        block_index += 1
+    return new_row, block_index
+
+
+def _row_chunk(
+    rows: list[list[str]],
+    header: list[str],
+    first_data_row: int,
+    selected: set[int] | None = None,
+) -> RowChunk:
+    """Tranche de lignes : cellules non vides (et sélectionnées) de
+    ``rows[first_data_row:]``."""
+    blocks: TextBlocks = []
+    block_columns: list[str] = []
+    positions: list[tuple[int, int]] = []
+    cell_count = 0
+    for row_index in range(first_data_row, len(rows)):
+        row = rows[row_index]
+        cell_count += len(row)
+        for column_index, cell in enumerate(row):
+            if cell and _is_selected(selected, column_index):
+                blocks.append(cell)
+                block_columns.append(_column_name(header, column_index))
+                positions.append((row_index, column_index))
+    return RowChunk(rows, blocks, block_columns, positions, cell_count)
+
+
 class CsvProcessor(BaseProcessor):
     """
     Processor pour les fichiers .csv.
     - Chaque cellule est considérée comme un bloc.
     - Ne touche jamais l'entête (header) si présent.
+    - Avec ``columns``, seules les cellules des colonnes sélectionnées sont
+      des blocs ; les autres sont recopiées telles quelles à l'écriture.
     """
 
-    def extract_blocks(self, input_path: Path, **kwargs: Any) -> TextBlocks:
-        """
-        Extrait chaque cellule du CSV comme un bloc de texte à traiter.
-        Retourne une liste à plat contenant toutes les cellules de données (pas de header si has_header=True).
-        L'option 'has_header' est récupérée via kwargs.
-        """
-        has_header = kwargs.get("has_header", False)
+    supports_sparse_blocks = True
+    supports_row_chunks = True
+    supports_column_selection = True
+
+    # Colonnes retenues par la dernière extraction (``None`` : toutes).
+    selected_columns: set[int] | None = None
+
+    def _collect_cells(
+        self,
+        rows: Iterable[list[str]],
+        has_header: bool,
+        sparse: bool,
+        columns: list[ColumnSelector] | None = None,
+    ) -> TextBlocks:
+        """Cellules de données (toutes, ou seulement les non vides si ``sparse``)."""
         cell_texts: TextBlocks = []
-        try:
-            with open(input_path, mode="r", encoding="utf-8", newline="") as f:
-                reader = csv.reader(f)
-                for i, row in enumerate(reader):
-                    if has_header and i == 0:
-                        # Saute la ligne d'en-tête pour l'extraction des blocs
+        block_columns: list[str] = []
+        sparse_block_ids: list[int] = []
+        header: list[str] = []
+        selected: set[int] | None = None
+        block_count = 0
+        for i, row in enumerate(rows):
+            if i == 0:
+                selected = _selected_columns(
+                    columns, row if has_header else [], len(row)
+                )
+                self.selected_columns = selected
+            if has_header and i == 0:
+                # Saute la ligne d'en-tête pour l'extraction des blocs
+                header = row
+                continue
+            if selected is not None:
+                for column_index, cell in enumerate(row):
+                    if column_index not in selected:
                         continue
-                    cell_texts.extend(str(cell) for cell in row)
-        except FileNotFoundError:
-            raise
-        except Exception as e:
-            logger.error(
-                "Erreur lors de l'extraction des blocs du CSV %s: %s",
-                input_path,
-                e,
-            )
-            return []
+                    if cell or not sparse:
+                        sparse_block_ids.append(block_count)
+                        cell_texts.append(cell)
+                        block_columns.append(_column_name(header, column_index))
+                    block_count += 1
+            elif sparse:
+                for offset, cell in enumerate(row):
+                    if cell:
+                        sparse_block_ids.append(block_count + offset)
+                        cell_texts.append(cell)
+                        block_columns.append(_column_name(header, offset))
+                block_count += len(row)
+            else:
+                cell_texts.extend(str(cell) for cell in row)
+                block_columns.extend(_column_names(header, len(row)))
+                block_count += len(row)
+        self.block_columns = block_columns
+        self.sparse_block_ids = sparse_block_ids if sparse else None
+        self.block_count = block_count
         return cell_texts
 
-    async def extract_blocks_async(self, input_path: Path, **kwargs: Any) -> TextBlocks:
-        has_header = kwargs.get("has_header", False)
-        cell_texts: TextBlocks = []
+    def _extract(
+        self,
+        input_path: Path,
+        has_header: bool,
+        sparse: bool,
+        columns: list[ColumnSelector] | None = None,
+    ) -> TextBlocks:
+        self.selected_columns = None
         try:
-            async with aiofiles.open(
-                input_path, mode="r", encoding="utf-8", newline=""
-            ) as f:
-                content = await f.read()
-            reader = csv.reader(io.StringIO(content))
-            for i, row in enumerate(reader):
-                if has_header and i == 0:
-                    continue
-                cell_texts.extend(str(cell) for cell in row)
-        except FileNotFoundError:
+            with open(input_path, mode="r", encoding="utf-8", newline="") as f:
+                return self._collect_cells(csv.reader(f), has_header, sparse, columns)
+        except (FileNotFoundError, ColumnSelectionError):
             raise
         except Exception as e:
             logger.error(
@@ -70,8 +187,87 @@ class CsvProcessor(BaseProcessor):
                 input_path,
                 e,
             )
+            self.block_columns = None
+            self.sparse_block_ids = None
             return []
-        return cell_texts
+
+    def extract_blocks(self, input_path: Path, **kwargs: Any) -> TextBlocks:
+        """
+        Extrait chaque cellule du CSV comme un bloc de texte à traiter.
+        Retourne une liste à plat contenant toutes les cellules de données (pas de header si has_header=True).
+        Les options 'has_header' et 'columns' sont récupérées via kwargs.
+        """
+        return self._extract(
+            input_path,
+            kwargs.get("has_header", False),
+            False,
+            kwargs.get("columns"),
+        )
+
+    def extract_sparse_blocks(self, input_path: Path, **kwargs: Any) -> TextBlocks:
+        """Comme ``extract_blocks``, en ne gardant que les cellules non vides."""
+        return self._extract(
+            input_path,
+            kwargs.get("has_header", False),
+            True,
+            kwargs.get("columns"),
+        )
+
+    def iter_row_chunks(
+        self, input_path: Path, chunk_rows: int, **kwargs: Any
+    ) -> Iterator[RowChunk]:
+        """
+        Lit le CSV par tranches de ``chunk_rows`` lignes de données : seule la
+        tranche courante est en mémoire. L'en-tête éventuel (``has_header``)
+        ouvre la première tranche sans devenir un bloc ; comme pour
+        ``extract_sparse_blocks``, les cellules vides ne sont pas des blocs, ni
+        celles des colonnes écartées par ``columns``.
+        """
+        has_header = kwargs.get("has_header", False)
+        columns = kwargs.get("columns")
+        chunk_rows = max(1, chunk_rows)
+        header: list[str] = []
+        rows: list[list[str]] = []
+        selected: set[int] | None = None
+        # Sans en-tête, la sélection se résout sur la première ligne lue.
+        resolve_on_first_row = bool(columns) and not has_header
+        first_data_row = 0
+        with open(input_path, mode="r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            try:
+                if has_header:
+                    header = next(reader, [])
+                    rows.append(list(header))
+                    first_data_row = 1
+                    selected = _selected_columns(columns, header, len(header))
+                data_rows = 0
+                for row in reader:
+                    if resolve_on_first_row:
+                        selected = _selected_columns(columns, [], len(row))
+                        resolve_on_first_row = False
+                    rows.append(row)
+                    data_rows += 1
+                    if data_rows == chunk_rows:
+                        yield _row_chunk(rows, header, first_data_row, selected)
+                        rows, data_rows, first_data_row = [], 0, 0
+            except csv.Error as e:
+                raise ValueError(
+                    f"CSV illisible ({input_path}, ligne {reader.line_num}) : {e}"
+                ) from e
+        if rows:
+            yield _row_chunk(rows, header, first_data_row, selected)
+
+    @contextmanager
+    def open_row_writer(self, output_path: Path, **kwargs: Any) -> Iterator[RowWriter]:
+        """Fichier de sortie ouvert une fois ; chaque tranche y est ajoutée."""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, mode="w", encoding="utf-8", newline="") as fout:
+            writer = csv.writer(fout)
+
+            def write_rows(rows: list[list[Any]], sheet: str | None = None) -> None:
+                writer.writerows(rows)
+
+            yield write_rows
 
     def reconstruct_and_write_anonymized_file(
         self,
@@ -84,10 +280,12 @@ class CsvProcessor(BaseProcessor):
         Reconstruit le fichier CSV en utilisant les blocs de texte (cellules) finalisés
         et l'écrit dans output_path.
         """
+        final_processed_blocks = self.dense_blocks(final_processed_blocks)
         has_header = kwargs.get("has_header", False)
+        selected = self.selected_columns
         anonymized_rows: list[list[str]] = []
-        original_row_structures: list[int] = []
         header_row: list[str] = []
+        current_block_index = 0
 
         try:
             with open(
@@ -101,8 +299,13 @@ class CsvProcessor(BaseProcessor):
                     except StopIteration:
                         pass
 
+                # Chaque ligne est reconstruite à la relecture : le fichier
+                # original n'est jamais gardé en mémoire en plus de la sortie.
                 for row_orig in reader_orig:
-                    original_row_structures.append(len(row_orig))
+                    new_row, current_block_index = _fill_row(
+                        row_orig, final_processed_blocks, current_block_index, selected
+                    )
+                    anonymized_rows.append(new_row)
         except FileNotFoundError:
             logger.error(
                 "Erreur critique : Fichier original %s non trouvé lors de la reconstruction.",
@@ -125,32 +328,7 @@ class CsvProcessor(BaseProcessor):
                     writer.writerow(header_row)
             return
 
-        current_block_index = 0
-        for num_cols_in_original_row in original_row_structures:
-            if current_block_index + num_cols_in_original_row > len(
-                final_processed_blocks
-            ):
-                logger.warning(
-                    "Pas assez de blocs traités pour reconstruire la ligne avec %s colonnes. Index actuel: %s, Blocs restants: %s",
-                    num_cols_in_original_row,
-                    current_block_index,
-                    len(final_processed_blocks) - current_block_index,
-                )
-                actual_cols_to_take = min(
-                    num_cols_in_original_row,
-                    len(final_processed_blocks) - current_block_index,
-                )
-                new_row = final_processed_blocks[
-                    current_block_index : current_block_index + actual_cols_to_take
-                ]
-                new_row.extend([""] * (num_cols_in_original_row - actual_cols_to_take))
-            else:
-                new_row = final_processed_blocks[
-                    current_block_index : current_block_index + num_cols_in_original_row
-                ]
-
-            anonymized_rows.append(new_row)
-            current_block_index += num_cols_in_original_row
+        current_block_index = min(current_block_index, len(final_processed_blocks))
 
         if current_block_index < len(final_processed_blocks):
             logger.warning(
@@ -169,107 +347,3 @@ class CsvProcessor(BaseProcessor):
                 output_path,
                 e,
             )
-
-    async def reconstruct_and_write_anonymized_file_async(
-        self,
-        output_path: Path,
-        final_processed_blocks: TextBlocks,
-        original_input_path: Path,
-        **kwargs: Any,
-    ) -> None:
-        has_header = kwargs.get("has_header", False)
-        anonymized_rows: list[list[str]] = []
-        original_row_structures: list[int] = []
-        header_row: list[str] = []
-
-        try:
-            async with aiofiles.open(
-                original_input_path, mode="r", encoding="utf-8", newline=""
-            ) as f_orig:
-                content = await f_orig.read()
-            reader_orig = csv.reader(io.StringIO(content))
-            if has_header:
-                try:
-                    header_row = next(reader_orig)
-                    anonymized_rows.append(list(header_row))
-                except StopIteration:
-                    pass
-
-            for row_orig in reader_orig:
-                original_row_structures.append(len(row_orig))
-        except FileNotFoundError:
-            logger.error(
-                "Erreur critique : Fichier original %s non trouvé lors de la reconstruction.",
-                original_input_path,
-            )
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            async with aiofiles.open(
-                output_path, mode="w", encoding="utf-8", newline=""
-            ) as fout:
-                pass
-            return
-        except Exception as e:
-            logger.error(
-                "Erreur lors de la lecture du fichier CSV original %s pour reconstruction : %s",
-                original_input_path,
-                e,
-            )
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            async with aiofiles.open(
-                output_path, mode="w", encoding="utf-8", newline=""
-            ) as fout:
-                if header_row:
-                    buf = io.StringIO()
-                    writer = csv.writer(buf)
-                    writer.writerow(header_row)
-                    await fout.write(buf.getvalue())
-            return
-
-        current_block_index = 0
-        for num_cols_in_original_row in original_row_structures:
-            if current_block_index + num_cols_in_original_row > len(
-                final_processed_blocks
-            ):
-                logger.warning(
-                    "Pas assez de blocs traités pour reconstruire la ligne avec %s colonnes. Index actuel: %s, Blocs restants: %s",
-                    num_cols_in_original_row,
-                    current_block_index,
-                    len(final_processed_blocks) - current_block_index,
-                )
-                actual_cols_to_take = min(
-                    num_cols_in_original_row,
-                    len(final_processed_blocks) - current_block_index,
-                )
-                new_row = final_processed_blocks[
-                    current_block_index : current_block_index + actual_cols_to_take
-                ]
-                new_row.extend([""] * (num_cols_in_original_row - actual_cols_to_take))
-            else:
-                new_row = final_processed_blocks[
-                    current_block_index : current_block_index + num_cols_in_original_row
-                ]
-
-            anonymized_rows.append(new_row)
-            current_block_index += num_cols_in_original_row
-
-        if current_block_index < len(final_processed_blocks):
-            logger.warning(
-                "%s blocs traités n'ont pas été utilisés dans la reconstruction du CSV.",
-                len(final_processed_blocks) - current_block_index,
-            )
-
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            csv_buffer = io.StringIO()
-            writer = csv.writer(csv_buffer)
-            writer.writerows(anonymized_rows)
-            async with aiofiles.open(
-                output_path, mode="w", encoding="utf-8", newline=""
-            ) as fout:
-                await fout.write(csv_buffer.getvalue())
-        except Exception as e:
-            logger.error(
-                "Erreur lors de l'écriture du fichier CSV anonymisé %s: %s",
-                output_path,
-                e,
-            )
@@ -1,11 +1,49 @@
 # anonyfiles_cli/anonymizer/custom_rules_processor.py
 
 import re
+import time
+from collections.abc import Iterable, Iterator
 from typing import Any
 
+import regex
 import typer
 
+from .aho_corasick import AhoCorasickAutomaton
 from .audit import AuditLogger
+from .regex_safety import (
+    DEFAULT_CUSTOM_REGEX_TIMEOUT,
+    CustomRuleTimeoutError,
+    bounded_finditer,
+    compile_custom_regex,
+    screen_custom_rule,
+)
+from .span_index import SpanIndex
+
+# Motifs non combinables dans une alternance : références arrière et
+# conditionnelles dépendent de la numérotation des groupes, et les drapeaux
+# globaux ``(?i)`` ne sont admis qu'en tête d'expression.
+_UNCOMBINABLE_REGEX_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)")
+
+
+def _format_token(replacement_base: str, count: int) -> str:
+    """Token numéroté ; le compteur précède un ``]`` ou ``}`` final (``[NOM_1]``)."""
+    if replacement_base.endswith(("]", "}")):
+        return f"{replacement_base[:-1]}_{count}{replacement_base[-1]}"
+    return f"{replacement_base}_{count}"
+
+
+def _combined_regex_gate(sources: list[str]) -> Any | None:
+    """Alternance des règles regex, ou ``None`` si l'une n'est pas combinable.
+
+    Sans correspondance de l'alternance, aucune règle ne correspond ; sinon
+    sa position est la plus petite position de départ possible.
+    """
+    if not sources or any(_UNCOMBINABLE_REGEX_RE.search(src) for src in sources):
+        return None
+    try:
+        return compile_custom_regex("|".join(f"(?:{src})" for src in sources))
+    except regex.error:
+        return None
 
 
 class CustomRulesProcessor:
@@ -17,14 +55,23 @@ class CustomRulesProcessor:
         self,
         custom_replacement_rules: list[dict[str, Any]] | None,
         audit_logger: AuditLogger,
+        regex_timeout: float = DEFAULT_CUSTOM_REGEX_TIMEOUT,
     ):
+        """
+        Les règles regex sont compilées avec le moteur ``regex`` : une règle
+        à quantificateurs imbriqués lève ``UnsafeCustomRuleError`` (refus
+        explicite plutôt que règle ignorée, qui laisserait passer les données
+        qu'elle devait masquer) et chaque règle dispose de ``regex_timeout``
+        secondes par bloc (``0`` désactive le budget).
+        """
         self.custom_rules: list[dict[str, Any]] = []
         self.audit_logger = audit_logger
+        self.regex_timeout = regex_timeout
         self.custom_replacements_mapping: dict[str, str] = {}
         self.custom_replacements_count = 0
 
         if custom_replacement_rules:
-            for rule in custom_replacement_rules:
+            for rule_index, rule in enumerate(custom_replacement_rules):
                 # Ignore empty patterns early
                 pattern_str = rule.get("pattern")
                 if not pattern_str:
@@ -33,134 +80,307 @@ class CustomRulesProcessor:
                 # Optimisation: Compilation unique des regex au chargement
                 if rule.get("isRegex", False):
                     try:
-                        rule["compiled_pattern"] = re.compile(
-                            pattern_str, flags=re.IGNORECASE
-                        )
-                    except re.error as e:
+                        rule["compiled_pattern"] = compile_custom_regex(pattern_str)
+                    except regex.error as e:
                         typer.echo(
                             f"AVERTISSEMENT (CustomRulesProcessor): Regex invalide pour la règle personnalisée '{pattern_str}': {e}. Règle ignorée.",
                             err=True,
                         )
                         continue
+                    screen_custom_rule(rule_index, pattern_str)
 
                 # Initialisation d'un compteur spécifique à cette règle
                 rule["match_counter"] = 0
+                rule["rule_index"] = rule_index
 
                 self.custom_rules.append(rule)
 
+        self.rule_hits: list[int] = [0] * len(self.custom_rules)
+        self._literal_tokens_pending = True
+        self._compile_matchers()
+
         if self.custom_rules:
             typer.echo(
                 f"DEBUG (CustomRulesProcessor Init): Initialisé avec {len(self.custom_rules)} règle(s) personnalisée(s)."
             )
 
+    def _compile_matchers(self) -> None:
+        """Compile toutes les règles en deux recherches par bloc.
+
+        - règles littérales : un automate d'Aho-Corasick (toutes les occurrences
+          de tous les motifs en un parcours), précédé d'une alternance ``re``
+          qui écarte en C les blocs sans aucun motif ;
+        - règles regex : une alternance des motifs combinables sert de filtre et
+          donne la position de départ des ``finditer`` par règle.
+        """
+        rules_by_literal: dict[str, list[int]] = {}
+        regex_sources: list[str] = []
+        self._regex_rule_indices: list[int] = []
+        for rule_index, rule in enumerate(self.custom_rules):
+            if rule.get("compiled_pattern") is not None:
+                self._regex_rule_indices.append(rule_index)
+                regex_sources.append(rule["pattern"])
+            else:
+                rules_by_literal.setdefault(rule["pattern"], []).append(rule_index)
+
+        self._literal_automaton = AhoCorasickAutomaton(rules_by_literal)
+        self._rules_by_literal_index = {
+            self._literal_automaton.pattern_indices[pattern]: rule_indices
+            for pattern, rule_indices in rules_by_literal.items()
+        }
+        self._literal_gate = (
+            re.compile(
+                "|".join(
+                    re.escape(pattern)
+                    for pattern in sorted(rules_by_literal, key=len, reverse=True)
+                )
+            )
+            if rules_by_literal
+            else None
+        )
+        self._regex_gate = _combined_regex_gate(regex_sources)
+
+    def _find_occurrences(self, text_block: str) -> dict[int, list[tuple[int, int]]]:
+        """Occurrences des règles littérales par indice de règle, dans l'ordre du texte."""
+        occurrences: dict[int, list[tuple[int, int]]] = {}
+
+        first_literal = (
+            self._literal_gate.search(text_block) if self._literal_gate else None
+        )
+        if first_literal is not None:
+            offset = first_literal.start()
+            patterns = self._literal_automaton.patterns
+            for pattern_index, start in self._literal_automaton.iter_matches(
+                text_block[offset:]
+            ):
+                span = (offset + start, offset + start + len(patterns[pattern_index]))
+                for rule_index in self._rules_by_literal_index[pattern_index]:
+                    occurrences.setdefault(rule_index, []).append(span)
+
+        return occurrences
+
+    def _deadline(self) -> float:
+        if self.regex_timeout <= 0:
+            return float("inf")
+        return time.monotonic() + self.regex_timeout
+
+    def _regex_search_start(self, text_block: str) -> int | None:
+        """Position de départ des règles regex, ``None`` si aucune ne peut correspondre."""
+        if not self._regex_rule_indices:
+            return None
+        if self._regex_gate is None:
+            return 0
+        try:
+            first_regex = self._regex_gate.search(
+                text_block, timeout=self.regex_timeout or None
+            )
+        except TimeoutError:
+            # Filtre trop lent : les recherches par règle désigneront la fautive.
+            return 0
+        return None if first_regex is None else first_regex.start()
+
+    def _regex_spans(
+        self,
+        rule: dict[str, Any],
+        text_block: str,
+        search_start: int,
+        claimed: SpanIndex,
+    ) -> list[tuple[int, int]]:
+        """Correspondances de la règle dans les portions non encore remplacées.
+
+        Chaque portion est recherchée dans le bloc entier : ``\\b``, ``$`` et
+        les assertions voient le texte voisin. Une correspondance qui déborde
+        sur un remplacement précédent est écartée ; la portion est alors
+        recherchée seule, bornée à sa fin. Deux écarts avec une réécriture
+        séquentielle du bloc : aux frontières d'un remplacement, les
+        assertions voient le texte original et non le token, et aucune
+        correspondance ne chevauche un token. Le budget ``regex_timeout``
+        couvre toutes les portions du bloc ; s'il est épuisé, la recherche est
+        interrompue et ``CustomRuleTimeoutError`` interrompt le traitement.
+        """
+        compiled_pattern = rule["compiled_pattern"]
+        deadline = self._deadline()
+        try:
+            return [
+                match.span()
+                for gap_start, gap_end in claimed.gaps(search_start, len(text_block))
+                for match in self._gap_matches(
+                    compiled_pattern, text_block, gap_start, gap_end, deadline
+                )
+                if match.end() > match.start()
+            ]
+        except TimeoutError as e:
+            raise CustomRuleTimeoutError(
+                rule["rule_index"],
+                rule["pattern"],
+                f"budget de {self.regex_timeout:g} s dépassé sur un bloc de "
+                f"{len(text_block)} caractères (backtracking probable). "
+                "Simplifiez la regex ou augmentez custom_regex_timeout.",
+            ) from e
+        except Exception as e:
+            typer.echo(
+                f"ERREUR (CustomRulesProcessor): Échec application règle '{rule['pattern']}': {e}",
+                err=True,
+            )
+            return []
+
+    @staticmethod
+    def _gap_matches(
+        compiled_pattern: Any,
+        text_block: str,
+        gap_start: int,
+        gap_end: int,
+        deadline: float,
+    ) -> Iterator[Any]:
+        """Correspondances contenues dans ``[gap_start, gap_end)``."""
+        for match in bounded_finditer(
+            compiled_pattern, text_block, gap_start, len(text_block), deadline
+        ):
+            if match.start() >= gap_end:
+                return
+            if match.end() <= gap_end:
+                yield match
+                continue
+            # Déborde sur un remplacement : reprise bornée à la portion.
+            yield from bounded_finditer(
+                compiled_pattern, text_block, match.start(), gap_end, deadline
+            )
+            return
+
+    def _next_token(self, rule: dict[str, Any]) -> str:
+        rule["match_counter"] += 1
+        return _format_token(
+            rule.get("replacement", "[CUSTOM_REDACTED]"), rule["match_counter"]
+        )
+
     def apply_to_block(self, text_block: str) -> str:
         """
         Applique les règles personnalisées à un bloc de texte donné.
         Met à jour le journal d'audit et le mapping des règles personnalisées.
-        Utilise les expressions régulières compilées pour une performance optimale.
         Garantit l'unicité des tokens générés (bijectivité).
         """
-        if not self.custom_rules:
-            return text_block
+        return self.apply_to_block_with_spans(text_block)[0]
 
-        modified_text = text_block
-        for rule in self.custom_rules:
-            pattern_str = rule.get("pattern")
-            replacement_base = rule.get("replacement", "[CUSTOM_REDACTED]")
-            is_regex = rule.get("isRegex", False)
-            compiled_pattern: re.Pattern | None = rule.get("compiled_pattern")
+    def apply_to_block_with_spans(
+        self, text_block: str
+    ) -> tuple[str, list[tuple[int, int]]]:
+        """
+        Comme ``apply_to_block``, en renvoyant aussi les spans ``[début, fin)``
+        des tokens insérés, dans le texte produit (liste vide si le bloc est
+        inchangé). L'engine s'en sert pour masquer les tokens avant le NER et
+        le scanner anti-fuite sans les rechercher à nouveau.
 
-            if not pattern_str:
-                continue
+        Le bloc est parcouru une fois par les matchers compilés ; les règles
+        se partagent ensuite le texte dans l'ordre de la liste : une
+        occurrence qui chevauche le remplacement d'une règle précédente est
+        ignorée, comme si cette règle avait déjà réécrit le bloc.
+        """
+        if not self.custom_rules:
+            return text_block, []
 
-            try:
-                if is_regex and compiled_pattern is not None:
-                    # Callback unifié pour gérer la logique d'unicité
-                    def replacement_handler(match):
-                        original_text = match.group(0)
-
-                        # Vérifier si on a déjà tokenisé ce texte précis
-                        if original_text in self.custom_replacements_mapping:
-                            return self.custom_replacements_mapping[original_text]
-
-                        # Sinon, générer un nouveau token unique
-                        rule["match_counter"] += 1
-                        current_count = rule["match_counter"]
-
-                        # Gestion basique du template remplacement
-                        try:
-                            # Note: match.expand ne peut pas être utilisé facilement si on modifie dynamically le remplacement
-                            # On suppose ici que replacement_base est statique ou contient des groupes simples.
-                            # Pour injecter le compteur, on l'ajoute à la fin.
-
-                            # Heuristique : Si le remplacement finit par ] ou }, on insère avant
-                            if replacement_base.endswith(("]", "}")):
-                                final_token = f"{replacement_base[:-1]}_{current_count}{replacement_base[-1]}"
-                            else:
-                                final_token = f"{replacement_base}_{current_count}"
-
-                            # Si backreferences nécessaires, c'est plus complexe car le compteur ferait partie du texte.
-                            # Ici on simplifie : le custom rule est un TAG.
-                        except Exception:
-                            final_token = f"{replacement_base}_{current_count}"
+        occurrences = self._find_occurrences(text_block)
+        regex_search_start = self._regex_search_start(text_block)
+        # Au premier bloc, chaque règle littérale réserve son token même sans
+        # occurrence (ordre d'attribution des compteurs inchangé).
+        if self._literal_tokens_pending:
+            self._literal_tokens_pending = False
+            rule_indices: Iterable[int] = range(len(self.custom_rules))
+        elif regex_search_start is not None:
+            rule_indices = sorted({*occurrences, *self._regex_rule_indices})
+        elif occurrences:
+            rule_indices = sorted(occurrences)
+        else:
+            return text_block, []
 
+        mapping = self.custom_replacements_mapping
+        claimed = SpanIndex()
+        replacements: list[tuple[int, int, str]] = []
+        for rule_index in rule_indices:
+            rule = self.custom_rules[rule_index]
+            pattern_str = rule["pattern"]
+
+            if rule.get("compiled_pattern") is not None:
+                if regex_search_start is None:
+                    spans = []
+                else:
+                    spans = self._regex_spans(
+                        rule, text_block, regex_search_start, claimed
+                    )
+                for start, end in spans:
+                    original_text = text_block[start:end]
+                    token = mapping.get(original_text)
+                    if token is None:
+                        token = self._next_token(rule)
                         self.audit_logger.log(
                             original_text,
-                            final_token,
+                            token,
                             "custom_regex",
                             1,
                             original_text=original_text,
                         )
                         self.custom_replacements_count += 1
-                        self.custom_replacements_mapping[original_text] = final_token
-                        return final_token
-
-                    modified_text = compiled_pattern.sub(
-                        replacement_handler, modified_text
+                        mapping[original_text] = token
+                    claimed.add(start, end)
+                    replacements.append((start, end, token))
+                hits = len(spans)
+            else:
+                spans = occurrences.get(rule_index, [])
+                token = mapping.get(pattern_str)
+                if token is None:
+                    token = self._next_token(rule)
+                    mapping[pattern_str] = token
+                # Occurrences non chevauchantes de gauche à droite (str.replace).
+                hits = 0
+                search_start = 0
+                for start, end in spans:
+                    if start < search_start or claimed.overlaps(start, end):
+                        continue
+                    claimed.add(start, end)
+                    replacements.append((start, end, token))
+                    search_start = end
+                    hits += 1
+                if hits:
+                    self.audit_logger.log(
+                        pattern_str,
+                        token,
+                        "custom_text",
+                        hits,
+                        original_text=pattern_str,
                     )
+                    self.custom_replacements_count += hits
+            self.rule_hits[rule_index] += hits
 
-                else:
-                    # Remplacement texte simple
-                    # Problème : str.replace remplace TOUTES les occurrences d'un coup.
-                    # Pour garantir l'unicité (bijectivité), il faut que "A" -> "T1", "A" -> "T1" (ça c'est ok).
-                    # Mais si on a plusieurs occurrences de "A", elles deviennent toutes "T1". C'est correct pour la bijection.
-                    # Le problème c'est que str.replace ne permet pas d'incrémenter globalement si c'est la 1ère fois qu'on voit ce mot
-                    # vs la 2ème fois qu'on le voit dans un autre bloc, mais on veut garder le MÊME token.
-
-                    # Approche : On vérifie si pattern_str est dans le mapping.
-                    if pattern_str in self.custom_replacements_mapping:
-                        token = self.custom_replacements_mapping[pattern_str]
-                    else:
-                        rule["match_counter"] += 1
-                        current_count = rule["match_counter"]
-                        if replacement_base.endswith(("]", "}")):
-                            token = f"{replacement_base[:-1]}_{current_count}{replacement_base[-1]}"
-                        else:
-                            token = f"{replacement_base}_{current_count}"
-
-                        self.custom_replacements_mapping[pattern_str] = token
-                        # Log pour la première occurrence (ou à chaque fois ?)
-                        # Audit log attend généralement un log par substitution.
-
-                    count = modified_text.count(pattern_str)
-                    if count > 0:
-                        modified_text = modified_text.replace(pattern_str, token)
-                        self.audit_logger.log(
-                            pattern_str,
-                            token,
-                            "custom_text",
-                            count,
-                            original_text=pattern_str,
-                        )
-                        self.custom_replacements_count += count
+        if not replacements:
+            return text_block, []
+        replacements.sort()
+        parts: list[str] = []
+        token_spans: list[tuple[int, int]] = []
+        cursor = 0
+        output_length = 0
+        for start, end, token in replacements:
+            parts.append(text_block[cursor:start])
+            output_length += start - cursor
+            parts.append(token)
+            token_spans.append((output_length, output_length + len(token)))
+            output_length += len(token)
+            cursor = end
+        parts.append(text_block[cursor:])
+        return "".join(parts), token_spans
 
-            except Exception as e:
-                typer.echo(
-                    f"ERREUR (CustomRulesProcessor): Échec application règle '{pattern_str}': {e}",
-                    err=True,
-                )
+    def get_rule_hit_stats(self) -> list[dict[str, Any]]:
+        """Nombre de remplacements par règle (indice dans la liste fournie).
 
-        return modified_text
+        Les motifs ne sont pas repris : ils contiennent souvent les valeurs
+        sensibles elles-mêmes (noms de clients, codes internes).
+        """
+        return [
+            {
+                "rule": rule["rule_index"],
+                "is_regex": rule.get("compiled_pattern") is not None,
+                "hits": hits,
+            }
+            for rule, hits in zip(self.custom_rules, self.rule_hits, strict=True)
+        ]
 
     def get_custom_replacements_mapping(self) -> dict[str, str]:
         return self.custom_replacements_mapping
@@ -171,3 +391,5 @@ class CustomRulesProcessor:
     def reset(self):
         self.custom_replacements_mapping = {}
         self.custom_replacements_count = 0
+        self.rule_hits = [0] * len(self.custom_rules)
+        self._literal_tokens_pending = True
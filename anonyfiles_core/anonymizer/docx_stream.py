@@ -0,0 +1,456 @@
+# anonyfiles_core/anonymizer/docx_stream.py
+"""Lecture et réécriture d'un .docx directement dans son archive OOXML.
+
+Le chemin python-docx charge tout le document en arbre lxml et le parcourt via
+des objets proxy, deux fois (extraction puis reconstruction). Ici, les parties
+texte (``word/document.xml``, en-têtes et pieds de page) sont lues en flux par
+expat, sans construire d'arbre :
+
+- un bloc = un paragraphe ``w:p``, dans l'ordre du document (corps, tableaux,
+  zones de texte et contrôles de contenu compris), puis les en-têtes et les
+  pieds de page ;
+- le texte d'un paragraphe est la concaténation de ses ``w:t``, les
+  tabulations (``w:tab``) et sauts de ligne (``w:br``, ``w:cr``) devenant
+  ``\\t`` et ``\\n`` ;
+- à la réécriture, seuls les ``w:t`` dont le texte change sont remplacés dans
+  les octets d'origine : balises, propriétés de mise en forme et autres
+  membres de l'archive sont recopiés à l'identique.
+
+Le nouveau texte d'un paragraphe est réparti sur ses ``w:t`` par alignement
+avec l'ancien (``difflib``) : un remplacement prend la mise en forme du run où
+commençait le texte remplacé, le reste du paragraphe garde la sienne.
+"""
+
+from __future__ import annotations
+
+import copy
+import difflib
+import re
+import shutil
+import zipfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import IO
+from xml.parsers import expat
+from xml.sax.saxutils import escape
+
+WORDML_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+DOCUMENT_PART = "word/document.xml"
+
+_HEADER_FOOTER_PART = re.compile(r"word/(header|footer)(\d*)\.xml")
+_READ_SIZE = 1 << 16
+_SEPARATORS = {"tab": "\t", "br": "\n", "cr": "\n"}
+_TAG_NAME_END = re.compile(rb"[\s/>]")
+# Mots et caractères isolés : unités d'alignement ancien/nouveau texte.
+_TOKEN = re.compile(r"\w+|\W", re.DOTALL)
+
+# (début, fin) dans le texte du paragraphe, octet de début de la balise
+# ouvrante, position signalée par expat à la fermeture.
+Slot = tuple[int, int, int, int]
+# Position dans le texte, octet de début de la balise, position de fermeture.
+Separator = tuple[int, int, int]
+
+
+class _Paragraph:
+    __slots__ = ("index", "length", "parts", "separators", "slots")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.parts: list[str] = []
+        self.length = 0
+        self.slots: list[Slot] = []
+        self.separators: list[Separator] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+class _ParagraphScanner:
+    """Parcourt une partie XML en flux et signale chaque ``w:p`` refermé.
+
+    ``on_paragraph(paragraph, depth)`` reçoit le paragraphe et le nombre de
+    paragraphes encore ouverts (0 hors zone de texte imbriquée).
+    """
+
+    def __init__(self, on_paragraph: Callable[[_Paragraph, int], None]):
+        self._on_paragraph = on_paragraph
+        self._parser = expat.ParserCreate(namespace_separator=" ")
+        self._parser.buffer_text = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._characters
+        self._elements: list[str | None] = []
+        self._open: list[_Paragraph] = []
+        self._text: list[str] | None = None
+        self._text_start = 0
+        self.count = 0
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        self._parser.Parse(data, final)
+
+    @property
+    def in_paragraph(self) -> bool:
+        return bool(self._open)
+
+    def _start(self, name: str, _attrs: dict[str, str]) -> None:
+        uri, _, local = name.rpartition(" ")
+        word = local if uri == WORDML_NS else None
+        parent = self._elements[-1] if self._elements else None
+        self._elements.append(word)
+        if word == "p":
+            self._open.append(_Paragraph(self.count))
+            self.count += 1
+        elif parent == "r" and self._open:
+            if word == "t":
+                self._text = []
+                self._text_start = self._parser.CurrentByteIndex
+            elif word in _SEPARATORS:
+                paragraph = self._open[-1]
+                paragraph.separators.append(
+                    (paragraph.length, self._parser.CurrentByteIndex, -1)
+                )
+                paragraph.parts.append(_SEPARATORS[word])
+                paragraph.length += 1
+
+    def _end(self, _name: str) -> None:
+        word = self._elements.pop()
+        if word == "p":
+            paragraph = self._open.pop()
+            self._on_paragraph(paragraph, len(self._open))
+        elif word == "t" and self._text is not None:
+            paragraph = self._open[-1]
+            text = "".join(self._text)
+            paragraph.slots.append(
+                (
+                    paragraph.length,
+                    paragraph.length + len(text),
+                    self._text_start,
+                    self._parser.CurrentByteIndex,
+                )
+            )
+            paragraph.parts.append(text)
+            paragraph.length += len(text)
+            self._text = None
+        elif word in _SEPARATORS and self._open:
+            paragraph = self._open[-1]
+            if paragraph.separators and paragraph.separators[-1][2] == -1:
+                position, start, _ = paragraph.separators[-1]
+                paragraph.separators[-1] = (
+                    position,
+                    start,
+                    self._parser.CurrentByteIndex,
+                )
+
+    def _characters(self, data: str) -> None:
+        if self._text is not None:
+            self._text.append(data)
+
+
+def _is_text_part(name: str) -> bool:
+    return name == DOCUMENT_PART or _HEADER_FOOTER_PART.fullmatch(name) is not None
+
+
+def _part_order(name: str) -> tuple[int, int]:
+    """Corps, puis en-têtes, puis pieds de page (``header2`` avant ``header10``)."""
+    match = _HEADER_FOOTER_PART.fullmatch(name)
+    if match is None:
+        return (0, 0)
+    kind = 1 if match.group(1) == "header" else 2
+    return (kind, int(match.group(2) or 0))
+
+
+def text_parts(archive: zipfile.ZipFile) -> list[str]:
+    """Parties XML portant du texte, dans l'ordre des blocs."""
+    names = [name for name in archive.namelist() if _is_text_part(name)]
+    if DOCUMENT_PART not in names:
+        raise ValueError(f"{DOCUMENT_PART} absent de l'archive")
+    return sorted(names, key=_part_order)
+
+
+def _scan(source: IO[bytes], scanner: _ParagraphScanner) -> None:
+    while chunk := source.read(_READ_SIZE):
+        scanner.feed(chunk)
+    scanner.feed(b"", final=True)
+
+
+def extract_paragraphs(path: Path) -> tuple[list[str], dict[str, int]]:
+    """Texte de chaque paragraphe, dans l'ordre des blocs, et nombre de
+    paragraphes par partie."""
+    blocks: list[str] = []
+    counts: dict[str, int] = {}
+    with zipfile.ZipFile(path) as archive:
+        for name in text_parts(archive):
+            texts = _part_texts(archive, name)
+            blocks.extend(texts)
+            counts[name] = len(texts)
+    return blocks, counts
+
+
+def _part_texts(archive: zipfile.ZipFile, name: str) -> list[str]:
+    texts: dict[int, str] = {}
+
+    def collect(paragraph: _Paragraph, _depth: int) -> None:
+        texts[paragraph.index] = paragraph.text
+
+    scanner = _ParagraphScanner(collect)
+    with archive.open(name) as source:
+        _scan(source, scanner)
+    return [texts[index] for index in range(scanner.count)]
+
+
+def count_paragraphs(path: Path) -> dict[str, int]:
+    """Nombre de paragraphes par partie, sans collecter leur texte."""
+    counts: dict[str, int] = {}
+    with zipfile.ZipFile(path) as archive:
+        for name in text_parts(archive):
+            scanner = _ParagraphScanner(lambda _paragraph, _depth: None)
+            with archive.open(name) as source:
+                _scan(source, scanner)
+            counts[name] = scanner.count
+    return counts
+
+
+def distribute_text(
+    old_text: str, slots: list[tuple[int, int]], new_text: str
+) -> tuple[list[str], set[int]]:
+    """Répartit ``new_text`` sur les ``w:t`` d'un paragraphe.
+
+    ``slots`` donne la plage de chaque ``w:t`` dans ``old_text`` ; les autres
+    caractères sont des séparateurs (tabulation, saut de ligne). Retourne le
+    nouveau texte de chaque ``w:t`` et la position (dans ``old_text``) des
+    séparateurs à supprimer. La concaténation du résultat, séparateurs
+    conservés compris, redonne ``new_text``.
+    """
+    owner = [-1] * len(old_text)
+    for slot_index, (start, end) in enumerate(slots):
+        owner[start:end] = [slot_index] * (end - start)
+    pieces: list[list[str]] = [[] for _ in slots]
+    removed: set[int] = set()
+    for tag, i1, i2, j1, j2 in _text_opcodes(old_text, new_text):
+        if tag == "equal":
+            for position in range(i1, i2):
+                if owner[position] >= 0:
+                    pieces[owner[position]].append(old_text[position])
+            continue
+        removed.update(position for position in range(i1, i2) if owner[position] < 0)
+        anchor = _anchor_slot(owner, i1, i2)
+        if anchor is None:
+            # Remplacement coincé entre deux séparateurs : tout le texte va
+            # dans le premier w:t (formatage approximatif, texte exact).
+            return _single_slot(slots, new_text), {
+                position for position, slot in enumerate(owner) if slot < 0
+            }
+        pieces[anchor].append(new_text[j1:j2])
+    return ["".join(piece) for piece in pieces], removed
+
+
+def _text_opcodes(
+    old_text: str, new_text: str
+) -> Iterator[tuple[str, int, int, int, int]]:
+    """Opcodes ``difflib`` calculés sur les mots, exprimés en caractères.
+
+    Le début et la fin communs aux deux textes sont écartés d'emblée ; le
+    reste est aligné mot à mot, bien plus vite que caractère par caractère et
+    sans qu'un remplacement s'accroche à une lettre isolée de l'ancien texte.
+    """
+    prefix, suffix = _common_affixes(
+        old_text, 0, len(old_text), new_text, 0, len(new_text)
+    )
+    old_middle_end = len(old_text) - suffix
+    new_middle_end = len(new_text) - suffix
+    if prefix:
+        yield "equal", 0, prefix, 0, prefix
+    old_tokens = _TOKEN.findall(old_text, prefix, old_middle_end)
+    new_tokens = _TOKEN.findall(new_text, prefix, new_middle_end)
+    old_offsets = _token_offsets(old_tokens, prefix)
+    new_offsets = _token_offsets(new_tokens, prefix)
+    matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        old_start, old_end = old_offsets[i1], old_offsets[i2]
+        new_start, new_end = new_offsets[j1], new_offsets[j2]
+        if tag == "equal":
+            yield tag, old_start, old_end, new_start, new_end
+            continue
+        # Un mot à cheval sur deux runs ("Lyon|Adresse") : les caractères
+        # communs en tête et en fin de région restent à leur place.
+        head, tail = _common_affixes(
+            old_text, old_start, old_end, new_text, new_start, new_end
+        )
+        if head:
+            yield "equal", old_start, old_start + head, new_start, new_start + head
+        yield tag, old_start + head, old_end - tail, new_start + head, new_end - tail
+        if tail:
+            yield "equal", old_end - tail, old_end, new_end - tail, new_end
+    if suffix:
+        yield "equal", old_middle_end, len(old_text), new_middle_end, len(new_text)
+
+
+def _common_affixes(
+    old_text: str,
+    old_start: int,
+    old_end: int,
+    new_text: str,
+    new_start: int,
+    new_end: int,
+) -> tuple[int, int]:
+    """Longueurs du début et de la fin communs à deux tranches de texte."""
+    limit = min(old_end - old_start, new_end - new_start)
+    prefix = 0
+    while (
+        prefix < limit and old_text[old_start + prefix] == new_text[new_start + prefix]
+    ):
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and (
+        old_text[old_end - suffix - 1] == new_text[new_end - suffix - 1]
+    ):
+        suffix += 1
+    return prefix, suffix
+
+
+def _token_offsets(tokens: list[str], start: int) -> list[int]:
+    offsets = [start]
+    for token in tokens:
+        offsets.append(offsets[-1] + len(token))
+    return offsets
+
+
+def _anchor_slot(owner: list[int], start: int, end: int) -> int | None:
+    """``w:t`` recevant le texte qui remplace ``old_text[start:end]``."""
+    for position in range(start, end):
+        if owner[position] >= 0:
+            return owner[position]
+    if start > 0 and owner[start - 1] >= 0:
+        return owner[start - 1]
+    if end < len(owner) and owner[end] >= 0:
+        return owner[end]
+    return None
+
+
+def _single_slot(slots: list[tuple[int, int]], new_text: str) -> list[str]:
+    return [new_text if index == 0 else "" for index in range(len(slots))]
+
+
+class _PartRewriter:
+    """Recopie une partie XML en remplaçant les ``w:t`` modifiés.
+
+    Les octets lus restent en attente tant qu'un paragraphe est ouvert ; à la
+    fermeture du paragraphe de premier niveau, les remplacements sont
+    appliqués dans l'ordre et tout ce qui précède est écrit.
+    """
+
+    def __init__(self, target: IO[bytes], blocks: list[str], first_index: int):
+        self._target = target
+        self._blocks = blocks
+        self._first_index = first_index
+        self._pending = bytearray()
+        self._base = 0
+        self._splices: list[tuple[int, int, bytes]] = []
+        self.scanner = _ParagraphScanner(self._paragraph_closed)
+
+    def rewrite(self, source: IO[bytes]) -> None:
+        while chunk := source.read(_READ_SIZE):
+            self._pending += chunk
+            self.scanner.feed(chunk)
+            if not self.scanner.in_paragraph:
+                self._flush(self._base + len(self._pending))
+        self.scanner.feed(b"", final=True)
+        self._flush(self._base + len(self._pending))
+
+    def _paragraph_closed(self, paragraph: _Paragraph, depth: int) -> None:
+        new_text = self._blocks[self._first_index + paragraph.index]
+        old_text = paragraph.text
+        if new_text != old_text:
+            self._plan(paragraph, old_text, new_text)
+        if depth == 0 and self._splices:
+            self._splices.sort()
+            self._flush(self._splices[-1][1])
+
+    def _plan(self, paragraph: _Paragraph, old_text: str, new_text: str) -> None:
+        if not paragraph.slots:
+            # Paragraphe sans w:t (tabulations seules) : rien d'anonymisable.
+            return
+        texts, removed = distribute_text(
+            old_text, [(start, end) for start, end, _, _ in paragraph.slots], new_text
+        )
+        for (start, end, tag_start, closed_at), text in zip(
+            paragraph.slots, texts, strict=True
+        ):
+            if text == old_text[start:end]:
+                continue
+            element_end, name = self._element_bounds(tag_start, closed_at)
+            if text:
+                replacement = b'<%s xml:space="preserve">%s</%s>' % (
+                    name,
+                    escape(text).encode("utf-8"),
+                    name,
+                )
+            else:
+                replacement = b"<%s/>" % name
+            self._splices.append((tag_start, element_end, replacement))
+        for position, tag_start, closed_at in paragraph.separators:
+            if position in removed:
+                element_end, _ = self._element_bounds(tag_start, closed_at)
+                self._splices.append((tag_start, element_end, b""))
+
+    def _element_bounds(self, tag_start: int, closed_at: int) -> tuple[int, bytes]:
+        """Fin de l'élément commençant en ``tag_start`` et son nom qualifié."""
+        offset = tag_start - self._base
+        tag_end = self._pending.index(b">", offset) + 1
+        name_end = _TAG_NAME_END.search(self._pending, offset + 1)
+        name = bytes(self._pending[offset + 1 : name_end.start() if name_end else 0])
+        if self._pending[tag_end - 2 : tag_end - 1] == b"/":
+            return self._base + tag_end, name
+        end_tag = self._pending.index(b">", closed_at - self._base) + 1
+        return self._base + end_tag, name
+
+    def _flush(self, upto: int) -> None:
+        """Écrit les octets jusqu'à ``upto`` en appliquant les remplacements."""
+        position = self._base
+        for start, end, replacement in self._splices:
+            self._target.write(
+                self._pending[position - self._base : start - self._base]
+            )
+            self._target.write(replacement)
+            position = end
+        self._splices.clear()
+        self._target.write(self._pending[position - self._base : upto - self._base])
+        del self._pending[: upto - self._base]
+        self._base = upto
+
+
+def write_paragraphs(
+    path: Path, output_path: Path, blocks: list[str], counts: dict[str, int]
+) -> None:
+    """Réécrit ``path`` dans ``output_path`` avec le texte de ``blocks``.
+
+    ``counts`` est le nombre de paragraphes par partie (ordre des blocs).
+    Les autres membres de l'archive sont recopiés sans modification, dans
+    leur ordre et avec leur mode de compression.
+    """
+    first_indexes: dict[str, int] = {}
+    total = 0
+    for name, count in counts.items():
+        first_indexes[name] = total
+        total += count
+    with (
+        zipfile.ZipFile(path) as archive,
+        zipfile.ZipFile(output_path, "w") as output,
+    ):
+        output.comment = archive.comment
+        for info in archive.infolist():
+            with (
+                archive.open(info) as source,
+                output.open(copy.copy(info), "w") as target,
+            ):
+                if info.filename not in first_indexes:
+                    shutil.copyfileobj(source, target, _READ_SIZE)
+                    continue
+                rewriter = _PartRewriter(target, blocks, first_indexes[info.filename])
+                rewriter.rewrite(source)
+                if rewriter.scanner.count != counts[info.filename]:
+                    raise ValueError(
+                        f"{info.filename} : {rewriter.scanner.count} paragraphes "
+                        f"au lieu des {counts[info.filename]} extraits."
+                    )
@@ -1,69 +1,160 @@
 # anonyfiles_cli/anonymizer/engine.py
 
 import logging
-import re
+import os
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any
 
+from .aho_corasick import AhoCorasickAutomaton
 from .audit import AuditLogger
+from .base_processor import BaseProcessor
+from .column_profiler import (
+    DEFAULT_COLUMN_PROFILING,
+    NON_TEXT_COLUMN_KINDS,
+    non_text_block_indices,
+    profile_columns,
+)
+from .column_selection import ColumnSelectionError, ColumnSelector
 from .custom_rules_processor import CustomRulesProcessor
+from .entity_index import EntityOccurrenceIndex
 from .file_processor_factory import FileProcessorFactory
-from .ner_processor import NERProcessor
+from .ner_processor import (
+    DEFAULT_NER_BATCH_SIZE,
+    DEFAULT_NER_GATE,
+    DEFAULT_NER_MEMO_SIZE,
+    DEFAULT_NER_PACK_SIZE,
+    DEFAULT_NER_WINDOW_OVERLAP,
+    DEFAULT_NER_WINDOW_SIZE,
+    NERProcessor,
+    _unique_entities_across_blocks,
+)
+from .parallel_ner import detect_entities_in_blocks_parallel
 from .privacy_warning_scanner import (
+    PrivacyWarningCollector,
     privacy_warning_count,
     scan_blocks_for_privacy_warnings,
 )
+from .regex_safety import DEFAULT_CUSTOM_REGEX_TIMEOUT, CustomRuleError
 from .replacement_generator import ReplacementGenerator
 from .spacy_engine import SpaCyEngine
-from .type_defs import EntityLabelOverrides, EntitySpansByBlock
-from .utils import apply_positional_replacements
+from .span_index import SpanIndex
+from .span_table import SpanTable
+from .type_defs import (
+    EntityLabelOverrides,
+    EntitySpan,
+    EntitySpanBlocks,
+    EntitySpansByBlock,
+)
+from .utils import apply_positional_replacements_with_spans
+from .word_processor import DEFAULT_DOCX_ENGINE
 from .writer import AnonymizedFileWriter
 
 logger = logging.getLogger(__name__)
 
-# Remplace les tokens {{...}} par des espaces de même longueur avant passage au NER.
-# Évite que les accolades produites par les custom rules créent des faux positifs NER.
-_CUSTOM_TOKEN_RE = re.compile(r"\{\{[^{}]+\}\}")
 
+# Détection mono-processus par défaut ; ``ner_workers`` > 1 l'active.
+DEFAULT_NER_WORKERS = 1
+
+# En deçà de ce nombre de blocs, le coût d'envoi aux processus workers dépasse
+# le gain : la détection reste mono-processus même si ``ner_workers`` > 1.
+DEFAULT_NER_PARALLEL_MIN_BLOCKS = 2000
+
+# Lignes par tranche pour les formats lisibles par tranches (CSV, XLSX) ; 0 : le
+# fichier est traité en une fois.
+DEFAULT_STREAM_CHUNK_ROWS = 0
+
+# Statistiques de détection qui ne s'additionnent pas d'une tranche à l'autre.
+_NON_ADDITIVE_STATS = frozenset(
+    {"mode", "workers", "cpu_count", "speedup", "custom_rule_hits"}
+)
+
+
+def _merge_detection_stats(
+    total: dict[str, Any], chunk: dict[str, Any]
+) -> dict[str, Any]:
+    """Cumule les compteurs d'une tranche ; les autres valeurs sont remplacées."""
+    merged = dict(total)
+    for key, value in chunk.items():
+        if (
+            key in _NON_ADDITIVE_STATS
+            or isinstance(value, bool)
+            or not isinstance(value, int | float)
+        ):
+            merged[key] = value
+        elif isinstance(value, float):
+            merged[key] = round(merged.get(key, 0) + value, 3)
+        else:
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _sanitize_for_ner(text: str, token_spans: list[tuple[int, int]]) -> str:
+    """Remplace les tokens des règles personnalisées par des espaces de même longueur.
 
-def _sanitize_for_ner(text: str) -> str:
-    """Remplace {{TOKEN}} par des espaces de même longueur — préserve les offsets."""
-    return _CUSTOM_TOKEN_RE.sub(lambda m: " " * len(m.group()), text)
+    Évite que les tokens (``{{NOM_1}}``, ``[REF_1]``…) créent des faux positifs
+    NER sur les spans adjacents ; les offsets restent valides. Un bloc sans
+    token est renvoyé tel quel.
+    """
+    if not token_spans:
+        return text
+    parts: list[str] = []
+    cursor = 0
+    for start, end in token_spans:
+        parts.append(text[cursor:start])
+        parts.append(" " * (end - start))
+        cursor = end
+    parts.append(text[cursor:])
+    return "".join(parts)
 
 
 def apply_entity_decisions_to_detected_entities(
-    entities_per_block: EntitySpansByBlock,
+    entities_per_block: EntitySpanBlocks,
     ignored_entity_texts: set[str] | None = None,
     entity_label_overrides: EntityLabelOverrides | None = None,
-) -> tuple[list[tuple[str, str]], EntitySpansByBlock]:
+) -> tuple[list[tuple[str, str]], EntitySpanBlocks]:
     """Apply user preview decisions to detected entity spans.
 
     Decisions are keyed by exact entity text because the current preview UI
     exposes unique detected values rather than individual offsets.
+    A ``SpanTable`` input yields a ``SpanTable``, filled block by block.
     """
     ignored = ignored_entity_texts or set()
     label_overrides = entity_label_overrides or {}
-    filtered_per_block: EntitySpansByBlock = []
     unique_by_text: dict[str, str] = {}
 
-    for block_entities in entities_per_block:
-        filtered_block = []
-        for ent_text, ent_label, start, end in block_entities:
-            if ent_text in ignored:
-                continue
-            final_label = label_overrides.get(ent_text, ent_label)
-            filtered_block.append((ent_text, final_label, start, end))
-            unique_by_text[ent_text] = final_label
-        filtered_per_block.append(filtered_block)
-
+    def filtered_blocks() -> Iterator[list[EntitySpan]]:
+        for block_entities in entities_per_block:
+            filtered_block = []
+            for ent_text, ent_label, start, end in block_entities:
+                if ent_text in ignored:
+                    continue
+                final_label = label_overrides.get(ent_text, ent_label)
+                filtered_block.append((ent_text, final_label, start, end))
+                unique_by_text[ent_text] = final_label
+            yield filtered_block
+
+    filtered_per_block = _collect_blocks(filtered_blocks(), entities_per_block)
     return list(unique_by_text.items()), filtered_per_block
 
 
+def _collect_blocks(
+    blocks: Iterator[list[EntitySpan]], source: EntitySpanBlocks
+) -> EntitySpanBlocks:
+    """Matérialise ``blocks`` dans le même format que ``source``."""
+    if isinstance(source, SpanTable):
+        return SpanTable.from_blocks(blocks)
+    return list(blocks)
+
+
 def add_manual_entities_to_detected_entities(
     text_blocks: list[str],
-    entities_per_block: EntitySpansByBlock,
+    entities_per_block: EntitySpanBlocks,
     manual_entities: list[dict[str, str]] | None = None,
-) -> tuple[list[tuple[str, str]], EntitySpansByBlock]:
+) -> tuple[list[tuple[str, str]], EntitySpanBlocks]:
     """Add exact user-provided entities to block spans without overlapping detections."""
     if not manual_entities:
         detected_unique_by_text: dict[str, str] = {}
@@ -72,35 +163,58 @@ def add_manual_entities_to_detected_entities(
                 detected_unique_by_text[ent_text] = ent_label
         return list(detected_unique_by_text.items()), entities_per_block
 
-    enriched_per_block: EntitySpansByBlock = [
-        list(block) for block in entities_per_block
-    ]
     unique_by_text: dict[str, str] = {}
 
-    for block_index, block_text in enumerate(text_blocks):
-        block_entities = enriched_per_block[block_index]
-        for manual_entity in manual_entities:
-            text = manual_entity["text"]
-            label = manual_entity["label"]
-            search_start = 0
-            while True:
-                start = block_text.find(text, search_start)
-                if start == -1:
-                    break
-                end = start + len(text)
-                overlaps = any(
-                    start < existing_end and end > existing_start
-                    for *_entity, existing_start, existing_end in block_entities
-                )
-                if not overlaps:
-                    block_entities.append((text, label, start, end))
-                search_start = end
+    # Un seul parcours par bloc trouve toutes les occurrences de toutes les
+    # entités manuelles ; on rejoue ensuite la sémantique historique : entités
+    # dans l'ordre de la liste, occurrences non chevauchantes d'un même texte,
+    # priorité aux spans déjà présents.
+    automaton = AhoCorasickAutomaton(entity["text"] for entity in manual_entities)
+    entries_by_pattern: dict[int, list[tuple[int, str]]] = {}
+    for order, manual_entity in enumerate(manual_entities):
+        pattern_index = automaton.pattern_indices.get(manual_entity["text"])
+        if pattern_index is not None:
+            entries_by_pattern.setdefault(pattern_index, []).append(
+                (order, manual_entity["label"])
+            )
 
-    for block_entities in enriched_per_block:
-        block_entities.sort(key=lambda entity: entity[2])
-        for ent_text, ent_label, _start, _end in block_entities:
-            unique_by_text[ent_text] = ent_label
+    def enriched_blocks() -> Iterator[list[EntitySpan]]:
+        for block_index, detected_entities in enumerate(entities_per_block):
+            block_text = (
+                text_blocks[block_index] if block_index < len(text_blocks) else ""
+            )
+            block_entities = list(detected_entities)
+            occurrences_by_pattern: dict[int, list[int]] = {}
+            for pattern_index, start in automaton.iter_matches(block_text):
+                occurrences_by_pattern.setdefault(pattern_index, []).append(start)
+
+            if occurrences_by_pattern:
+                occupied = SpanIndex(
+                    (start, end) for *_entity, start, end in block_entities
+                )
+                matched_entries = sorted(
+                    (order, pattern_index, label)
+                    for pattern_index in occurrences_by_pattern
+                    for order, label in entries_by_pattern[pattern_index]
+                )
+                for _order, pattern_index, label in matched_entries:
+                    text = automaton.patterns[pattern_index]
+                    search_start = 0
+                    for start in occurrences_by_pattern[pattern_index]:
+                        if start < search_start:
+                            continue
+                        end = start + len(text)
+                        if not occupied.overlaps(start, end):
+                            block_entities.append((text, label, start, end))
+                            occupied.add(start, end)
+                        search_start = end
+
+            block_entities.sort(key=lambda entity: entity[2])
+            for ent_text, ent_label, _start, _end in block_entities:
+                unique_by_text[ent_text] = ent_label
+            yield block_entities
 
+    enriched_per_block = _collect_blocks(enriched_blocks(), entities_per_block)
     return list(unique_by_text.items()), enriched_per_block
 
 
@@ -118,6 +232,8 @@ class AnonyfilesEngine:
         entity_label_overrides: dict[str, str] | None = None,
         manual_entities: list[dict[str, str]] | None = None,
         strict_mode: bool | None = None,
+        anonymize_columns: list[ColumnSelector] | None = None,
+        anonymize_json_paths: list[str] | None = None,
     ):
         self.config = config or {}
         self.ignored_entity_texts = ignored_entity_texts or set()
@@ -134,7 +250,11 @@ class AnonyfilesEngine:
 
         # Initialisation du CustomRulesProcessor
         self.custom_rules_processor = CustomRulesProcessor(
-            custom_replacement_rules, self.audit_logger
+            custom_replacement_rules,
+            self.audit_logger,
+            regex_timeout=float(
+                self.config.get("custom_regex_timeout", DEFAULT_CUSTOM_REGEX_TIMEOUT)
+            ),
         )
 
         # Initialisation des entités à exclure
@@ -171,15 +291,68 @@ class AnonyfilesEngine:
                     self.entities_exclude.add(e.strip().upper())
 
         # Initialisation de SpaCyEngine et NERProcessor
-        model = self.config.get("spacy_model", "fr_core_news_md")
-        self.spacy_engine = SpaCyEngine(model=model)
+        self.spacy_model = self.config.get("spacy_model", "fr_core_news_md")
+        self.spacy_engine = SpaCyEngine(model=self.spacy_model)
+        # Options partagées avec les workers du mode multi-processus.
+        self.ner_processor_options: dict[str, Any] = {
+            "enabled_labels": self.enabled_labels,
+            "excluded_labels": self.entities_exclude,
+            "strict_mode": self.strict_mode,
+            "batch_size": self.config.get("ner_batch_size", DEFAULT_NER_BATCH_SIZE),
+            "window_size": self.config.get("ner_window_size", DEFAULT_NER_WINDOW_SIZE),
+            "window_overlap": self.config.get(
+                "ner_window_overlap", DEFAULT_NER_WINDOW_OVERLAP
+            ),
+            "memo_size": self.config.get("ner_memo_size", DEFAULT_NER_MEMO_SIZE),
+            "gate": self.config.get("ner_gate", DEFAULT_NER_GATE),
+            "pack_size": self.config.get("ner_pack_size", DEFAULT_NER_PACK_SIZE),
+        }
         self.ner_processor = NERProcessor(
-            self.spacy_engine,
-            self.enabled_labels,
-            self.entities_exclude,
-            strict_mode=self.strict_mode,
+            self.spacy_engine, **self.ner_processor_options
         )
 
+        # Détection multi-processus (opt-in) : ``ner_workers`` > 1.
+        self.ner_workers = max(
+            1, int(self.config.get("ner_workers", DEFAULT_NER_WORKERS))
+        )
+        self.ner_parallel_min_blocks = int(
+            self.config.get("ner_parallel_min_blocks", DEFAULT_NER_PARALLEL_MIN_BLOCKS)
+        )
+        self.detection_stats: dict[str, Any] = {}
+
+        # Profilage des colonnes CSV/XLSX : "regex" (colonnes numériques/dates
+        # sans spaCy), "skip" (ignorées) ou "off".
+        self.column_profiling = self.config.get(
+            "column_profiling", DEFAULT_COLUMN_PROFILING
+        )
+        self.column_profiles: list[dict[str, Any]] = []
+
+        # Traitement par tranches de lignes (CSV, XLSX) : ``stream_chunk_rows`` > 0.
+        # Pendant un tel traitement, le profil des colonnes et les
+        # avertissements anti-fuite sont partagés entre tranches.
+        self.stream_chunk_rows = max(
+            0, int(self.config.get("stream_chunk_rows", DEFAULT_STREAM_CHUNK_ROWS))
+        )
+        self._stream_column_profiles: dict[str, dict[str, Any]] | None = None
+        self._privacy_collector: PrivacyWarningCollector | None = None
+
+        # DOCX : lecture/réécriture en flux des parties XML ("ooxml") ou
+        # modèle objet python-docx ("python-docx").
+        self.docx_engine = self.config.get("docx_engine", DEFAULT_DOCX_ENGINE)
+
+        # Anonymisation sélective : colonnes (CSV/XLSX) et chemins JSON. Les
+        # cellules et valeurs hors sélection ne deviennent pas des blocs.
+        self.anonymize_columns = (
+            anonymize_columns
+            if anonymize_columns is not None
+            else self.config.get("anonymize_columns")
+        ) or None
+        self.anonymize_json_paths = (
+            anonymize_json_paths
+            if anonymize_json_paths is not None
+            else self.config.get("anonymize_json_paths")
+        ) or None
+
         # Initialisation du ReplacementGenerator
         self.replacement_generator = ReplacementGenerator(
             self.config, self.audit_logger
@@ -197,28 +370,184 @@ class AnonyfilesEngine:
         self,
         final_blocks: list[str],
         ignored_values: list[str] | None = None,
+        placeholder_spans: dict[int, list[tuple[int, int]]] | None = None,
+        source_blocks: list[str] | None = None,
+        replaced_spans: dict[int, list[tuple[int, int, int]]] | None = None,
     ) -> list[dict[str, object]]:
         return scan_blocks_for_privacy_warnings(
             final_blocks,
             enabled_labels=self.enabled_labels - self.entities_exclude,
             ignored_values=ignored_values or [],
+            placeholder_spans=placeholder_spans,
+            source_blocks=source_blocks,
+            replaced_spans=replaced_spans,
+            collector=self._privacy_collector,
+        )
+
+    def _detect_entities(
+        self,
+        text_blocks: list[str],
+        block_parts: list[tuple[str, int]] | None = None,
+    ) -> tuple[list[tuple[str, str]], EntitySpansByBlock]:
+        """Détection NER mono- ou multi-processus selon ``ner_workers``.
+
+        En multi-processus, ``block_parts`` (feuilles d'un classeur) sert de
+        découpage : chaque feuille est détectée comme une tranche à part.
+        Les statistiques d'exécution sont conservées dans ``detection_stats``.
+        """
+        if self.ner_workers > 1 and len(text_blocks) >= self.ner_parallel_min_blocks:
+            unique_entities, entities_per_block, stats = (
+                detect_entities_in_blocks_parallel(
+                    text_blocks,
+                    model_name=self.spacy_model,
+                    processor_options=self.ner_processor_options,
+                    workers=self.ner_workers,
+                    parts=block_parts,
+                )
+            )
+        else:
+            started = time.perf_counter()
+            unique_entities, entities_per_block = (
+                self.ner_processor.detect_entities_in_blocks(text_blocks)
+            )
+            stats = {
+                "mode": "single",
+                "workers": 1,
+                "cpu_count": os.cpu_count(),
+                "blocks": len(text_blocks),
+                "detection_seconds": round(time.perf_counter() - started, 3),
+                **self.ner_processor.stats,
+            }
+        self.detection_stats.update(stats)
+        return unique_entities, entities_per_block
+
+    def _detect_entities_in_columns(
+        self,
+        text_blocks: list[str],
+        block_columns: list[str] | None,
+        block_parts: list[tuple[str, int]] | None = None,
+    ) -> tuple[list[tuple[str, str]], EntitySpansByBlock]:
+        """Détection guidée par le profil des colonnes (formats tabulaires).
+
+        Les cellules des colonnes numériques/dates ne passent pas par spaCy :
+        regex seules (``column_profiling: "regex"``) ou aucune détection
+        (``"skip"``). Le profil est conservé dans ``column_profiles``.
+        """
+        if (
+            self.column_profiling == "off"
+            or not block_columns
+            or len(block_columns) != len(text_blocks)
+        ):
+            return self._detect_entities(text_blocks, block_parts)
+
+        profiles = self._profile_columns(text_blocks, block_columns)
+        non_text_indices = non_text_block_indices(text_blocks, block_columns, profiles)
+        if not non_text_indices:
+            return self._detect_entities(text_blocks, block_parts)
+
+        non_text_set = set(non_text_indices)
+        _unique, entities_per_block = self._detect_entities(
+            [
+                "" if index in non_text_set else block_text
+                for index, block_text in enumerate(text_blocks)
+            ],
+            block_parts,
         )
+        if self.column_profiling == "regex":
+            for index in non_text_indices:
+                entities_per_block[index] = (
+                    self.ner_processor.detect_entities_without_spacy(text_blocks[index])
+                )
+            self.detection_stats["regex_only_blocks"] = len(non_text_indices)
+        else:
+            self.detection_stats["skipped_blocks"] = len(non_text_indices)
+        return _unique_entities_across_blocks(entities_per_block), entities_per_block
 
-    def _process_content(self, original_blocks: list[str]):
+    def _profile_columns(
+        self, text_blocks: list[str], block_columns: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Profil des colonnes, conservé dans ``column_profiles``.
+
+        En traitement par tranches, le profil établi à la première apparition
+        d'une colonne est réutilisé par les tranches suivantes, qui ne font
+        qu'incrémenter son nombre de cellules.
+        """
+        profiles = self._stream_column_profiles
+        if profiles is None:
+            profiles = self._classify_columns(text_blocks, block_columns)
+        else:
+            for column, cells in Counter(block_columns).items():
+                if column in profiles:
+                    profiles[column]["cells"] += cells
+            new_columns = set(block_columns) - profiles.keys()
+            if new_columns:
+                indices = [
+                    index
+                    for index, column in enumerate(block_columns)
+                    if column in new_columns
+                ]
+                profiles.update(
+                    self._classify_columns(
+                        [text_blocks[index] for index in indices],
+                        [block_columns[index] for index in indices],
+                    )
+                )
+        self.column_profiles = list(profiles.values())
+        return profiles
+
+    def _classify_columns(
+        self, text_blocks: list[str], block_columns: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        profiles = profile_columns(text_blocks, block_columns)
+        for profile in profiles.values():
+            profile["mode"] = (
+                self.column_profiling
+                if profile["kind"] in NON_TEXT_COLUMN_KINDS
+                else "ner"
+            )
+        return profiles
+
+    def _record_sparse_stats(
+        self, processor: BaseProcessor, original_blocks: list[str]
+    ) -> None:
+        """Formats à cellules : nombre de cellules vides tenues hors du pipeline."""
+        if processor.sparse_block_ids is not None:
+            self.detection_stats["empty_blocks_skipped"] = processor.block_count - len(
+                original_blocks
+            )
+
+    def _process_content(
+        self,
+        original_blocks: list[str],
+        block_columns: list[str] | None = None,
+        block_parts: list[tuple[str, int]] | None = None,
+    ):
         """
         Logique métier pure d'anonymisation sur des blocs de texte.
+        ``block_columns`` (formats tabulaires) donne la colonne de chaque bloc,
+        ``block_parts`` (classeurs) le nombre de blocs de chaque feuille.
         Retourne un dictionnaire contenant les résultats intermédiaires ou finaux.
         """
         # 1. Application des règles personnalisées
+        # ``custom_token_spans`` : position des tokens insérés, par bloc (None
+        # sans règle) ; évite de les rechercher à nouveau en aval.
         blocks_after_custom_rules = []
+        custom_token_spans: list[list[tuple[int, int]]] | None = None
         if self.custom_rules_processor.custom_rules:
             logger.debug(
                 "DEBUG (Engine): Application des règles personnalisées sur %s bloc(s).",
                 len(original_blocks),
             )
+            custom_token_spans = []
             for block_text in original_blocks:
-                mod_block = self.custom_rules_processor.apply_to_block(block_text)
+                mod_block, token_spans = (
+                    self.custom_rules_processor.apply_to_block_with_spans(block_text)
+                )
                 blocks_after_custom_rules.append(mod_block)
+                custom_token_spans.append(token_spans)
+            self.detection_stats["custom_rule_hits"] = (
+                self.custom_rules_processor.get_rule_hit_stats()
+            )
             if self.custom_rules_processor.get_custom_replacements_count() > 0:
                 logger.debug(
                     "DEBUG (Engine): Nombre total de remplacements personnalisés : %s",
@@ -237,17 +566,30 @@ class AnonyfilesEngine:
             }
 
         # 2. Détection des entités spaCy et regex
-        # Sanitisation : les tokens {{...}} sont remplacés par des espaces de même longueur
-        # pour éviter que les accolades créent des faux positifs NER sur les spans adjacents.
-        # Les offsets retournés restent valides dans blocks_after_custom_rules (même longueur).
-        unique_spacy_entities, spacy_entities_per_block_with_offsets = (
-            self.ner_processor.detect_entities_in_blocks(
-                [_sanitize_for_ner(b) for b in blocks_after_custom_rules]
-            )
+        # Sanitisation : les tokens des règles personnalisées sont remplacés par des
+        # espaces de même longueur pour éviter des faux positifs NER sur les spans
+        # adjacents. Les offsets retournés restent valides dans blocks_after_custom_rules.
+        ner_blocks = (
+            blocks_after_custom_rules
+            if custom_token_spans is None
+            else [
+                _sanitize_for_ner(block_text, token_spans)
+                for block_text, token_spans in zip(
+                    blocks_after_custom_rules, custom_token_spans, strict=True
+                )
+            ]
         )
+        _detected_unique, detected_per_block = self._detect_entities_in_columns(
+            ner_blocks, block_columns, block_parts
+        )
+        del ner_blocks
+        # Les spans sont conservés jusqu'à l'écriture : on les range dans une
+        # table compacte (tableaux + textes internés) et on libère les tuples.
+        detected_spans = SpanTable.from_blocks(detected_per_block)
+        del detected_per_block
         unique_spacy_entities, spacy_entities_per_block_with_offsets = (
             apply_entity_decisions_to_detected_entities(
-                spacy_entities_per_block_with_offsets,
+                detected_spans,
                 ignored_entity_texts=self.ignored_entity_texts,
                 entity_label_overrides=self.entity_label_overrides,
             )
@@ -277,19 +619,36 @@ class AnonyfilesEngine:
                 "privacy_warnings": privacy_warnings,
             }
 
-        # 3. Génération des remplacements
+        # 3. Génération des remplacements (index partagé avec le writer et le PDF)
+        entity_index = EntityOccurrenceIndex(
+            unique_spacy_entities, spacy_entities_per_block_with_offsets
+        )
         replacements_map_spacy, mapping_dict_spacy = (
             self.replacement_generator.generate_spacy_replacements(
-                unique_spacy_entities, spacy_entities_per_block_with_offsets
+                unique_spacy_entities,
+                spacy_entities_per_block_with_offsets,
+                entity_index,
             )
         )
 
         # 4. Application des remplacements positionnels
+        # Les spans masqués par le scanner anti-fuite (tokens custom recalés +
+        # valeurs de remplacement) sont produits en même temps que le texte ;
+        # ``replaced_spans`` (offsets source) borne ce que le scanner revérifie.
+        # Indexés par bloc et creux : un bloc sans span n'a pas d'entrée.
         truly_final_blocks = []
+        placeholder_spans: dict[int, list[tuple[int, int]]] = {}
+        replaced_spans: dict[int, list[tuple[int, int, int]]] = {}
         unique_spacy_entities_set = set(unique_spacy_entities)  # Opti lookup
 
-        for i, block_text_after in enumerate(blocks_after_custom_rules):
-            entities_in_block = spacy_entities_per_block_with_offsets[i]
+        for block_index, (block_text_after, entities_in_block) in enumerate(
+            zip(
+                blocks_after_custom_rules,
+                spacy_entities_per_block_with_offsets,
+                strict=True,
+            )
+        ):
+            token_spans = custom_token_spans[block_index] if custom_token_spans else []
 
             # Filtrage de sécurité
             filtered_entities = [
@@ -299,14 +658,29 @@ class AnonyfilesEngine:
             ]
 
             if block_text_after.strip() and filtered_entities:
-                fully_anonymized = apply_positional_replacements(
-                    block_text_after,
-                    replacements_map_spacy,
-                    filtered_entities,
+                fully_anonymized, block_placeholder_spans = (
+                    apply_positional_replacements_with_spans(
+                        block_text_after,
+                        replacements_map_spacy,
+                        filtered_entities,
+                        token_spans,
+                    )
                 )
                 truly_final_blocks.append(fully_anonymized)
+                if block_placeholder_spans:
+                    placeholder_spans[block_index] = block_placeholder_spans
+                block_replaced_spans = [
+                    (start, end, len(replacement))
+                    for ent_text, _label, start, end in filtered_entities
+                    if (replacement := replacements_map_spacy.get(ent_text, ent_text))
+                    != ent_text
+                ]
+                if block_replaced_spans:
+                    replaced_spans[block_index] = block_replaced_spans
             else:
                 truly_final_blocks.append(block_text_after)
+                if token_spans:
+                    placeholder_spans[block_index] = token_spans
 
         ignored_replacement_values = list(replacements_map_spacy.values()) + list(
             self.custom_rules_processor.get_custom_replacements_mapping().values()
@@ -314,6 +688,9 @@ class AnonyfilesEngine:
         privacy_warnings = self._scan_privacy_warnings(
             truly_final_blocks,
             ignored_values=ignored_replacement_values,
+            placeholder_spans=placeholder_spans,
+            source_blocks=blocks_after_custom_rules,
+            replaced_spans=replaced_spans,
         )
 
         return {
@@ -323,6 +700,7 @@ class AnonyfilesEngine:
             "spacy_entities_per_block": spacy_entities_per_block_with_offsets,
             "replacements_map_spacy": replacements_map_spacy,
             "mapping_dict_spacy": mapping_dict_spacy,
+            "entity_index": entity_index,
             "privacy_warnings": privacy_warnings,
         }
 
@@ -340,6 +718,8 @@ class AnonyfilesEngine:
     ) -> dict[str, Any]:
         self.audit_logger.reset()
         self.custom_rules_processor.reset()
+        self.detection_stats = {}
+        self.column_profiles = []
         self.writer = AnonymizedFileWriter(dry_run)
 
         ext = input_path.suffix.lower()
@@ -352,14 +732,38 @@ class AnonyfilesEngine:
             f"DEBUG (Engine): Processing {input_path} with {type(processor).__name__}"
         )
 
-        extract_kwargs = {}
-        if ext == ".csv" and "has_header" in kwargs:
-            extract_kwargs["has_header"] = kwargs["has_header"]
+        extract_kwargs = self._extract_kwargs(processor, ext, kwargs)
+
+        if self.stream_chunk_rows and processor.supports_row_chunks:
+            return self._anonymize_in_chunks(
+                processor,
+                input_path,
+                output_path,
+                dry_run,
+                log_entities_path,
+                mapping_output_path,
+                extract_kwargs,
+            )
 
-        original_blocks = processor.extract_blocks(input_path, **extract_kwargs)
+        try:
+            if processor.supports_sparse_blocks:
+                original_blocks = processor.extract_sparse_blocks(
+                    input_path, **extract_kwargs
+                )
+            else:
+                original_blocks = processor.extract_blocks(input_path, **extract_kwargs)
+        except ColumnSelectionError as e:
+            return self._error_response(e)
+        self._record_sparse_stats(processor, original_blocks)
 
         # Appel Logique Métier
-        result = self._process_content(original_blocks)
+        try:
+            result = self._process_content(
+                original_blocks, processor.block_columns, processor.block_parts
+            )
+        except CustomRuleError as e:
+            # Règle regex interrompue (budget dépassé) : échec explicite du job.
+            return self._error_response(e)
         decision = result["decision"]
 
         # Gestion des sorties selon la décision
@@ -417,6 +821,7 @@ class AnonyfilesEngine:
                 ],
                 spacy_replacements_map=result["replacements_map_spacy"],
                 custom_replacements_mapping=self.custom_rules_processor.get_custom_replacements_mapping(),
+                entity_index=result["entity_index"],
                 **kwargs,
             )
             if log_entities_path:
@@ -429,6 +834,7 @@ class AnonyfilesEngine:
                     self.custom_rules_processor.get_custom_replacements_mapping(),
                     result["mapping_dict_spacy"],
                     result["unique_spacy_entities"],
+                    result["entity_index"],
                 )
 
         return self._success_response(
@@ -451,6 +857,8 @@ class AnonyfilesEngine:
     ) -> dict[str, Any]:
         self.audit_logger.reset()
         self.custom_rules_processor.reset()
+        self.detection_stats = {}
+        self.column_profiles = []
         self.writer = AnonymizedFileWriter(dry_run)
 
         ext = input_path.suffix.lower()
@@ -463,16 +871,42 @@ class AnonyfilesEngine:
             f"DEBUG (Engine Async): Processing {input_path} with {type(processor).__name__}"
         )
 
-        extract_kwargs = {}
-        if ext == ".csv" and "has_header" in kwargs:
-            extract_kwargs["has_header"] = kwargs["has_header"]
+        extract_kwargs = self._extract_kwargs(processor, ext, kwargs)
+
+        if self.stream_chunk_rows and processor.supports_row_chunks:
+            # Lecture et écriture par tranches, comme le traitement lui-même :
+            # synchrone, à l'image de ``_process_content``.
+            return self._anonymize_in_chunks(
+                processor,
+                input_path,
+                output_path,
+                dry_run,
+                log_entities_path,
+                mapping_output_path,
+                extract_kwargs,
+            )
 
-        original_blocks = await processor.extract_blocks_async(
-            input_path, **extract_kwargs
-        )
+        try:
+            if processor.supports_sparse_blocks:
+                original_blocks = await processor.extract_sparse_blocks_async(
+                    input_path, **extract_kwargs
+                )
+            else:
+                original_blocks = await processor.extract_blocks_async(
+                    input_path, **extract_kwargs
+                )
+        except ColumnSelectionError as e:
+            return self._error_response(e)
+        self._record_sparse_stats(processor, original_blocks)
 
         # Appel Logique Métier (identique au sync)
-        result = self._process_content(original_blocks)
+        try:
+            result = self._process_content(
+                original_blocks, processor.block_columns, processor.block_parts
+            )
+        except CustomRuleError as e:
+            # Règle regex interrompue (budget dépassé) : échec explicite du job.
+            return self._error_response(e)
         decision = result["decision"]
 
         if decision == "empty":
@@ -529,6 +963,7 @@ class AnonyfilesEngine:
                 ],
                 spacy_replacements_map=result["replacements_map_spacy"],
                 custom_replacements_mapping=self.custom_rules_processor.get_custom_replacements_mapping(),
+                entity_index=result["entity_index"],
                 **kwargs,
             )
             if log_entities_path:
@@ -541,6 +976,7 @@ class AnonyfilesEngine:
                     self.custom_rules_processor.get_custom_replacements_mapping(),
                     result["mapping_dict_spacy"],
                     result["unique_spacy_entities"],
+                    result["entity_index"],
                 )
 
         return self._success_response(
@@ -551,6 +987,125 @@ class AnonyfilesEngine:
             result["privacy_warnings"],
         )
 
+    def _extract_kwargs(
+        self, processor: BaseProcessor, ext: str, kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Options d'extraction : en-tête CSV, moteur DOCX et sélection de
+        colonnes/chemins."""
+        extract_kwargs: dict[str, Any] = {}
+        if ext == ".csv" and "has_header" in kwargs:
+            extract_kwargs["has_header"] = kwargs["has_header"]
+        if ext == ".docx":
+            extract_kwargs["docx_engine"] = self.docx_engine
+        if self.anonymize_columns and processor.supports_column_selection:
+            extract_kwargs["columns"] = self.anonymize_columns
+        if self.anonymize_json_paths and ext == ".json":
+            extract_kwargs["json_paths"] = self.anonymize_json_paths
+        return extract_kwargs
+
+    def _anonymize_in_chunks(
+        self,
+        processor: BaseProcessor,
+        input_path: Path,
+        output_path: Path | None,
+        dry_run: bool,
+        log_entities_path: Path | None,
+        mapping_output_path: Path | None,
+        extract_kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Anonymise le fichier par tranches de ``stream_chunk_rows`` lignes.
+
+        Chaque tranche passe par ``_process_content`` puis est écrite aussitôt :
+        la mémoire dépend de la taille des tranches, pas de celle du fichier.
+        La session de remplacement (texte -> code), le profil des colonnes et
+        les avertissements anti-fuite sont partagés entre tranches : une entité
+        garde le même code dans tout le fichier. Seuls les mappings (entités
+        uniques) grandissent avec le fichier.
+        """
+        if not dry_run and output_path is None:
+            return self._error_response(
+                ValueError("output_path est requis hors dry-run.")
+            )
+
+        self._stream_column_profiles = {}
+        self._privacy_collector = PrivacyWarningCollector()
+        unique_entities: dict[str, str] = {}
+        mapping_dict_spacy: dict[str, str] = {}
+        privacy_warnings: list[dict[str, object]] = []
+        decisions: set[str] = set()
+        row_writer = (
+            processor.open_row_writer(output_path)
+            if not dry_run and output_path is not None
+            else nullcontext(None)
+        )
+        completed = False
+        try:
+            with row_writer as write_rows:
+                for chunk in processor.iter_row_chunks(
+                    input_path, self.stream_chunk_rows, **extract_kwargs
+                ):
+                    stats_before_chunk = self.detection_stats
+                    self.detection_stats = {
+                        "stream_chunks": 1,
+                        "empty_blocks_skipped": chunk.cell_count - len(chunk.blocks),
+                    }
+                    result = self._process_content(chunk.blocks, chunk.block_columns)
+                    self.detection_stats = _merge_detection_stats(
+                        stats_before_chunk, self.detection_stats
+                    )
+
+                    decision = result["decision"]
+                    decisions.add(decision)
+                    privacy_warnings = result["privacy_warnings"]
+                    if decision == "processed":
+                        final_blocks = result["final_blocks"]
+                        unique_entities.update(result["unique_spacy_entities"])
+                        mapping_dict_spacy.update(result["mapping_dict_spacy"])
+                    else:
+                        final_blocks = result["blocks_after_custom"]
+                    if write_rows is not None:
+                        write_rows(chunk.filled_rows(final_blocks), chunk.sheet)
+            completed = True
+        except ValueError as e:
+            # Règle regex interrompue (``CustomRuleError``) ou fichier illisible :
+            # échec du job.
+            return self._error_response(e)
+        finally:
+            # Quelle que soit l'exception (disque plein, interruption...), aucun
+            # fichier de sortie partiel ne reste sur le disque.
+            if not completed and not dry_run and output_path is not None:
+                output_path.unlink(missing_ok=True)
+            self._stream_column_profiles = None
+            self._privacy_collector = None
+
+        entities = list(unique_entities.items())
+        writer = self.writer or AnonymizedFileWriter(dry_run)
+        if mapping_output_path and not dry_run:
+            writer.write_mapping_file(
+                mapping_output_path,
+                self.custom_rules_processor.get_custom_replacements_mapping(),
+                mapping_dict_spacy,
+                entities,
+                EntityOccurrenceIndex(entities),
+            )
+        if "processed" not in decisions:
+            message = "Input empty" if decisions <= {"empty"} else "No changes applied"
+            logger.info("INFO (Engine): %s.", message)
+            return self._success_response(
+                message, [], privacy_warnings=privacy_warnings
+            )
+
+        if log_entities_path and not dry_run:
+            writer.write_log_entities_file(log_entities_path, entities)
+        return self._success_response(
+            "Anonymization complete",
+            entities,
+            mapping_dict_spacy,
+            output_path,
+            privacy_warnings,
+        )
+
     def _error_response(self, error):
         return {
             "status": "error",
@@ -578,4 +1133,6 @@ class AnonyfilesEngine:
             "total_replacements": self.audit_logger.total(),
             "privacy_warnings": warnings,
             "privacy_warnings_count": privacy_warning_count(warnings),
+            "detection_stats": self.detection_stats,
+            "column_profiles": self.column_profiles,
         }
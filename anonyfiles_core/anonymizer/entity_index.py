@@ -0,0 +1,52 @@
+# anonyfiles_core/anonymizer/entity_index.py
+"""Index des occurrences d'entités, construit une fois par exécution.
+
+Remplace les recherches linéaires ``next(...)`` sur la liste des entités
+uniques et les recomptages sur tous les blocs : le générateur de
+remplacements (comptes de l'audit), le writer (labels du mapping) et le
+processor PDF (textes par page) consultent le même index.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+
+from .type_defs import Entity, EntitySpanBlocks
+
+UNKNOWN_SPACY_LABEL = "UNKNOWN_SPACY_LABEL"
+
+
+class EntityOccurrenceIndex:
+    """Texte -> label, (texte, label) -> nombre d'occurrences, textes par bloc."""
+
+    def __init__(
+        self,
+        unique_entities: list[Entity],
+        entities_per_block: EntitySpanBlocks | None = None,
+    ):
+        # Premier label rencontré, comme l'ancien ``next(...)`` sur la liste.
+        self.label_by_text: dict[str, str] = {}
+        for text, label in unique_entities:
+            self.label_by_text.setdefault(text, label)
+
+        self.counts: Counter[Entity] = Counter()
+        for block_entities in entities_per_block or []:
+            self.counts.update(
+                (ent_text, ent_label) for ent_text, ent_label, _s, _e in block_entities
+            )
+        # Textes par bloc calculés à la demande (seul le PDF les consulte) :
+        # pas de liste par bloc pour les autres formats.
+        self._entities_per_block = entities_per_block
+
+    def label(self, text: str) -> str:
+        return self.label_by_text.get(text, UNKNOWN_SPACY_LABEL)
+
+    def count(self, text: str, label: str) -> int:
+        return self.counts[(text, label)]
+
+    def block_texts(self, block_index: int) -> list[str]:
+        """Textes d'entités distincts du bloc, dans l'ordre d'apparition."""
+        blocks = self._entities_per_block
+        if blocks is None or block_index >= len(blocks):
+            return []
+        return list(dict.fromkeys(ent_text for ent_text, *_span in blocks[block_index]))
@@ -1,26 +1,77 @@
 # anonymizer/excel_processor.py
 
 import logging
+import zipfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 import numpy as np
 import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.exceptions import InvalidFileException
 
-from .base_processor import BaseProcessor
+from .base_processor import BaseProcessor, RowChunk, RowWriter
+from .column_selection import ColumnSelection, ColumnSelector
 from .type_defs import ExcelSheetMetadata, TextBlocks
 
 logger = logging.getLogger(__name__)
 
 
+class _TypedCell(NamedTuple):
+    """Cellule non textuelle (formule, nombre ou date formatés) du mode
+    tranches, réécrite avec sa valeur et son format de nombre d'origine."""
+
+    value: Any
+    number_format: str
+
+
+def _streamed_value(cell: Any) -> Any:
+    """Valeur d'une cellule lue en ``read_only``, telle qu'elle sera réécrite."""
+    if cell.data_type == "f" or (
+        cell.value is not None
+        and cell.data_type != "s"
+        and cell.number_format != "General"
+    ):
+        return _TypedCell(cell.value, cell.number_format)
+    return cell.value
+
+
+def _write_only_value(worksheet: Any, value: Any) -> Any:
+    """Valeur à ``append`` dans une feuille ``write_only`` : formats restaurés,
+    et un texte commençant par ``=`` reste du texte (jamais une formule)."""
+    if isinstance(value, _TypedCell):
+        cell = WriteOnlyCell(worksheet, value=value.value)
+        cell.number_format = value.number_format
+        return cell
+    if isinstance(value, str) and value.startswith("="):
+        cell = WriteOnlyCell(worksheet, value=value)
+        cell.data_type = "s"
+        return cell
+    return value
+
+
 class ExcelProcessor(BaseProcessor):
     """
     Processor pour les fichiers .xlsx (Excel).
     - Supporte le multi-feuilles : toutes les feuilles sont traitées.
-    - Chaque cellule (pour chaque feuille) est un bloc.
+    - Chaque cellule (pour chaque feuille) est un bloc ; en extraction creuse,
+      seules les cellules non vides circulent dans l'engine.
     - Les données sont lues en STR pour éviter l'inférence de type (perte de '0' initial, etc.).
+    - Avec ``columns``, seules les colonnes sélectionnées (dans chaque feuille)
+      sont des blocs ; les autres cellules sont recopiées depuis l'original.
+    - Par tranches (``iter_row_chunks``), le classeur est lu en ``read_only`` et
+      écrit en ``write_only`` : seules les cellules texte sont des blocs, les
+      nombres, dates, booléens et formules gardent leur type et leur format.
     """
 
+    supports_sparse_blocks = True
+    supports_column_selection = True
+    supports_row_chunks = True
+
     def __init__(self) -> None:
         super().__init__()
         # On va stocker ici les infos de chaque feuille (nom de feuille -> DataFrame original vide ou métadonnées)
@@ -30,6 +81,8 @@ class ExcelProcessor(BaseProcessor):
         # Donc on peut stocker l'état dans self.sheets_metadata.
         self.sheets_metadata: dict[str, ExcelSheetMetadata] = {}
         self.sheet_names_order: list[str] = []
+        # Feuille -> indices des colonnes retenues (``None`` : toutes).
+        self.selected_columns: dict[str, list[int]] | None = None
 
     def extract_blocks(self, input_path: Path, **kwargs: Any) -> TextBlocks:
         """
@@ -37,18 +90,37 @@ class ExcelProcessor(BaseProcessor):
         Lit TOUTES les feuilles. Force le type string pour préserver les données brutes (ex: numéros de téléphone).
         Retourne une liste à plat contenant toutes les cellules de toutes les feuilles.
         """
+        return self._extract(input_path, sparse=False, columns=kwargs.get("columns"))
+
+    def extract_sparse_blocks(self, input_path: Path, **kwargs: Any) -> TextBlocks:
+        """Comme ``extract_blocks``, sans les cellules vides du rectangle de chaque feuille."""
+        return self._extract(input_path, sparse=True, columns=kwargs.get("columns"))
+
+    def _extract(
+        self,
+        input_path: Path,
+        sparse: bool,
+        columns: list[ColumnSelector] | None = None,
+    ) -> TextBlocks:
         # sheet_name=None -> Lit toutes les feuilles dans un dictionnaire {nom: df}
         # header=None -> On traite le header comme des données normales à anonymiser
         # dtype=str -> Crucial pour ne pas perdre les zéros initiaux (06...) ou corrompre les SIRET
         dfs = pd.read_excel(input_path, sheet_name=None, header=None, dtype=str)
 
         all_blocks: TextBlocks = []
+        sparse_block_ids: list[int] = []
+        block_count = 0
         self.sheets_metadata = {}
         self.sheet_names_order = []
+        self.block_columns = []
+        self.block_parts = []
+        selection = ColumnSelection(columns) if columns else None
+        self.selected_columns = {} if selection else None
 
         for sheet_name, df in dfs.items():
             # Remplacement des NaN par ""
             df = df.fillna("")
+            sheet_first_block = len(all_blocks)
 
             # Stockage des métadonnées pour la reconstruction
             self.sheet_names_order.append(sheet_name)
@@ -58,13 +130,103 @@ class ExcelProcessor(BaseProcessor):
                 "columns": df.columns,
             }
 
-            # Aplatissement (row-major par défaut avec values.flatten())
-            # flatten() retourne une copie 1D numpy array, tolist() en fait une liste python
-            flat_values = [str(value) for value in df.values.flatten().tolist()]
-            all_blocks.extend(flat_values)
+            sheet_columns = [
+                f"{sheet_name}!{get_column_letter(index + 1)}"
+                for index in range(df.shape[1])
+            ]
+            if selection is not None and self.selected_columns is not None:
+                first_row = (
+                    [str(value) for value in df.values[0]] if df.shape[0] else []
+                )
+                selected = _select_sheet_columns(selection, first_row, sheet_columns)
+                self.selected_columns[sheet_name] = selected
+                values = df.values[:, selected]
+                for offset, value in enumerate(values.flat):
+                    cell_text = str(value)
+                    if cell_text or not sparse:
+                        sparse_block_ids.append(block_count + offset)
+                        all_blocks.append(cell_text)
+                        self.block_columns.append(
+                            sheet_columns[selected[offset % len(selected)]]
+                        )
+                block_count += values.size
+                self.block_parts.append(
+                    (sheet_name, len(all_blocks) - sheet_first_block)
+                )
+                continue
+            if sparse:
+                # Parcours row-major sans construire la liste des cellules vides.
+                width = df.shape[1]
+                for offset, value in enumerate(df.values.flat):
+                    cell_text = str(value)
+                    if cell_text:
+                        sparse_block_ids.append(block_count + offset)
+                        all_blocks.append(cell_text)
+                        self.block_columns.append(sheet_columns[offset % width])
+            else:
+                # Aplatissement (row-major par défaut avec values.flatten())
+                # flatten() retourne une copie 1D numpy array, tolist() en fait une liste python
+                flat_values = [str(value) for value in df.values.flatten().tolist()]
+                all_blocks.extend(flat_values)
+                self.block_columns.extend(sheet_columns * df.shape[0])
+            block_count += df.shape[0] * df.shape[1]
+            self.block_parts.append((sheet_name, len(all_blocks) - sheet_first_block))
 
+        if selection is not None:
+            selection.check_all_matched("le classeur")
+        self.sparse_block_ids = sparse_block_ids if sparse else None
+        self.block_count = block_count
         return all_blocks
 
+    def iter_row_chunks(
+        self, input_path: Path, chunk_rows: int, **kwargs: Any
+    ) -> Iterator[RowChunk]:
+        """
+        Parcourt le classeur feuille par feuille, par tranches d'au plus
+        ``chunk_rows`` lignes, sans DataFrame : seule la tranche courante est en
+        mémoire. Chaque feuille produit au moins une tranche (même vide) pour
+        être recréée, dans l'ordre, par ``open_row_writer``.
+        """
+        columns = kwargs.get("columns")
+        selection = ColumnSelection(columns) if columns else None
+        chunk_rows = max(1, chunk_rows)
+        try:
+            workbook = load_workbook(input_path, read_only=True)
+        except (InvalidFileException, zipfile.BadZipFile, KeyError) as e:
+            raise ValueError(f"Classeur illisible ({input_path}) : {e}") from e
+        try:
+            for worksheet in workbook.worksheets:
+                yield from _iter_sheet_chunks(worksheet, chunk_rows, selection)
+        finally:
+            workbook.close()
+        if selection is not None:
+            selection.check_all_matched("le classeur")
+
+    @contextmanager
+    def open_row_writer(self, output_path: Path, **kwargs: Any) -> Iterator[RowWriter]:
+        """Classeur ``write_only`` : les lignes sont sérialisées au fil de l'eau,
+        chaque feuille est créée à sa première tranche."""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        workbook = Workbook(write_only=True)
+        worksheets: dict[str, Any] = {}
+
+        def write_rows(rows: list[list[Any]], sheet: str | None = None) -> None:
+            title = sheet or "Sheet1"
+            worksheet = worksheets.get(title)
+            if worksheet is None:
+                worksheet = worksheets[title] = workbook.create_sheet(title)
+            for row in rows:
+                worksheet.append([_write_only_value(worksheet, value) for value in row])
+
+        yield write_rows
+        workbook.save(output_path)
+
+    def _block_width(self, sheet_name: str, cols: int) -> int:
+        """Nombre de colonnes d'une feuille qui ont produit des blocs."""
+        if self.selected_columns is None:
+            return cols
+        return len(self.selected_columns.get(sheet_name, []))
+
     def reconstruct_and_write_anonymized_file(
         self,
         output_path: Path,
@@ -76,6 +238,7 @@ class ExcelProcessor(BaseProcessor):
         Reconstruit un fichier Excel complet (multi-feuilles) à partir des blocs traités.
         Utilise les métadonnées stockées lors de l'extraction ou relit le fichier si nécessaire.
         """
+        final_processed_blocks = self.dense_blocks(final_processed_blocks)
 
         # Si pour une raison quelconque self.sheets_metadata est vide (ex: redémarrage worker stateless pour la phase write ?),
         # il faudrait le re-populer. Dans le doute, on relit si vide.
@@ -93,9 +256,22 @@ class ExcelProcessor(BaseProcessor):
                     "columns": df.columns,
                 }
 
+        # Avec une sélection de colonnes, les cellules non sélectionnées
+        # reviennent du fichier original.
+        original_values: dict[str, Any] = {}
+        if self.selected_columns is not None:
+            dfs = pd.read_excel(
+                original_input_path, sheet_name=None, header=None, dtype=str
+            )
+            original_values = {
+                sheet_name: df.fillna("").values.astype(object)
+                for sheet_name, df in dfs.items()
+            }
+
         # Calcul global pour vérification
         total_cells_expected = sum(
-            m["shape"][0] * m["shape"][1] for m in self.sheets_metadata.values()
+            m["shape"][0] * self._block_width(sheet_name, m["shape"][1])
+            for sheet_name, m in self.sheets_metadata.items()
         )
 
         if total_cells_expected != len(final_processed_blocks):
@@ -118,7 +294,8 @@ class ExcelProcessor(BaseProcessor):
                 for sheet_name in self.sheet_names_order:
                     meta = self.sheets_metadata[sheet_name]
                     rows, cols = meta["shape"]
-                    count_cells = rows * cols
+                    block_cols = self._block_width(sheet_name, cols)
+                    count_cells = rows * block_cols
 
                     # Extraction du chunk de blocs correspondant à cette feuille
                     chunk = final_processed_blocks[
@@ -135,7 +312,13 @@ class ExcelProcessor(BaseProcessor):
                     # Reshape en matrice (DataFrame)
                     # np.array(chunk) crée un tableau 1D
                     # reshape((rows, cols)) le remet en 2D
-                    matrix_data = np.array(chunk).reshape((rows, cols))
+                    if self.selected_columns is not None:
+                        matrix_data = original_values[sheet_name]
+                        matrix_data[:, self.selected_columns[sheet_name]] = np.array(
+                            chunk, dtype=object
+                        ).reshape((rows, block_cols))
+                    else:
+                        matrix_data = np.array(chunk).reshape((rows, cols))
 
                     new_df = pd.DataFrame(
                         matrix_data, index=meta["index"], columns=meta["columns"]
@@ -149,3 +332,69 @@ class ExcelProcessor(BaseProcessor):
         except Exception as e:
             logger.error("Erreur lors de l'écriture Excel: %s", e)
             raise
+
+
+def _select_sheet_columns(
+    selection: ColumnSelection, first_row: list[str], sheet_columns: list[str]
+) -> list[int]:
+    """
+    Colonnes retenues dans une feuille : désignées par ``Feuille!B``, ``B``,
+    leur numéro ou la valeur de leur première ligne (en-tête).
+    """
+    selected = []
+    for index, reference in enumerate(sheet_columns):
+        names = [reference, reference.rsplit("!", 1)[1]]
+        if index < len(first_row) and first_row[index]:
+            names.append(first_row[index])
+        if selection.matches(index, names):
+            selected.append(index)
+    return selected
+
+
+def _iter_sheet_chunks(
+    worksheet: Any, chunk_rows: int, selection: ColumnSelection | None
+) -> Iterator[RowChunk]:
+    """Tranches d'une feuille ``read_only`` : les cellules texte non vides (et
+    sélectionnées) sont les blocs, les autres valeurs sont conservées."""
+    sheet = worksheet.title
+    sheet_columns: list[str] = []
+    selected: set[int] | None = None
+    rows: list[list[Any]] = []
+    blocks: TextBlocks = []
+    block_columns: list[str] = []
+    positions: list[tuple[int, int]] = []
+    cell_count = 0
+    emitted = False
+    for row_index, cells in enumerate(worksheet.iter_rows()):
+        if len(cells) > len(sheet_columns):
+            sheet_columns.extend(
+                f"{sheet}!{get_column_letter(index + 1)}"
+                for index in range(len(sheet_columns), len(cells))
+            )
+        if row_index == 0 and selection is not None:
+            first_row = [
+                "" if cell.value is None else str(cell.value) for cell in cells
+            ]
+            selected = set(_select_sheet_columns(selection, first_row, sheet_columns))
+        row: list[Any] = []
+        for column_index, cell in enumerate(cells):
+            value = cell.value
+            if (
+                cell.data_type == "s"
+                and value
+                and (selected is None or column_index in selected)
+            ):
+                blocks.append(value)
+                block_columns.append(sheet_columns[column_index])
+                positions.append((len(rows), column_index))
+                row.append(value)
+            else:
+                row.append(_streamed_value(cell))
+        cell_count += len(row)
+        rows.append(row)
+        if len(rows) == chunk_rows:
+            yield RowChunk(rows, blocks, block_columns, positions, cell_count, sheet)
+            emitted = True
+            rows, blocks, block_columns, positions, cell_count = [], [], [], [], 0
+    if rows or not emitted:
+        yield RowChunk(rows, blocks, block_columns, positions, cell_count, sheet)
@@ -0,0 +1,122 @@
+# anonyfiles_core/anonymizer/faker_backend.py
+"""Génération Faker par entité, sans état global partagé.
+
+L'ancien générateur reconstruisait la table label -> fournisseur à chaque
+appel et, en mode ``consistent``, appelait ``Faker.seed(graine)`` puis
+``Faker.seed(None)`` : la graine visait le générateur aléatoire partagé par
+toutes les instances Faker du processus, donc les jobs exécutés en parallèle
+par les workers de l'API (``job_worker_count > 1``) se perturbaient.
+
+Ici chaque thread dispose de ses propres instances Faker (une par locale),
+dotées d'un ``random.Random`` privé, et de la table des fournisseurs déjà
+résolue. Le mode cohérent utilise une seconde instance par locale, réservée
+à cet usage et réensemencée avec la graine MD5 de l'entité avant chaque
+valeur : mêmes valeurs que l'ancien ``Faker.seed``, sans toucher au générateur
+partagé ni à celui des valeurs aléatoires, qui restent imprévisibles.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+DEFAULT_FAKER_LOCALE = "fr_FR"
+
+# Méthode Faker par label ; les autres labels reçoivent ``FAKE_<LABEL>``.
+FAKER_PROVIDER_NAMES: dict[str, str] = {
+    "PER": "name",
+    "LOC": "city",
+    "ORG": "company",
+    "EMAIL": "email",
+    "PHONE": "phone_number",
+    "DATE": "date",
+    "IBAN": "iban",
+}
+
+
+def entity_seed(entity_text: str) -> int:
+    """Graine stable d'une entité (``hash()`` varie d'un processus à l'autre)."""
+    return int(
+        hashlib.md5(entity_text.encode("utf-8"), usedforsecurity=False).hexdigest(),
+        16,
+    )
+
+
+class _LocaleFaker:
+    """Instance Faker d'un thread et ses fournisseurs par label."""
+
+    __slots__ = ("fake", "providers")
+
+    def __init__(self, locale: str):
+        # Import différé : Faker n'est chargé qu'à la première valeur générée.
+        from faker import Faker
+
+        self.fake = Faker(locale)
+        # ``random.Random`` propre à l'instance : le générateur partagé par
+        # les autres instances du processus n'est plus jamais utilisé.
+        self.fake.seed_instance()
+        self.providers: dict[str, Callable[[], str]] = {
+            label: getattr(self.fake, method)
+            for label, method in FAKER_PROVIDER_NAMES.items()
+        }
+
+
+class FakerBackend:
+    """Valeurs Faker par label, cohérentes par entité et sûres entre threads."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def _locale_faker(self, locale: str, seeded: bool = False) -> _LocaleFaker:
+        """Instance du thread pour ``locale`` ; ``seeded`` désigne celle du
+        mode cohérent, la seule qui soit réensemencée."""
+        instances: dict[tuple[str, bool], _LocaleFaker] | None = getattr(
+            self._local, "instances", None
+        )
+        if instances is None:
+            instances = self._local.instances = {}
+        instance = instances.get((locale, seeded))
+        if instance is None:
+            instance = instances[(locale, seeded)] = _LocaleFaker(locale)
+        return instance
+
+    def faker(self, locale: str = DEFAULT_FAKER_LOCALE) -> Faker:
+        """Instance Faker du thread courant pour ``locale``."""
+        return self._locale_faker(locale).fake
+
+    def generate(
+        self,
+        label: str,
+        locale: str = DEFAULT_FAKER_LOCALE,
+        seed_text: str | None = None,
+    ) -> str:
+        """Une valeur pour ``label`` ; déterministe si ``seed_text`` est fourni."""
+        instance = self._locale_faker(locale, seeded=seed_text is not None)
+        provider = instance.providers.get(label)
+        if provider is None:
+            return f"FAKE_{label}"
+        if seed_text is not None:
+            instance.fake.seed_instance(entity_seed(seed_text))
+        return str(provider())
+
+    def generate_many(
+        self, label: str, count: int, locale: str = DEFAULT_FAKER_LOCALE
+    ) -> list[str]:
+        """``count`` valeurs aléatoires pour ``label``, générées d'un bloc."""
+        provider = self._locale_faker(locale).providers.get(label)
+        if provider is None:
+            return [f"FAKE_{label}"] * count
+        return [str(provider()) for _ in range(count)]
+
+
+_DEFAULT_BACKEND = FakerBackend()
+
+
+def get_faker_backend() -> FakerBackend:
+    """Backend partagé du processus (ses instances Faker sont par thread)."""
+    return _DEFAULT_BACKEND
@@ -0,0 +1,84 @@
+# anonyfiles_core/anonymizer/first_name_lexicon.py
+"""Lexique des prénoms français, précompilé dans ``data/french_first_names.txt``.
+
+Le lexique était reconstruit à chaque import de ``ner_processor`` : import
+des fournisseurs Faker puis normalisation NFKD de chaque prénom, payés par
+chaque appel CLI et chaque démarrage du sidecar même sans mode strict.
+L'artefact versionné contient les clés déjà normalisées, triées, une par
+ligne ; il est lu au premier contrôle de prénom (mode strict, ligne réduite
+à un prénom, scanner anti-fuite) puis gardé en mémoire.
+
+Régénération : ``python scripts/build_first_name_lexicon.py``.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import unicodedata
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+LEXICON_VERSION = 1
+LEXICON_PATH = Path(__file__).with_name("data") / "french_first_names.txt"
+_HEADER_PREFIX = "# anonyfiles-first-names v"
+
+# Prénoms absents de Faker, ajoutés au lexique lors de sa construction.
+EXTRA_FRENCH_FIRST_NAMES = frozenset({"ambre"})
+
+
+def normalize_name_key(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value.strip())
+    without_accents = "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+    return without_accents.replace("’", "'").lower()
+
+
+def build_french_first_names() -> frozenset[str]:
+    """Construit le lexique depuis Faker (script de build, secours)."""
+    try:
+        from faker.providers.person.fr_FR import Provider as FrenchPersonProvider
+    except ImportError:  # pragma: no cover - faker is a project dependency
+        return EXTRA_FRENCH_FIRST_NAMES
+
+    names = set(EXTRA_FRENCH_FIRST_NAMES)
+    names.update(
+        normalize_name_key(name)
+        for name in getattr(FrenchPersonProvider, "first_names", ())
+    )
+    return frozenset(names)
+
+
+def format_lexicon(names: frozenset[str]) -> str:
+    """Contenu de l'artefact : en-tête versionné puis une clé par ligne."""
+    return "\n".join([f"{_HEADER_PREFIX}{LEXICON_VERSION}", *sorted(names)]) + "\n"
+
+
+def _read_lexicon(path: Path) -> frozenset[str] | None:
+    try:
+        header, *names = path.read_text(encoding="utf-8").splitlines()
+    except (OSError, ValueError):
+        return None
+    if header != f"{_HEADER_PREFIX}{LEXICON_VERSION}":
+        return None
+    return frozenset(name for name in names if name)
+
+
+@functools.cache
+def french_first_names() -> frozenset[str]:
+    """Clés normalisées des prénoms français, chargées au premier appel."""
+    names = _read_lexicon(LEXICON_PATH)
+    if names is None:
+        logger.warning(
+            "Lexique de prénoms %s absent ou d'une autre version : "
+            "reconstruction depuis Faker.",
+            LEXICON_PATH,
+        )
+        names = build_french_first_names()
+    return names
+
+
+def is_french_first_name(name: str) -> bool:
+    return normalize_name_key(name) in french_first_names()
@@ -8,6 +8,11 @@ from typing import Any
 import aiofiles
 
 from .base_processor import BaseProcessor
+from .column_selection import (
+    JsonPathPattern,
+    JsonPathSelection,
+    advance_json_paths,
+)
 from .type_defs import JsonPath, JsonPathSegment, TextBlocks
 
 # from .utils import apply_positional_replacements # Probablement plus nécessaire ici
@@ -70,6 +75,56 @@ class JsonProcessor(BaseProcessor):
                 self._value_paths.append(path)
                 values.append(str(node))
 
+    def _traverse_paths(
+        self,
+        node: Any,
+        path: JsonPath,
+        selection: JsonPathSelection,
+        patterns: list[tuple[int, JsonPathPattern]],
+        values: TextBlocks,
+    ) -> None:
+        """Collecte les valeurs des sous-arbres désignés par ``json_paths`` ;
+        les branches qu'aucun chemin ne peut atteindre ne sont pas parcourues."""
+        if selection.mark_reached(patterns):
+            self._traverse(node, path, True, values, None, False)
+            return
+        if isinstance(node, dict):
+            children: Any = node.items()
+        elif isinstance(node, list):
+            children = enumerate(node)
+        else:
+            return
+        for key, child in children:
+            remaining = advance_json_paths(patterns, key)
+            if remaining:
+                self._traverse_paths(child, path + [key], selection, remaining, values)
+
+    def _collect(
+        self,
+        target_keys: list[str] | None,
+        anonymize_keys: bool,
+        json_paths: list[str] | None,
+    ) -> TextBlocks:
+        self._value_paths = []
+        self._key_paths = []
+        collected_values: TextBlocks = []
+        if json_paths:
+            selection = JsonPathSelection(json_paths)
+            self._traverse_paths(
+                self._original_json,
+                [],
+                selection,
+                selection.patterns,
+                collected_values,
+            )
+            selection.check_all_matched("le document JSON")
+            return collected_values
+        keys_set = set(target_keys) if target_keys else None
+        self._traverse(
+            self._original_json, [], False, collected_values, keys_set, anonymize_keys
+        )
+        return collected_values
+
     def extract_blocks(
         self,
         input_path: Path,
@@ -88,14 +143,7 @@ class JsonProcessor(BaseProcessor):
             self._original_json = None
             return []
 
-        self._value_paths = []
-        self._key_paths = []
-        collected_values: TextBlocks = []
-        keys_set = set(target_keys) if target_keys else None
-        self._traverse(
-            self._original_json, [], False, collected_values, keys_set, anonymize_keys
-        )
-        return collected_values
+        return self._collect(target_keys, anonymize_keys, kwargs.get("json_paths"))
 
     async def extract_blocks_async(
         self,
@@ -115,14 +163,7 @@ class JsonProcessor(BaseProcessor):
             self._original_json = None
             return []
 
-        self._value_paths = []
-        self._key_paths = []
-        collected_values: TextBlocks = []
-        keys_set = set(target_keys) if target_keys else None
-        self._traverse(
-            self._original_json, [], False, collected_values, keys_set, anonymize_keys
-        )
-        return collected_values
+        return self._collect(target_keys, anonymize_keys, kwargs.get("json_paths"))
 
     def reconstruct_and_write_anonymized_file(
         self,
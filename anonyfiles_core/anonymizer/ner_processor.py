@@ -2,8 +2,10 @@
 
 import logging
 import re
-import unicodedata
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
 
+from .first_name_lexicon import french_first_names, normalize_name_key
 from .spacy_engine import (
     ADDRESS_REGEX,
     DATE_REGEX,
@@ -12,23 +14,22 @@ from .spacy_engine import (
     PHONE_REGEX,
     SpaCyEngine,
 )
+from .span_index import SpanIndex
 
 logger = logging.getLogger(__name__)
 
-_EXTRA_FRENCH_FIRST_NAMES = {
-    "ambre",
-}
-
 _SINGLE_NAME_LINE_RE = re.compile(
     r"(?m)^(?P<prefix>[ \t]*)(?P<name>[A-ZÀ-ÖØ-Þ][A-Za-zÀ-ÖØ-öø-ÿ'’-]{1,40})(?P<suffix>[ \t]*)$"
 )
 _STRICT_FIRST_NAME_TOKEN_RE = re.compile(
     r"(?<![\w'’-])(?P<name>[A-ZÀ-ÖØ-Þ][A-Za-zÀ-ÖØ-öø-ÿ'’-]{1,40})(?![\w'’-])"
 )
+# Parties bornées et garde à gauche comme EMAIL_REGEX : temps linéaire sur les
+# entrées adverses, adresse trouvée entière ou pas du tout.
 _STRICT_EMAIL_OBFUSCATED_RE = re.compile(
-    r"\b[A-Z0-9._%+-]+[ \t]*"
+    r"(?<![A-Z0-9._%+-])[A-Z0-9._%+-]{1,64}[ \t]*"
     r"(?:@|\[?[ \t]*(?:at|arobase)[ \t]*\]?)[ \t]*"
-    r"[A-Z0-9.-]+[ \t]*"
+    r"[A-Z0-9.-]{1,255}[ \t]*"
     r"(?:\.|\[?[ \t]*(?:dot|point)[ \t]*\]?)[ \t]*"
     r"[A-Z]{2,10}\b",
     re.IGNORECASE,
@@ -75,30 +76,164 @@ _STRICT_CONTEXT_LABEL_BY_KEY = {
 }
 
 
-def _normalize_name_key(value: str) -> str:
-    decomposed = unicodedata.normalize("NFKD", value.strip())
-    without_accents = "".join(
-        char for char in decomposed if not unicodedata.combining(char)
-    )
-    return without_accents.replace("’", "'").lower()
+def __getattr__(name: str):
+    # Compatibilité : l'ancien ``FRENCH_FIRST_NAMES`` construit à l'import.
+    if name == "FRENCH_FIRST_NAMES":
+        return french_first_names()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_REGEX_SOURCES = {
+    "EMAIL": EMAIL_REGEX,
+    "DATE": DATE_REGEX,
+    "PHONE": PHONE_REGEX,
+    "IBAN": IBAN_REGEX,
+    "ADDRESS": ADDRESS_REGEX,
+}
+
+PRIORITY_REGEX_LABELS = {"EMAIL", "DATE", "PHONE", "IBAN", "ADDRESS"}
 
+_REGEX_FLAGS = {"ADDRESS": re.IGNORECASE, "DATE": re.IGNORECASE}
 
-def _get_faker_french_first_names() -> tuple[str, ...]:
-    try:
-        from faker.providers.person.fr_FR import Provider as FrenchPersonProvider
-    except ImportError:  # pragma: no cover - faker is a project dependency
-        return ()
+# Préfiltres caractères : toutes les alternatives de ces regex exigent un "@"
+# (EMAIL) ou un chiffre (les autres). Un bloc qui n'en contient pas est écarté
+# sans aucun parcours regex — cas de la majorité des cellules courtes.
+_DIGIT_RE = re.compile(r"\d")
 
-    return tuple(getattr(FrenchPersonProvider, "first_names", ()))
 
+class RegexEntityDetector:
+    """Détecteur regex compilé une fois pour un ensemble de labels.
 
-def _load_french_first_names() -> set[str]:
-    names = set(_EXTRA_FRENCH_FIRST_NAMES)
-    names.update(_normalize_name_key(name) for name in _get_faker_french_first_names())
-    return names
+    Produit exactement les spans de ``re.finditer`` label par label (ordre
+    de ``_REGEX_SOURCES``, y compris les chevauchements entre labels), mais :
 
+    - les motifs sont précompilés (plus de recherche dans le cache ``re``) ;
+    - les préfiltres ``@`` / chiffre éliminent les labels impossibles ;
+    - un motif combiné (un groupe nommé par label) parcourt le bloc une seule
+      fois : sans correspondance, aucun label ne peut matcher et le bloc est
+      terminé ; sinon le balayage par label démarre à la première
+      correspondance, aucun label ne pouvant matcher avant.
+    """
 
-FRENCH_FIRST_NAMES = _load_french_first_names()
+    def __init__(self, enabled_labels: set[str]):
+        self.labels = [label for label in _REGEX_SOURCES if label in enabled_labels]
+        self.patterns = {
+            label: re.compile(_REGEX_SOURCES[label], _REGEX_FLAGS.get(label, 0))
+            for label in self.labels
+        }
+        self._combined_by_labels: dict[tuple[str, ...], re.Pattern[str]] = {}
+
+    def _combined(self, labels: tuple[str, ...]) -> re.Pattern[str]:
+        combined = self._combined_by_labels.get(labels)
+        if combined is None:
+            alternatives = []
+            for label in labels:
+                source = _REGEX_SOURCES[label]
+                if label in _REGEX_FLAGS:
+                    source = f"(?i:{source})"
+                alternatives.append(f"(?P<{label}>{source})")
+            combined = re.compile("|".join(alternatives))
+            self._combined_by_labels[labels] = combined
+        return combined
+
+    def finditer(self, text: str) -> Iterator[tuple[str, int, int]]:
+        """Itère sur les ``(label, start, end)`` trouvés dans ``text``."""
+        has_at = "@" in text
+        has_digit = _DIGIT_RE.search(text) is not None
+        labels = tuple(
+            label
+            for label in self.labels
+            if (has_at if label == "EMAIL" else has_digit)
+        )
+        if not labels:
+            return
+        first_match = self._combined(labels).search(text)
+        if first_match is None:
+            return
+        for label in labels:
+            for match in self.patterns[label].finditer(text, first_match.start()):
+                yield label, match.start(), match.end()
+
+
+# Nombre de blocs transmis à ``nlp.pipe`` par lot. Surchargeable via la clé
+# ``ner_batch_size`` de la configuration moteur.
+DEFAULT_NER_BATCH_SIZE = 256
+
+# Les blocs plus longs que ``ner_window_size`` caractères (typiquement un
+# fichier TXT/LOG entier) sont analysés par fenêtres : la taille des docs spaCy
+# (et donc la mémoire) est bornée par la fenêtre, pas par le fichier, et on
+# reste loin de ``nlp.max_length``. ``ner_window_overlap`` caractères de
+# contexte sont ajoutés de part et d'autre de chaque fenêtre.
+DEFAULT_NER_WINDOW_SIZE = 100_000
+DEFAULT_NER_WINDOW_OVERLAP = 200
+
+# Nombre maximal de blocs distincts mémorisés (LRU) par ``NERProcessor`` : les
+# exports CSV/XLSX répètent massivement les mêmes cellules (villes, statuts,
+# sociétés), dont les spans relatifs sont réutilisés sans repasser par spaCy.
+# ``0`` désactive le cache.
+DEFAULT_NER_MEMO_SIZE = 10_000
+
+
+def _window_cut(text: str, start: int, end: int) -> int:
+    """Meilleure coupure dans ``text[start:end]`` : paragraphe, ligne, espace.
+
+    Retourne ``end`` (coupure franche) si aucune frontière n'est disponible.
+    """
+    for separator in ("\n\n", "\n"):
+        position = text.rfind(separator, start, end)
+        if position != -1:
+            return position + len(separator)
+    for position in range(end - 1, start - 1, -1):
+        if text[position].isspace():
+            return position + 1
+    return end
+
+
+def _iter_detection_windows(
+    text: str, window_size: int, overlap: int
+) -> Iterator[tuple[int, int, int, int]]:
+    """Découpe ``text`` en fenêtres ``(window_start, window_end, core_start, core_end)``.
+
+    Les cœurs ``[core_start, core_end)`` sont contigus, disjoints et alignés sur
+    des frontières de paragraphe/ligne : une entité (toujours mono-ligne après
+    ``_trim_entity_span``) appartient au cœur qui contient son début, ce qui
+    évite de la compter deux fois dans les zones de recouvrement.
+    """
+    text_length = len(text)
+    core_start = 0
+    while core_start < text_length:
+        core_end = min(text_length, core_start + window_size)
+        if core_end < text_length:
+            core_end = _window_cut(text, core_start + window_size // 2, core_end)
+        yield (
+            max(0, core_start - overlap),
+            min(text_length, core_end + overlap),
+            core_start,
+            core_end,
+        )
+        core_start = core_end
+
+
+def _unique_entities_across_blocks(
+    entities_per_block: Sequence[list[tuple[str, str, int, int]]],
+) -> list[tuple[str, str]]:
+    """Liste (texte, label) unique, dans l'ordre de première apparition.
+
+    ``entities_per_block`` peut être une liste de listes ou une ``SpanTable``.
+
+    Un label regex prioritaire remplace un label NER vu précédemment pour le
+    même texte (ex. une date reconnue ``MISC`` par spaCy puis ``DATE`` par regex).
+    """
+    unique_labels: dict[str, str] = {}
+    for block_entities in entities_per_block:
+        for ent_text, ent_label, _, _ in block_entities:
+            existing_label = unique_labels.get(ent_text)
+            if existing_label is None or (
+                ent_label in PRIORITY_REGEX_LABELS
+                and existing_label not in PRIORITY_REGEX_LABELS
+            ):
+                unique_labels[ent_text] = ent_label
+    return list(unique_labels.items())
 
 
 def _trim_entity_span(
@@ -120,23 +255,19 @@ def _trim_entity_span(
     return cleaned_text, label, start, end
 
 
-def _overlaps_existing_span(
-    start: int, end: int, entities: list[tuple[str, str, int, int]]
-) -> bool:
-    return any(
-        start < existing_end and end > existing_start
-        for *_, existing_start, existing_end in entities
-    )
-
-
 def _add_non_overlapping_entity(
     text: str,
     label: str,
     start: int,
     end: int,
     entities: list[tuple[str, str, int, int]],
+    occupied: SpanIndex,
     enabled_labels: set[str],
 ) -> None:
+    """Ajoute l'entité si elle ne chevauche aucun span de ``occupied``.
+
+    ``occupied`` indexe les spans de ``entities`` et est tenu à jour.
+    """
     if label not in enabled_labels:
         return
 
@@ -145,10 +276,11 @@ def _add_non_overlapping_entity(
         return
 
     _ent_text, _ent_label, clean_start, clean_end = clean_entity
-    if _overlaps_existing_span(clean_start, clean_end, entities):
+    if occupied.overlaps(clean_start, clean_end):
         return
 
     entities.append(clean_entity)
+    occupied.add(clean_start, clean_end)
 
 
 def _fallback_to_misc(label: str, enabled_labels: set[str]) -> str | None:
@@ -160,7 +292,7 @@ def _fallback_to_misc(label: str, enabled_labels: set[str]) -> str | None:
 
 
 def _context_label_for_key(key: str, enabled_labels: set[str]) -> str | None:
-    normalized_key = _normalize_name_key(key)
+    normalized_key = normalize_name_key(key)
     label = _STRICT_CONTEXT_LABEL_BY_KEY.get(normalized_key)
     if label is None:
         return None
@@ -171,6 +303,94 @@ def _clean_context_value(value: str) -> str:
     return value.strip(" \t:-=.,;()[]{}\"'’")
 
 
+# Filtre pré-NER : spaCy n'est appelé que sur les blocs où le modèle
+# statistique (PER/LOC/ORG/MISC) peut apporter quelque chose. Les autres ne
+# passent que par les regex et le lexique de prénoms.
+DEFAULT_NER_GATE = True
+_GATE_MIN_TOKEN_LENGTH = 3
+# Placeholders laissés par les règles personnalisées ou d'anciens passages.
+_GATE_PLACEHOLDER_RE = re.compile(r"\{\{[^{}]+\}\}|\[[A-Z0-9_ -]+\]")
+
+
+def ner_can_contribute(block_text: str) -> bool:
+    """Vrai si le NER statistique peut trouver une entité dans ``block_text``.
+
+    Rejette les blocs sans aucune majuscule (nombres, dates, texte tout en
+    minuscules), ceux réduits à un seul jeton très court, et ceux qui ne
+    contiennent que des placeholders.
+    """
+    text = _GATE_PLACEHOLDER_RE.sub(" ", block_text).strip()
+    if not any(char.isupper() for char in text):
+        return False
+    # Un jeton isolé trop court ("OK", "M.") ne porte pas d'entité nommée.
+    return len(text) >= _GATE_MIN_TOKEN_LENGTH or any(char.isspace() for char in text)
+
+
+class _NoSpacyDoc:
+    """Doc vide : ``_detect_entities_in_block`` sans entités spaCy."""
+
+    ents: tuple = ()
+
+
+_NO_SPACY_DOC = _NoSpacyDoc()
+
+# Regroupement (packing) des petits blocs : les blocs courts consécutifs sont
+# concaténés, séparés par ``_PACK_SEPARATOR``, en documents d'environ
+# ``ner_pack_size`` caractères avant ``nlp.pipe``. ``0`` désactive (défaut :
+# le contexte des cellules voisines peut influencer le modèle).
+DEFAULT_NER_PACK_SIZE = 0
+_PACK_SEPARATOR = "\n\n"
+_PACKABLE_BLOCK_MAX_LENGTH = 64
+
+
+class _PackedEntity:
+    """Entité spaCy ramenée aux offsets de son bloc d'origine."""
+
+    __slots__ = ("end_char", "label_", "start_char")
+
+    def __init__(self, label: str, start_char: int, end_char: int):
+        self.label_ = label
+        self.start_char = start_char
+        self.end_char = end_char
+
+
+class _PackedDoc:
+    """Vue d'un bloc dans un document regroupé (seul ``ents`` est utilisé)."""
+
+    __slots__ = ("ents",)
+
+    def __init__(self, ents: list[_PackedEntity]):
+        self.ents = ents
+
+
+def _split_packed_doc(doc, members: list[tuple[str, int]]) -> list[_PackedDoc]:
+    """Répartit les entités d'un document regroupé entre ses blocs.
+
+    ``members`` liste les ``(texte, offset)`` des blocs. Une entité qui
+    déborde de son bloc (à cheval sur un séparateur) est écartée.
+    """
+    entities = sorted(doc.ents, key=lambda ent: ent.start_char)
+    views: list[_PackedDoc] = []
+    entity_index = 0
+    for text, offset in members:
+        block_end = offset + len(text)
+        block_entities = []
+        while (
+            entity_index < len(entities)
+            and entities[entity_index].start_char < block_end
+        ):
+            ent = entities[entity_index]
+            entity_index += 1
+            if ent.start_char >= offset and ent.end_char <= block_end:
+                block_entities.append(
+                    _PackedEntity(
+                        ent.label_, ent.start_char - offset, ent.end_char - offset
+                    )
+                )
+        views.append(_PackedDoc(block_entities))
+    return views
+
+
 class NERProcessor:
     """
     Détecte les entités nommées (NER) dans des blocs de texte en utilisant spaCy et des regex additionnelles.
@@ -182,13 +402,32 @@ class NERProcessor:
         enabled_labels: set[str],
         excluded_labels: set[str],
         strict_mode: bool = False,
+        batch_size: int = DEFAULT_NER_BATCH_SIZE,
+        window_size: int = DEFAULT_NER_WINDOW_SIZE,
+        window_overlap: int = DEFAULT_NER_WINDOW_OVERLAP,
+        memo_size: int = DEFAULT_NER_MEMO_SIZE,
+        gate: bool = DEFAULT_NER_GATE,
+        pack_size: int = DEFAULT_NER_PACK_SIZE,
     ):
         self.spacy_engine = spacy_engine
         self.enabled_labels = enabled_labels
         self.excluded_labels = excluded_labels
         self.strict_mode = strict_mode
+        self.batch_size = max(1, int(batch_size))
+        self.window_size = max(1, int(window_size))
+        self.window_overlap = max(0, int(window_overlap))
+        self.memo_size = max(0, int(memo_size))
+        self.gate = bool(gate)
+        self.pack_size = max(0, int(pack_size))
+        # Cache LRU : (texte du bloc, labels actifs, mode strict) -> spans relatifs.
+        self._memo: OrderedDict[
+            tuple[str, frozenset[str], bool], tuple[tuple[str, str, int, int], ...]
+        ] = OrderedDict()
+        # Compteurs de la dernière détection (remontés dans ``detection_stats``).
+        self.stats: dict[str, int] = {}
 
         self.final_enabled_labels_for_spacy = self.enabled_labels - self.excluded_labels
+        self.regex_detector = RegexEntityDetector(self.final_enabled_labels_for_spacy)
         logger.debug(
             "DEBUG (NERProcessor Init): Labels spaCy effectivement activés pour la détection : %s",
             self.final_enabled_labels_for_spacy,
@@ -203,145 +442,263 @@ class NERProcessor:
         1. Une liste de tuples (entity_text, label) de toutes les entités uniques détectées.
         2. Une liste de listes de tuples (entity_text, label, start_char, end_char) par bloc,
            incluant les offsets pour le remplacement positionnel.
+
+        Les blocs non vides sont envoyés à spaCy par lots (``nlp.pipe``) de
+        ``batch_size`` documents : le coût fixe par appel est amorti sur les
+        formats à nombreuses petites cellules (CSV, XLSX, DOCX). Un bloc
+        identique à un bloc déjà analysé (cache LRU de ``memo_size`` entrées,
+        ou doublon dans le même appel) réutilise les spans calculés. Avec
+        ``gate``, les blocs rejetés par ``ner_can_contribute`` ne passent que
+        par les regex et heuristiques. Avec ``pack_size``, les petits blocs
+        consécutifs sont regroupés en un seul document spaCy.
         """
-        all_unique_entities_across_blocks: dict[str, tuple[str, str]] = (
-            {}
-        )  # {entity_text: (label, source_type)}
-        spacy_entities_per_block_with_offsets: list[list[tuple[str, str, int, int]]] = (
-            []
-        )
+        # Bloc vide (ex. cellule CSV vide) : on conserve l'alignement 1:1
+        # entre blocs et entités-par-bloc, sinon l'engine lève
+        # `IndexError` en indexant entities_per_block[i] en aval.
+        spacy_entities_per_block_with_offsets: list[list[tuple[str, str, int, int]]] = [
+            [] for _ in text_blocks
+        ]
 
-        regex_sources = {
-            "EMAIL": EMAIL_REGEX,
-            "DATE": DATE_REGEX,
-            "PHONE": PHONE_REGEX,
-            "IBAN": IBAN_REGEX,
-            "ADDRESS": ADDRESS_REGEX,
+        self.stats = {
+            "windowed_blocks": 0,
+            "windows": 0,
+            "memo_hits": 0,
+            "memo_misses": 0,
+            "gate_skipped_blocks": 0,
+            "spacy_blocks": 0,
+            "packed_docs": 0,
+            "packed_blocks": 0,
         }
 
-        PRIORITY_REGEX_LABELS = {"EMAIL", "DATE", "PHONE", "IBAN", "ADDRESS"}
-
-        for block_text in text_blocks:
-            detected_entities_for_this_block: list[tuple[str, str, int, int]] = (
-                []
-            )  # Cette variable est celle qui est remplie
-
-            if block_text.strip():
-                doc = self.spacy_engine.nlp_doc(block_text)
-
-                # 1. Collecter toutes les entités spaCy pertinentes
-                for ent in doc.ents:
-                    if ent.label_ in self.final_enabled_labels_for_spacy:
-                        clean_entity = _trim_entity_span(
-                            block_text, ent.label_, ent.start_char, ent.end_char
-                        )
-                        if clean_entity is not None:
-                            detected_entities_for_this_block.append(clean_entity)
-
-                # 2. Collecter toutes les entités Regex pertinentes
-                for label, pattern in regex_sources.items():
-                    if label in self.final_enabled_labels_for_spacy:
-                        flags = re.IGNORECASE if label in {"ADDRESS", "DATE"} else 0
-                        for match in re.finditer(
-                            pattern,
-                            block_text,
-                            flags,
-                        ):
-                            clean_entity = _trim_entity_span(
-                                block_text, label, match.start(), match.end()
-                            )
-                            if clean_entity is not None:
-                                detected_entities_for_this_block.append(clean_entity)
-
-                if "PER" in self.final_enabled_labels_for_spacy:
-                    for match in _SINGLE_NAME_LINE_RE.finditer(block_text):
-                        name = match.group("name")
-                        if _normalize_name_key(name) not in FRENCH_FIRST_NAMES:
-                            continue
-                        start, end = match.span("name")
-                        if _overlaps_existing_span(
-                            start, end, detected_entities_for_this_block
-                        ):
-                            continue
-                        detected_entities_for_this_block.append(
-                            (name, "PER", start, end)
-                        )
-
-                if self.strict_mode:
-                    self._add_strict_entities(
-                        block_text,
-                        detected_entities_for_this_block,
-                    )
-
-                # 3. Nettoyer et dédupliquer les entités du bloc avec gestion de priorité
-                processed_entities_for_this_block: list[tuple[str, str, int, int]] = []
-                best_entities_by_span: dict[tuple[int, int], tuple[str, str]] = {}
-
-                # La variable à trier est bien 'detected_entities_for_this_block'
-                detected_entities_for_this_block.sort(key=lambda x: x[2])
-
-                for ent_text, ent_label, start, end in detected_entities_for_this_block:
-                    span = (start, end)
-
-                    if span in best_entities_by_span:
-                        _existing_text, existing_label = best_entities_by_span[span]
-
-                        if (
-                            ent_label in PRIORITY_REGEX_LABELS
-                            and existing_label not in PRIORITY_REGEX_LABELS
-                        ):
-                            best_entities_by_span[span] = (ent_text, ent_label)
-                    else:
-                        best_entities_by_span[span] = (ent_text, ent_label)
-
-                processed_entities_for_this_block = sorted(
-                    [
-                        (text, label, start, end)
-                        for (start, end), (text, label) in best_entities_by_span.items()
-                    ],
-                    key=lambda x: x[2],
+        # Blocs à analyser : texte -> indices des blocs identiques.
+        pending: dict[str, list[int]] = {}
+        for index, block_text in enumerate(text_blocks):
+            if not block_text.strip() or len(block_text) > self.window_size:
+                continue
+            cached = self._memo_get(block_text)
+            if cached is not None:
+                self.stats["memo_hits"] += 1
+                spacy_entities_per_block_with_offsets[index] = list(cached)
+            elif block_text in pending:
+                self.stats["memo_hits"] += 1
+                pending[block_text].append(index)
+            elif self.gate and not ner_can_contribute(block_text):
+                self.stats["memo_misses"] += 1
+                self.stats["gate_skipped_blocks"] += 1
+                block_entities = self.detect_entities_without_spacy(block_text)
+                self._memo_put(block_text, block_entities)
+                spacy_entities_per_block_with_offsets[index] = block_entities
+            else:
+                self.stats["memo_misses"] += 1
+                pending[block_text] = [index]
+
+        self.stats["spacy_blocks"] = len(pending)
+        docs = self._iter_block_docs(list(pending))
+        for (block_text, indices), doc in zip(pending.items(), docs, strict=True):
+            block_entities = self._detect_entities_in_block(block_text, doc)
+            self._memo_put(block_text, block_entities)
+            for index in indices:
+                spacy_entities_per_block_with_offsets[index] = list(block_entities)
+
+        for index, block_text in enumerate(text_blocks):
+            if len(block_text) > self.window_size and block_text.strip():
+                spacy_entities_per_block_with_offsets[index] = (
+                    self._detect_entities_in_windows(block_text)
                 )
 
-                # Add to the global list of unique entities (for the mapping)
-                for ent_text, ent_label, _, _ in processed_entities_for_this_block:
-                    is_current_regex_label = ent_label in PRIORITY_REGEX_LABELS
-
-                    if ent_text not in all_unique_entities_across_blocks:
-                        all_unique_entities_across_blocks[ent_text] = (
-                            ent_label,
-                            "initial",
-                        )
-                    else:
-                        existing_label, _ = all_unique_entities_across_blocks[ent_text]
-                        is_existing_regex_label = (
-                            existing_label in PRIORITY_REGEX_LABELS
-                        )
-
-                        if is_current_regex_label and not is_existing_regex_label:
-                            all_unique_entities_across_blocks[ent_text] = (
-                                ent_label,
-                                "regex_override",
-                            )
-
-                spacy_entities_per_block_with_offsets.append(
-                    processed_entities_for_this_block
+        return (
+            _unique_entities_across_blocks(spacy_entities_per_block_with_offsets),
+            spacy_entities_per_block_with_offsets,
+        )
+
+    def _iter_block_docs(self, texts: list[str]) -> Iterator:
+        """Docs spaCy (ou vues de docs regroupés) alignés sur ``texts``."""
+        if not self.pack_size:
+            yield from self.spacy_engine.nlp_pipe(texts, batch_size=self.batch_size)
+            return
+
+        # Unités envoyées à spaCy : un bloc seul, ou plusieurs petits blocs
+        # consécutifs regroupés (liste de ``(texte, offset)``).
+        units: list[list[tuple[str, int]]] = []
+        current: list[tuple[str, int]] = []
+        current_length = 0
+        for text in texts:
+            packable = len(text) <= _PACKABLE_BLOCK_MAX_LENGTH
+            if current and (
+                not packable or current_length + len(text) > self.pack_size
+            ):
+                units.append(current)
+                current, current_length = [], 0
+            if not packable:
+                units.append([(text, 0)])
+                continue
+            current.append((text, current_length))
+            current_length += len(text) + len(_PACK_SEPARATOR)
+        if current:
+            units.append(current)
+
+        docs = self.spacy_engine.nlp_pipe(
+            (_PACK_SEPARATOR.join(text for text, _offset in unit) for unit in units),
+            batch_size=self.batch_size,
+        )
+        for unit, doc in zip(units, docs, strict=True):
+            if len(unit) == 1:
+                yield doc
+                continue
+            self.stats["packed_docs"] += 1
+            self.stats["packed_blocks"] += len(unit)
+            yield from _split_packed_doc(doc, unit)
+
+    def detect_entities_without_spacy(
+        self, block_text: str
+    ) -> list[tuple[str, str, int, int]]:
+        """Regex et heuristiques seules, pour un bloc où spaCy n'apporte rien.
+
+        Utilisé pour les cellules des colonnes non textuelles (montants,
+        identifiants, dates) repérées par le profilage des colonnes.
+        """
+        if not block_text.strip():
+            return []
+        return self._detect_entities_in_block(block_text, _NO_SPACY_DOC)
+
+    def _memo_key(self, block_text: str) -> tuple[str, frozenset[str], bool]:
+        return (
+            block_text,
+            frozenset(self.final_enabled_labels_for_spacy),
+            self.strict_mode,
+        )
+
+    def _memo_get(
+        self, block_text: str
+    ) -> tuple[tuple[str, str, int, int], ...] | None:
+        if not self.memo_size:
+            return None
+        key = self._memo_key(block_text)
+        cached = self._memo.get(key)
+        if cached is not None:
+            self._memo.move_to_end(key)
+        return cached
+
+    def _memo_put(
+        self, block_text: str, entities: list[tuple[str, str, int, int]]
+    ) -> None:
+        if not self.memo_size:
+            return
+        self._memo[self._memo_key(block_text)] = tuple(entities)
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def _detect_entities_in_windows(
+        self, block_text: str
+    ) -> list[tuple[str, str, int, int]]:
+        """Détection fenêtrée d'un bloc long, offsets ramenés au bloc entier.
+
+        Les fenêtres sont générées et analysées une à une : seul le doc spaCy
+        de la fenêtre courante est vivant.
+        """
+        windows = list(
+            _iter_detection_windows(block_text, self.window_size, self.window_overlap)
+        )
+        self.stats["windowed_blocks"] += 1
+        self.stats["windows"] += len(windows)
+
+        docs = self.spacy_engine.nlp_pipe(
+            (block_text[start:end] for start, end, _, _ in windows),
+            batch_size=1,
+        )
+        stitched: list[tuple[str, str, int, int]] = []
+        last_end = 0
+        for (window_start, window_end, core_start, core_end), doc in zip(
+            windows, docs, strict=True
+        ):
+            window_entities = self._detect_entities_in_block(
+                block_text[window_start:window_end], doc
+            )
+            for ent_text, ent_label, start, end in window_entities:
+                start += window_start
+                end += window_start
+                # Une entité appartient à la fenêtre dont le cœur contient son
+                # début ; les détections du recouvrement sont ignorées.
+                if not core_start <= start < core_end or start < last_end:
+                    continue
+                stitched.append((ent_text, ent_label, start, end))
+                last_end = end
+        return stitched
+
+    def _detect_entities_in_block(
+        self, block_text: str, doc
+    ) -> list[tuple[str, str, int, int]]:
+        """Fusionne entités spaCy (``doc``), regex et heuristiques pour un bloc non vide."""
+        detected_entities_for_this_block: list[tuple[str, str, int, int]] = []
+
+        # 1. Collecter toutes les entités spaCy pertinentes
+        for ent in doc.ents:
+            if ent.label_ in self.final_enabled_labels_for_spacy:
+                clean_entity = _trim_entity_span(
+                    block_text, ent.label_, ent.start_char, ent.end_char
                 )
-            else:
-                # Bloc vide (ex. cellule CSV vide) : on conserve l'alignement 1:1
-                # entre blocs et entités-par-bloc, sinon l'engine lève
-                # `IndexError` en indexant entities_per_block[i] en aval.
-                spacy_entities_per_block_with_offsets.append([])
+                if clean_entity is not None:
+                    detected_entities_for_this_block.append(clean_entity)
 
-        final_unique_entities_list = [
-            (text, data[0]) for text, data in all_unique_entities_across_blocks.items()
-        ]
+        # 2. Collecter toutes les entités Regex pertinentes
+        for label, start, end in self.regex_detector.finditer(block_text):
+            clean_entity = _trim_entity_span(block_text, label, start, end)
+            if clean_entity is not None:
+                detected_entities_for_this_block.append(clean_entity)
+
+        occupied = SpanIndex(
+            (start, end) for *_entity, start, end in detected_entities_for_this_block
+        )
+        if "PER" in self.final_enabled_labels_for_spacy:
+            for match in _SINGLE_NAME_LINE_RE.finditer(block_text):
+                name = match.group("name")
+                if normalize_name_key(name) not in french_first_names():
+                    continue
+                start, end = match.span("name")
+                if occupied.overlaps(start, end):
+                    continue
+                detected_entities_for_this_block.append((name, "PER", start, end))
+                occupied.add(start, end)
+
+        if self.strict_mode:
+            self._add_strict_entities(
+                block_text,
+                detected_entities_for_this_block,
+                occupied,
+            )
+
+        # 3. Nettoyer et dédupliquer les entités du bloc avec gestion de priorité
+        best_entities_by_span: dict[tuple[int, int], tuple[str, str]] = {}
 
-        return final_unique_entities_list, spacy_entities_per_block_with_offsets
+        detected_entities_for_this_block.sort(key=lambda x: x[2])
+
+        for ent_text, ent_label, start, end in detected_entities_for_this_block:
+            span = (start, end)
+
+            if span in best_entities_by_span:
+                _existing_text, existing_label = best_entities_by_span[span]
+
+                if (
+                    ent_label in PRIORITY_REGEX_LABELS
+                    and existing_label not in PRIORITY_REGEX_LABELS
+                ):
+                    best_entities_by_span[span] = (ent_text, ent_label)
+            else:
+                best_entities_by_span[span] = (ent_text, ent_label)
+
+        return sorted(
+            [
+                (text, label, start, end)
+                for (start, end), (text, label) in best_entities_by_span.items()
+            ],
+            key=lambda x: x[2],
+        )
 
     def _add_strict_entities(
         self,
         block_text: str,
         entities: list[tuple[str, str, int, int]],
+        occupied: SpanIndex,
     ) -> None:
         enabled = self.final_enabled_labels_for_spacy
 
@@ -359,13 +716,14 @@ class NERProcessor:
                     match.start(),
                     match.end(),
                     entities,
+                    occupied,
                     enabled,
                 )
 
         if "PER" in enabled:
             for match in _STRICT_FIRST_NAME_TOKEN_RE.finditer(block_text):
                 name = match.group("name")
-                if _normalize_name_key(name) not in FRENCH_FIRST_NAMES:
+                if normalize_name_key(name) not in french_first_names():
                     continue
                 _add_non_overlapping_entity(
                     block_text,
@@ -373,6 +731,7 @@ class NERProcessor:
                     match.start("name"),
                     match.end("name"),
                     entities,
+                    occupied,
                     enabled,
                 )
 
@@ -386,6 +745,7 @@ class NERProcessor:
                 match.start("value"),
                 match.end("value"),
                 entities,
+                occupied,
                 enabled,
             )
 
@@ -403,5 +763,6 @@ class NERProcessor:
                 value_start,
                 value_start + len(value),
                 entities,
+                occupied,
                 enabled,
             )
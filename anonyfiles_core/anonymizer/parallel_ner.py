@@ -0,0 +1,210 @@
+# anonyfiles_core/anonymizer/parallel_ner.py
+"""Détection NER multi-processus pour les gros fichiers.
+
+Les blocs sont découpés en tranches *contiguës* envoyées à un pool de
+processus. Chaque worker charge le modèle spaCy une seule fois (via
+``_load_spacy_model_cached``, à l'initialisation du processus) et reste vivant
+entre les jobs : le pool est mis en cache par (modèle, nombre de workers).
+
+Quand le fichier est fait de parties indépendantes (feuilles d'un classeur),
+les tranches suivent leurs limites : chaque feuille est une tranche, redécoupée
+si elle dépasse la taille cible. Les tranches sont récupérées dans leur ordre
+d'achèvement, puis recollées dans l'ordre du fichier ; la liste des entités
+uniques est recalculée sur l'ensemble : la sortie est strictement identique au
+mode mono-processus quel que soit l'ordonnancement, donc
+``ReplacementGenerator`` attribue les mêmes codes.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from .ner_processor import NERProcessor, _unique_entities_across_blocks
+from .spacy_engine import SpaCyEngine
+from .type_defs import Entity, EntitySpansByBlock
+
+logger = logging.getLogger(__name__)
+
+# Plusieurs tranches par worker : équilibre la charge quand certaines zones du
+# fichier sont plus denses (paragraphes longs, cellules de texte libre).
+SHARDS_PER_WORKER = 4
+
+# Moteur spaCy propre au processus worker (initialisé par ``_init_worker``).
+_WORKER_SPACY_ENGINE: SpaCyEngine | None = None
+
+_POOLS: dict[tuple[str, int], ProcessPoolExecutor] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _init_worker(model_name: str) -> None:
+    """Initialiseur de processus : précharge le modèle une fois par worker."""
+    global _WORKER_SPACY_ENGINE
+    _WORKER_SPACY_ENGINE = SpaCyEngine(model=model_name)
+
+
+def _detect_shard(
+    model_name: str,
+    processor_options: dict[str, Any],
+    blocks: list[str],
+) -> tuple[EntitySpansByBlock, float, dict[str, int]]:
+    """Exécuté dans un worker : détection sur une tranche de blocs.
+
+    Retourne les entités par bloc, la durée de traitement de la tranche et les
+    compteurs du ``NERProcessor`` du worker.
+    """
+    global _WORKER_SPACY_ENGINE
+    if _WORKER_SPACY_ENGINE is None:
+        _WORKER_SPACY_ENGINE = SpaCyEngine(model=model_name)
+
+    started = time.perf_counter()
+    processor = NERProcessor(_WORKER_SPACY_ENGINE, **processor_options)
+    _unique, per_block = processor.detect_entities_in_blocks(blocks)
+    return per_block, time.perf_counter() - started, processor.stats
+
+
+def iter_shard_bounds(block_count: int, shard_count: int) -> Iterator[tuple[int, int]]:
+    """Découpe ``range(block_count)`` en ``shard_count`` intervalles contigus."""
+    shard_count = max(1, min(shard_count, block_count))
+    base, extra = divmod(block_count, shard_count)
+    start = 0
+    for shard_index in range(shard_count):
+        end = start + base + (1 if shard_index < extra else 0)
+        if end > start:
+            yield start, end
+        start = end
+
+
+def iter_part_shard_bounds(
+    parts: list[tuple[str, int]], block_count: int, shard_count: int
+) -> Iterator[tuple[int, int]]:
+    """
+    Comme ``iter_shard_bounds``, sans qu'un intervalle chevauche deux parties
+    (``parts`` : nom et nombre de blocs de chaque feuille, dans l'ordre). Une
+    partie plus grande que ``block_count / shard_count`` est redécoupée.
+    """
+    target = max(1, -(-block_count // max(1, shard_count)))
+    start = 0
+    for _name, size in parts:
+        for piece_start, piece_end in iter_shard_bounds(size, -(-size // target)):
+            yield start + piece_start, start + piece_end
+        start += size
+
+
+def get_detection_pool(model_name: str, workers: int) -> ProcessPoolExecutor:
+    """Retourne (en le créant au besoin) le pool persistant pour ce modèle."""
+    key = (model_name, workers)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            logger.info(
+                "Démarrage d'un pool NER de %s processus (modèle %s).",
+                workers,
+                model_name,
+            )
+            # ``spawn`` : l'API exécute les jobs dans des threads, un ``fork``
+            # dupliquerait des verrous potentiellement tenus.
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_name,),
+            )
+            _POOLS[key] = pool
+        return pool
+
+
+def _discard_pool(pool: Executor) -> None:
+    """Retire un pool cassé du cache pour qu'il soit recréé au prochain job."""
+    with _POOLS_LOCK:
+        for key, cached_pool in list(_POOLS.items()):
+            if cached_pool is pool:
+                del _POOLS[key]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_detection_pools() -> None:
+    """Arrête tous les pools NER (appelé à la sortie de l'interpréteur)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_detection_pools)
+
+
+def detect_entities_in_blocks_parallel(
+    text_blocks: list[str],
+    *,
+    model_name: str,
+    processor_options: dict[str, Any],
+    workers: int,
+    executor: Executor | None = None,
+    parts: list[tuple[str, int]] | None = None,
+) -> tuple[list[Entity], EntitySpansByBlock, dict[str, Any]]:
+    """Équivalent multi-processus de ``NERProcessor.detect_entities_in_blocks``.
+
+    ``parts`` (feuilles d'un classeur) aligne les tranches sur les parties du
+    fichier ; ignoré s'il ne couvre pas exactement ``text_blocks``. Retourne
+    aussi des statistiques d'exécution : ``speedup`` est le rapport entre le
+    temps cumulé des tranches et le temps mur de la détection.
+    """
+    pool = executor or get_detection_pool(model_name, workers)
+    shard_count = workers * SHARDS_PER_WORKER
+    if parts and sum(size for _name, size in parts) == len(text_blocks):
+        bounds = list(iter_part_shard_bounds(parts, len(text_blocks), shard_count))
+    else:
+        parts = None
+        bounds = list(iter_shard_bounds(len(text_blocks), shard_count))
+
+    started = time.perf_counter()
+    future_shards = {
+        pool.submit(
+            _detect_shard, model_name, processor_options, text_blocks[start:end]
+        ): shard_index
+        for shard_index, (start, end) in enumerate(bounds)
+    }
+    shard_results: list[EntitySpansByBlock] = [[] for _bounds in bounds]
+    worker_seconds = 0.0
+    counters: dict[str, int] = {}
+    try:
+        for future in as_completed(future_shards):
+            shard_entities, shard_seconds, shard_counters = future.result()
+            shard_results[future_shards[future]] = shard_entities
+            worker_seconds += shard_seconds
+            for name, value in shard_counters.items():
+                counters[name] = counters.get(name, 0) + value
+    except BrokenProcessPool:
+        # Worker mort (OOM, modèle introuvable à l'initialisation...).
+        _discard_pool(pool)
+        raise
+    wall_seconds = time.perf_counter() - started
+    # Recollage dans l'ordre du fichier, indépendant de l'ordre d'achèvement.
+    per_block: EntitySpansByBlock = [
+        block_entities for shard in shard_results for block_entities in shard
+    ]
+
+    stats = {
+        "mode": "parallel",
+        "workers": workers,
+        "cpu_count": os.cpu_count(),
+        "shards": len(bounds),
+        "blocks": len(text_blocks),
+        "detection_seconds": round(wall_seconds, 3),
+        "worker_seconds": round(worker_seconds, 3),
+        "speedup": round(worker_seconds / wall_seconds, 2) if wall_seconds else None,
+        **counters,
+    }
+    if parts:
+        stats["parts"] = len(parts)
+    return _unique_entities_across_blocks(per_block), per_block, stats
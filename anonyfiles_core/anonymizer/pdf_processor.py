@@ -7,7 +7,8 @@ from typing import Any
 import fitz  # PyMuPDF
 
 from .base_processor import BaseProcessor
-from .type_defs import EntitySpansByBlock, ReplacementMap, TextBlocks
+from .entity_index import EntityOccurrenceIndex
+from .type_defs import EntitySpanBlocks, ReplacementMap, TextBlocks
 
 
 class PdfProcessor(BaseProcessor):
@@ -32,7 +33,7 @@ class PdfProcessor(BaseProcessor):
         output_path: Path,
         final_processed_blocks: TextBlocks,
         original_input_path: Path,
-        entities_per_block_with_offsets: EntitySpansByBlock | None = None,
+        entities_per_block_with_offsets: EntitySpanBlocks | None = None,
         **kwargs: Any,
     ) -> None:
         """Reconstruit un PDF à partir des blocs traités."""
@@ -56,6 +57,7 @@ class PdfProcessor(BaseProcessor):
                 original_input_path=original_input_path,
                 entities_per_block_with_offsets=entities_per_block_with_offsets,
                 replacement_map=replacement_map,
+                entity_index=kwargs.get("entity_index"),
             )
             return
 
@@ -88,14 +90,17 @@ class PdfProcessor(BaseProcessor):
         self,
         output_path: Path,
         original_input_path: Path,
-        entities_per_block_with_offsets: EntitySpansByBlock | None,
+        entities_per_block_with_offsets: EntitySpanBlocks | None,
         replacement_map: ReplacementMap,
+        entity_index: EntityOccurrenceIndex | None = None,
     ) -> None:
+        if entity_index is None:
+            entity_index = EntityOccurrenceIndex([], entities_per_block_with_offsets)
         doc = fitz.open(original_input_path)
         try:
             for page_num, page in enumerate(doc):
                 page_pairs = self._replacement_pairs_for_page(
-                    page_num, entities_per_block_with_offsets, replacement_map
+                    entity_index.block_texts(page_num), replacement_map
                 )
                 redacted_areas: list[fitz.Rect] = []
                 for original_text, replacement_text in page_pairs:
@@ -122,20 +127,15 @@ class PdfProcessor(BaseProcessor):
 
     def _replacement_pairs_for_page(
         self,
-        page_num: int,
-        entities_per_block_with_offsets: EntitySpansByBlock | None,
+        page_entity_texts: list[str],
         replacement_map: ReplacementMap,
     ) -> list[tuple[str, str]]:
+        # Les entités détectées sur la page passent en tête à longueur égale.
         pairs: ReplacementMap = {}
-        if entities_per_block_with_offsets and page_num < len(
-            entities_per_block_with_offsets
-        ):
-            for ent_text, _ent_label, _start, _end in entities_per_block_with_offsets[
-                page_num
-            ]:
-                replacement = replacement_map.get(ent_text)
-                if replacement is not None:
-                    pairs[ent_text] = replacement
+        for ent_text in page_entity_texts:
+            replacement = replacement_map.get(ent_text)
+            if replacement is not None:
+                pairs[ent_text] = replacement
 
         for original_text, replacement in replacement_map.items():
             pairs.setdefault(original_text, replacement)
@@ -1,16 +1,25 @@
 import re
-from collections.abc import Iterable
-from typing import TypedDict
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import NamedTuple, TypeAlias, TypedDict, TypeVar
 
-from .ner_processor import FRENCH_FIRST_NAMES, _normalize_name_key
-from .spacy_engine import ADDRESS_REGEX, EMAIL_REGEX, IBAN_REGEX, PHONE_REGEX
+from .aho_corasick import AhoCorasickAutomaton
+from .first_name_lexicon import is_french_first_name
+from .ner_processor import _REGEX_FLAGS, _REGEX_SOURCES, RegexEntityDetector
+from .span_index import SpanIndex
 
 _MAX_EXAMPLES = 3
+_SpansT = TypeVar("_SpansT")
+# Spans par bloc : liste alignée sur les blocs, ou dict creux indexé par bloc.
+_BlockSpans: TypeAlias = Sequence[_SpansT] | Mapping[int, _SpansT]
 _PLACEHOLDER_RE = re.compile(r"\{\{[A-Z0-9_ -]+}}|\[[A-Z0-9_ -]+]")
+# Parties bornées et garde à gauche comme EMAIL_REGEX : temps linéaire sur les
+# entrées adverses, adresse trouvée entière ou pas du tout.
 _OBFUSCATED_EMAIL_RE = re.compile(
-    r"\b[A-Z0-9._%+-]+[ \t]*"
+    r"(?<![A-Z0-9._%+-])[A-Z0-9._%+-]{1,64}[ \t]*"
     r"(?:@|\[?[ \t]*(?:at|arobase)[ \t]*\]?)[ \t]*"
-    r"[A-Z0-9.-]+[ \t]*"
+    r"[A-Z0-9.-]{1,255}[ \t]*"
     r"(?:\.|\[?[ \t]*(?:dot|point)[ \t]*\]?)[ \t]*"
     r"[A-Z]{2,10}\b",
     re.IGNORECASE,
@@ -33,13 +42,93 @@ _FIRST_NAME_RE = re.compile(
     r"(?<![\w'’-])(?P<name>[A-ZÀ-ÖØ-Þ][A-Za-zÀ-ÖØ-öø-ÿ'’-]{1,40})(?![\w'’-])"
 )
 _UPPERCASE_TOKEN_RE = re.compile(r"(?<!\w)[A-ZÀ-ÖØ-Þ][A-ZÀ-ÖØ-Þ0-9&._-]{2,14}(?!\w)")
+# Premier caractère possible d'un prénom ou d'un jeton en majuscules.
+_UPPERCASE_START_RE = re.compile(r"[A-ZÀ-ÖØ-Þ]")
+# Barrières des regex de détection qui franchissent les lignes (``\s``) : le
+# complément de tous les caractères qu'elles peuvent consommer.
+_PHONE_BARRIER_RE = re.compile(r"[^\d\s.+-]")
+_ADDRESS_BARRIER_RE = re.compile(r"[^\d\sA-ZÀ-ÖØ-Þa-zà-öø-ÿ'’.,-]", re.IGNORECASE)
+
+# Nombre maximal de textes distincts dont les candidats sont mémorisés (LRU).
+_CANDIDATE_MEMO_SIZE = 10_000
+
+# (indice de passe, début, fin, valeur)
+_Candidate = tuple[int, int, int, str]
+
+
+class _CandidatePass(NamedTuple):
+    """Une regex du scanner et la catégorie d'avertissement qu'elle alimente."""
+
+    kind: str
+    # Labels dont l'un au moins doit être actif.
+    labels: frozenset[str]
+    pattern: re.Pattern[str]
+    group: int | str = 0
+    # Caractères qu'aucune correspondance ne contient (``None`` : saut de ligne).
+    barrier: re.Pattern[str] | None = None
+    # Premier caractère possible d'une correspondance : le parcours démarre au
+    # premier trouvé, et n'a pas lieu s'il n'y en a aucun.
+    gate: re.Pattern[str] | None = None
+    accept: Callable[[str], bool] | None = None
+
+
+def _detection_pattern(label: str) -> re.Pattern[str]:
+    return re.compile(_REGEX_SOURCES[label], _REGEX_FLAGS.get(label, 0))
+
+
+def _is_reportable_uppercase_token(value: str) -> bool:
+    return not (any(char.isdigit() for char in value) and len(value) <= 4)
+
+
+# Ordre des passes = ordre de signalement (déduplication par chevauchement).
+_CANDIDATE_PASSES: tuple[_CandidatePass, ...] = (
+    _CandidatePass("EMAIL", frozenset({"EMAIL"}), _detection_pattern("EMAIL")),
+    _CandidatePass("EMAIL", frozenset({"EMAIL"}), _OBFUSCATED_EMAIL_RE),
+    _CandidatePass(
+        "PHONE",
+        frozenset({"PHONE"}),
+        _detection_pattern("PHONE"),
+        barrier=_PHONE_BARRIER_RE,
+    ),
+    _CandidatePass(
+        "PHONE", frozenset({"PHONE"}), _STRICT_PHONE_RE, gate=re.compile(r"[+0]")
+    ),
+    _CandidatePass("IBAN", frozenset({"IBAN"}), _detection_pattern("IBAN")),
+    _CandidatePass(
+        "ADDRESS", frozenset({"ADDRESS"}), _STRICT_ADDRESS_RE, gate=re.compile(r"\d")
+    ),
+    _CandidatePass(
+        "ADDRESS",
+        frozenset({"ADDRESS"}),
+        _detection_pattern("ADDRESS"),
+        barrier=_ADDRESS_BARRIER_RE,
+    ),
+    _CandidatePass(
+        "FIRST_NAME",
+        frozenset({"PER"}),
+        _FIRST_NAME_RE,
+        group="name",
+        gate=_UPPERCASE_START_RE,
+        accept=is_french_first_name,
+    ),
+    _CandidatePass(
+        "UPPERCASE_TOKEN",
+        frozenset({"ORG", "MISC"}),
+        _UPPERCASE_TOKEN_RE,
+        gate=_UPPERCASE_START_RE,
+        accept=_is_reportable_uppercase_token,
+    ),
+)
+# Passes dont les correspondances sont celles du ``RegexEntityDetector``.
+_DETECTOR_PASS_BY_LABEL = {"EMAIL": 0, "PHONE": 2, "IBAN": 4, "ADDRESS": 6}
+_DETECTOR_PASSES = frozenset(_DETECTOR_PASS_BY_LABEL.values())
 
 
 class _CollectedWarning(TypedDict):
     count: int
     examples: list[str]
     seen: set[str]
-    spans: list[tuple[int, int]]
+    spans: SpanIndex
 
 
 _WARNING_DEFS: dict[str, dict[str, str]] = {
@@ -82,11 +171,55 @@ _WARNING_DEFS: dict[str, dict[str, str]] = {
 }
 
 
+class PrivacyWarningCollector:
+    """Avertissements cumulés d'un appel du scanner à l'autre.
+
+    Pour un fichier traité par tranches : une valeur déjà signalée n'est pas
+    recomptée dans une tranche suivante et le cache des candidats est conservé.
+    """
+
+    def __init__(self) -> None:
+        self.collected: dict[str, _CollectedWarning] = {}
+        self.scanner: _CandidateScanner | None = None
+
+
+def _block_spans(
+    spans: _BlockSpans[_SpansT] | None, block_index: int
+) -> _SpansT | tuple:
+    """Spans d'un bloc ; un bloc absent d'un dict creux n'en a aucun."""
+    if spans is None:
+        return ()
+    if isinstance(spans, Mapping):
+        return spans.get(block_index, ())
+    return spans[block_index]
+
+
 def scan_blocks_for_privacy_warnings(
     text_blocks: Iterable[str],
     enabled_labels: set[str] | None = None,
     ignored_values: Iterable[str] | None = None,
+    placeholder_spans: _BlockSpans[Iterable[tuple[int, int]]] | None = None,
+    source_blocks: Sequence[str] | None = None,
+    replaced_spans: _BlockSpans[Sequence[tuple[int, int, int]]] | None = None,
+    collector: PrivacyWarningCollector | None = None,
 ) -> list[dict[str, object]]:
+    """Repère les valeurs sensibles résiduelles dans les blocs finaux.
+
+    ``placeholder_spans`` (un itérable de spans par bloc) donne la position
+    des tokens insérés par l'anonymisation ; sans lui, les placeholders sont
+    recherchés avec ``_PLACEHOLDER_RE``. Comme ``replaced_spans``, il peut
+    être une liste par bloc ou un dict creux indexé par bloc (bloc absent :
+    aucun span).
+
+    ``source_blocks`` (texte analysé par la détection) et ``replaced_spans``
+    (``(début, fin, longueur du remplacement)`` par bloc, en offsets source)
+    permettent de ne revérifier que les zones remplacées : les candidats du
+    texte source, calculés une fois par texte distinct, sont repris tels quels
+    ailleurs.
+
+    Avec ``collector``, les avertissements s'ajoutent à ceux des appels
+    précédents et le résultat porte sur l'ensemble.
+    """
     enabled = enabled_labels or {
         "PER",
         "ORG",
@@ -96,49 +229,56 @@ def scan_blocks_for_privacy_warnings(
         "IBAN",
         "ADDRESS",
     }
-    ignored = {value for value in (ignored_values or []) if value}
-    collector: dict[str, _CollectedWarning] = {}
-
-    for block_text in text_blocks:
-        mask_spans = _mask_spans(block_text, ignored)
-        _collect_regex_matches(
-            collector,
-            block_text,
-            mask_spans,
-            "EMAIL",
-            [EMAIL_REGEX, _OBFUSCATED_EMAIL_RE],
-            enabled,
-        )
-        _collect_regex_matches(
-            collector,
-            block_text,
-            mask_spans,
-            "PHONE",
-            [PHONE_REGEX, _STRICT_PHONE_RE],
-            enabled,
-        )
-        _collect_regex_matches(
-            collector,
-            block_text,
-            mask_spans,
-            "IBAN",
-            [IBAN_REGEX],
-            enabled,
+    if collector is None:
+        collector = PrivacyWarningCollector()
+    if collector.scanner is None:
+        collector.scanner = _CandidateScanner(enabled)
+    scanner = collector.scanner
+    ignored = _IgnoredValues(ignored_values or [])
+    collected = collector.collected
+    for warning in collected.values():
+        # Les spans dédoublonnent les passes d'un même appel ; seules les
+        # valeurs déjà vues restent mémorisées d'un appel à l'autre.
+        warning["spans"] = SpanIndex()
+
+    for block_index, block_text in enumerate(text_blocks):
+        edits = _block_spans(replaced_spans, block_index)
+        if source_blocks is None or not edits:
+            candidates = scanner.candidates(block_text)
+        elif "\n" not in block_text:
+            # Bloc mono-ligne (cellule) : la zone revérifiée serait le bloc entier.
+            candidates = scanner.candidates(block_text)
+        else:
+            candidates = scanner.candidates_after_replacements(
+                source_blocks[block_index], block_text, edits
+            )
+        if not candidates:
+            continue
+
+        known_spans = (
+            None
+            if placeholder_spans is None
+            else _block_spans(placeholder_spans, block_index)
         )
-        _collect_regex_matches(
-            collector,
-            block_text,
-            mask_spans,
-            "ADDRESS",
-            [_STRICT_ADDRESS_RE, ADDRESS_REGEX],
-            enabled,
-            flags=re.IGNORECASE,
+        mask_spans = SpanIndex(
+            known_spans
+            if known_spans is not None
+            else (
+                (match.start(), match.end())
+                for match in _PLACEHOLDER_RE.finditer(block_text)
+            )
         )
-        _collect_first_names(collector, block_text, mask_spans, enabled)
-        _collect_uppercase_tokens(collector, block_text, mask_spans, enabled)
+        for pass_index, start, end, value in candidates:
+            if mask_spans.overlaps(start, end) or ignored.overlaps(
+                block_text, start, end
+            ):
+                continue
+            _add_warning(
+                collected, _CANDIDATE_PASSES[pass_index].kind, value, (start, end)
+            )
 
     warnings: list[dict[str, object]] = []
-    for kind, warning in collector.items():
+    for kind, warning in collected.items():
         count = int(warning["count"])
         definition = _WARNING_DEFS[kind]
         noun = definition["singular"] if count == 1 else definition["plural"]
@@ -172,19 +312,228 @@ def privacy_warning_count(warnings: Iterable[dict[str, object]]) -> int:
     return total
 
 
-def _mask_spans(text: str, ignored_values: set[str]) -> list[tuple[int, int]]:
-    spans = [(match.start(), match.end()) for match in _PLACEHOLDER_RE.finditer(text)]
-    for value in ignored_values:
-        for match in re.finditer(re.escape(value), text):
-            spans.append((match.start(), match.end()))
-    spans.sort()
-    return spans
+class _IgnoredValues:
+    """Valeurs de remplacement à ne pas signaler, cherchées en une passe.
 
+    Un seul automate d'Aho-Corasick pour toutes les valeurs, consulté
+    uniquement autour des candidats non masqués : aucune recherche par valeur
+    et par bloc. Toutes les occurrences comptent, chevauchantes comprises.
+    """
 
-def _is_masked(start: int, end: int, mask_spans: list[tuple[int, int]]) -> bool:
-    return any(
-        start < mask_end and end > mask_start for mask_start, mask_end in mask_spans
-    )
+    def __init__(self, values: Iterable[str]):
+        self.automaton = AhoCorasickAutomaton(
+            sorted({value for value in values if value})
+        )
+        self.max_length = max(map(len, self.automaton.patterns), default=0)
+
+    def overlaps(self, text: str, start: int, end: int) -> bool:
+        """Vrai si une valeur ignorée chevauche ``text[start:end]``."""
+        if not self.automaton:
+            return False
+        window_start = max(0, start - self.max_length + 1)
+        window = text[window_start : end + self.max_length - 1]
+        patterns = self.automaton.patterns
+        for pattern_index, match_start in self.automaton.iter_matches(window):
+            match_start += window_start
+            if match_start < end and match_start + len(patterns[pattern_index]) > start:
+                return True
+        return False
+
+
+class _CandidateScanner:
+    """Candidats ``(passe, début, fin, valeur)`` d'un texte, dans l'ordre des passes.
+
+    Les regex EMAIL/PHONE/IBAN/ADDRESS de la détection passent par le même
+    ``RegexEntityDetector`` (préfiltres et motif combiné compris). Les
+    candidats ne dépendent que du texte : ils sont mémorisés par texte
+    distinct (cellules répétées des formats tabulaires).
+    """
+
+    def __init__(self, enabled_labels: set[str]):
+        self.pass_indices = [
+            index
+            for index, candidate_pass in enumerate(_CANDIDATE_PASSES)
+            if candidate_pass.labels & enabled_labels
+        ]
+        self.detector = RegexEntityDetector(
+            {
+                _CANDIDATE_PASSES[index].kind
+                for index in self.pass_indices
+                if index in _DETECTOR_PASSES
+            }
+        )
+        self._memo: OrderedDict[str, list[_Candidate]] = OrderedDict()
+
+    def candidates(self, text: str) -> list[_Candidate]:
+        cached = self._memo.get(text)
+        if cached is not None:
+            self._memo.move_to_end(text)
+            return cached
+
+        matches_by_pass: dict[int, list[_Candidate]] = {}
+        for label, start, end in self.detector.finditer(text):
+            pass_index = _DETECTOR_PASS_BY_LABEL[label]
+            matches_by_pass.setdefault(pass_index, []).append(
+                (pass_index, start, end, text[start:end])
+            )
+        candidates: list[_Candidate] = []
+        for pass_index in self.pass_indices:
+            candidate_pass = _CANDIDATE_PASSES[pass_index]
+            if pass_index in matches_by_pass:
+                candidates.extend(matches_by_pass[pass_index])
+            elif pass_index in _DETECTOR_PASSES:
+                continue
+            elif candidate_pass.gate is None:
+                candidates.extend(_iter_pass_matches(pass_index, text, 0, len(text)))
+            elif (gate_match := candidate_pass.gate.search(text)) is not None:
+                candidates.extend(
+                    _iter_pass_matches(pass_index, text, gate_match.start(), len(text))
+                )
+
+        self._memo[text] = candidates
+        if len(self._memo) > _CANDIDATE_MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return candidates
+
+    def candidates_after_replacements(
+        self,
+        source_text: str,
+        final_text: str,
+        edits: Sequence[tuple[int, int, int]],
+    ) -> list[_Candidate]:
+        """Candidats de ``final_text`` sans le parcourir en entier.
+
+        ``final_text`` est ``source_text`` dont les spans ``edits`` ont été
+        remplacés. Autour de chaque remplacement, une fenêtre s'étend jusqu'au
+        premier caractère « barrière » de chaque côté (caractère qu'aucun
+        candidat de la passe ne peut contenir) et y est réanalysée ; hors des
+        fenêtres, le texte et son contexte sont ceux de la source et ses
+        candidats sont repris, décalés. Le résultat est celui d'un parcours
+        complet de ``final_text``.
+        """
+        edits = sorted(edits)
+        edit_starts = [start for start, _end, _length in edits]
+        # Décalage cumulé après chaque remplacement, et zones modifiées du
+        # texte final.
+        shifts: list[int] = []
+        dirty_ranges: list[tuple[int, int]] = []
+        shift = 0
+        for start, end, length in edits:
+            dirty_ranges.append((start + shift, start + shift + length))
+            shift += length - (end - start)
+            shifts.append(shift)
+
+        line_windows = _replacement_windows(final_text, dirty_ranges, None)
+        if source_text not in self._memo and 2 * sum(
+            window_end - window_start for window_start, window_end in line_windows
+        ) > len(final_text):
+            # Remplacements sur la plupart des lignes : un parcours complet du
+            # texte final coûte moins que source + fenêtres.
+            return self.candidates(final_text)
+
+        windows_by_barrier: dict[re.Pattern[str] | None, list[tuple[int, int]]] = {
+            None: line_windows
+        }
+        source_candidates = self.candidates(source_text)
+        candidates: list[_Candidate] = []
+        for pass_index in self.pass_indices:
+            barrier = _CANDIDATE_PASSES[pass_index].barrier
+            windows = windows_by_barrier.get(barrier)
+            if windows is None:
+                windows = _replacement_windows(final_text, dirty_ranges, barrier)
+                windows_by_barrier[barrier] = windows
+            window_starts = [window_start for window_start, _end in windows]
+
+            kept: list[_Candidate] = []
+            for candidate in source_candidates:
+                if candidate[0] != pass_index:
+                    continue
+                _pass, start, end, value = candidate
+                position = bisect_right(edit_starts, start)
+                if position and edits[position - 1][1] > start:
+                    continue
+                if position < len(edits) and edits[position][0] < end:
+                    continue
+                shift = shifts[position - 1] if position else 0
+                start, end = start + shift, end + shift
+                window_index = bisect_right(window_starts, start) - 1
+                if window_index >= 0 and windows[window_index][1] > start:
+                    continue
+                if (
+                    window_index + 1 < len(windows)
+                    and windows[window_index + 1][0] < end
+                ):
+                    continue
+                kept.append((pass_index, start, end, value))
+            for window_start, window_end in windows:
+                kept.extend(
+                    _iter_pass_matches(pass_index, final_text, window_start, window_end)
+                )
+            kept.sort(key=lambda candidate: candidate[1])
+            candidates.extend(kept)
+        return candidates
+
+
+def _iter_pass_matches(
+    pass_index: int, text: str, start: int, end: int
+) -> Iterator[_Candidate]:
+    candidate_pass = _CANDIDATE_PASSES[pass_index]
+    for match in candidate_pass.pattern.finditer(text, start, end):
+        value = match.group(candidate_pass.group)
+        if candidate_pass.accept is not None and not candidate_pass.accept(value):
+            continue
+        yield (
+            pass_index,
+            match.start(candidate_pass.group),
+            match.end(candidate_pass.group),
+            value,
+        )
+
+
+def _replacement_windows(
+    text: str,
+    dirty_ranges: Sequence[tuple[int, int]],
+    barrier: re.Pattern[str] | None,
+) -> list[tuple[int, int]]:
+    """Fenêtres disjointes et triées couvrant les zones modifiées.
+
+    Chaque fenêtre part juste après la barrière qui précède la zone et inclut
+    la barrière qui la suit (visible par les assertions ``(?!…)``/``(?=…)``) ;
+    sans barrière, elle s'étend jusqu'au bord du texte.
+    """
+    windows: list[tuple[int, int]] = []
+    for dirty_start, dirty_end in dirty_ranges:
+        if windows and (dirty_start < windows[-1][1] or windows[-1][1] == len(text)):
+            window_start, window_end = windows.pop()
+            if dirty_end < window_end or window_end == len(text):
+                # La barrière de fin, après la zone, reste valable.
+                windows.append((window_start, window_end))
+                continue
+        else:
+            window_start = _after_previous_barrier(text, dirty_start, barrier)
+        windows.append((window_start, _after_next_barrier(text, dirty_end, barrier)))
+    return windows
+
+
+def _after_previous_barrier(
+    text: str, position: int, barrier: re.Pattern[str] | None
+) -> int:
+    if barrier is None:
+        return text.rfind("\n", 0, position) + 1
+    for index in range(position - 1, -1, -1):
+        if barrier.match(text, index):
+            return index + 1
+    return 0
+
+
+def _after_next_barrier(
+    text: str, position: int, barrier: re.Pattern[str] | None
+) -> int:
+    if barrier is None:
+        index = text.find("\n", position)
+        return len(text) if index == -1 else index + 1
+    match = barrier.search(text, position)
+    return len(text) if match is None else match.start() + 1
 
 
 def _add_warning(
@@ -199,16 +548,13 @@ def _add_warning(
 
     warning = collector.setdefault(
         kind,
-        {"count": 0, "examples": [], "seen": set(), "spans": []},
+        {"count": 0, "examples": [], "seen": set(), "spans": SpanIndex()},
     )
     spans = warning["spans"]
     if span is not None:
-        if any(
-            span[0] < existing_end and span[1] > existing_start
-            for existing_start, existing_end in spans
-        ):
+        if spans.overlaps(*span):
             return
-        spans.append(span)
+        spans.add(*span)
 
     seen = warning["seen"]
     if value in seen:
@@ -219,72 +565,3 @@ def _add_warning(
     examples = warning["examples"]
     if len(examples) < _MAX_EXAMPLES:
         examples.append(value)
-
-
-def _collect_regex_matches(
-    collector: dict[str, _CollectedWarning],
-    text: str,
-    mask_spans: list[tuple[int, int]],
-    kind: str,
-    patterns: Iterable[str | re.Pattern[str]],
-    enabled_labels: set[str],
-    flags: int = 0,
-) -> None:
-    if kind not in enabled_labels:
-        return
-
-    for pattern in patterns:
-        matches = (
-            pattern.finditer(text)
-            if isinstance(pattern, re.Pattern)
-            else re.finditer(pattern, text, flags)
-        )
-        for match in matches:
-            if _is_masked(match.start(), match.end(), mask_spans):
-                continue
-            _add_warning(collector, kind, match.group(0), (match.start(), match.end()))
-
-
-def _collect_first_names(
-    collector: dict[str, _CollectedWarning],
-    text: str,
-    mask_spans: list[tuple[int, int]],
-    enabled_labels: set[str],
-) -> None:
-    if "PER" not in enabled_labels:
-        return
-
-    for match in _FIRST_NAME_RE.finditer(text):
-        if _is_masked(match.start("name"), match.end("name"), mask_spans):
-            continue
-        name = match.group("name")
-        if _normalize_name_key(name) in FRENCH_FIRST_NAMES:
-            _add_warning(
-                collector,
-                "FIRST_NAME",
-                name,
-                (match.start("name"), match.end("name")),
-            )
-
-
-def _collect_uppercase_tokens(
-    collector: dict[str, _CollectedWarning],
-    text: str,
-    mask_spans: list[tuple[int, int]],
-    enabled_labels: set[str],
-) -> None:
-    if "ORG" not in enabled_labels and "MISC" not in enabled_labels:
-        return
-
-    for match in _UPPERCASE_TOKEN_RE.finditer(text):
-        if _is_masked(match.start(), match.end(), mask_spans):
-            continue
-        value = match.group(0)
-        if any(char.isdigit() for char in value) and len(value) <= 4:
-            continue
-        _add_warning(
-            collector,
-            "UPPERCASE_TOKEN",
-            value,
-            (match.start(), match.end()),
-        )
@@ -0,0 +1,411 @@
+# anonyfiles_core/anonymizer/regex_safety.py
+"""Garde-fous contre le backtracking catastrophique (ReDoS) des règles regex.
+
+Les règles personnalisées ``isRegex`` viennent de l'utilisateur (GUI, API,
+CLI). Deux protections complémentaires :
+
+- un filtrage statique au chargement : les quantificateurs imbriqués du type
+  ``(a+)+`` ou ``(\\w+\\s?)+`` sont refusés, sauf quand un séparateur
+  obligatoire disjoint fixe les frontières entre itérations (``(\\w+\\.)+``) ;
+- un budget de temps par règle et par bloc, appliqué par le moteur ``regex``
+  (paramètre ``timeout``) qui interrompt réellement la recherche — le module
+  ``re`` ne rend pas la main avant la fin du backtracking, ce qu'aucune
+  annulation coopérative de job ne peut rattraper.
+
+Les erreurs nomment la règle fautive (indice dans la liste fournie).
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import regex
+
+logger = logging.getLogger(__name__)
+
+# Budget par défaut (secondes) d'une règle regex sur un bloc. Un fichier TXT
+# entier forme un seul bloc : le budget doit couvrir un parcours linéaire de
+# plusieurs Mo.
+DEFAULT_CUSTOM_REGEX_TIMEOUT = 2.0
+
+_PATTERN_PREVIEW_LENGTH = 60
+
+# Classes énumérables au-delà desquelles on renonce à prouver la disjonction.
+_MAX_ENUMERATED_CHARS = 512
+
+# Opcodes et catégories de ``re._constants`` lus par le filtrage statique.
+SCREEN_CONSTANT_NAMES = (
+    "MAX_REPEAT",
+    "MIN_REPEAT",
+    "POSSESSIVE_REPEAT",
+    "SUBPATTERN",
+    "BRANCH",
+    "ASSERT",
+    "ASSERT_NOT",
+    "ATOMIC_GROUP",
+    "GROUPREF_EXISTS",
+    "LITERAL",
+    "IN",
+    "AT",
+    "RANGE",
+    "CATEGORY",
+    "CATEGORY_SPACE",
+    "CATEGORY_DIGIT",
+    "CATEGORY_NOT_DIGIT",
+    "CATEGORY_NOT_SPACE",
+    "CATEGORY_WORD",
+    "CATEGORY_NOT_WORD",
+)
+
+# Le filtrage statique lit l'arbre syntaxique du module ``re`` (API interne,
+# stable de 3.11 à 3.13). Si elle disparaît ou change, le filtrage est
+# désactivé et seul le budget de temps (``bounded_finditer``) protège le
+# moteur. Un motif qu'il ne sait pas analyser (syntaxe propre au module
+# ``regex``) n'est pas refusé non plus.
+try:
+    from re import _compiler as sre_compile  # type: ignore[attr-defined]
+    from re import _constants as sre_constants  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+
+    for _module, _name in [(sre_constants, name) for name in SCREEN_CONSTANT_NAMES] + [
+        (sre_parse, "parse"),
+        (sre_parse, "SubPattern"),
+        (sre_parse, "State"),
+        (sre_compile, "compile"),
+    ]:
+        getattr(_module, _name)
+except (ImportError, AttributeError) as exc:
+    STATIC_SCREEN_AVAILABLE = False
+    logger.warning(
+        "Filtrage statique des regex désactivé (API interne de 're' "
+        "indisponible : %s) ; seul le budget de temps s'applique.",
+        exc,
+    )
+else:
+    STATIC_SCREEN_AVAILABLE = True
+    _REPEAT_OPS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+    # Catégories sans caractère commun (``\d`` est inclus dans ``\w``).
+    _DISJOINT_CATEGORIES = {
+        frozenset((sre_constants.CATEGORY_SPACE, sre_constants.CATEGORY_DIGIT)),
+        frozenset((sre_constants.CATEGORY_SPACE, sre_constants.CATEGORY_WORD)),
+        frozenset((sre_constants.CATEGORY_DIGIT, sre_constants.CATEGORY_NOT_DIGIT)),
+        frozenset((sre_constants.CATEGORY_SPACE, sre_constants.CATEGORY_NOT_SPACE)),
+        frozenset((sre_constants.CATEGORY_WORD, sre_constants.CATEGORY_NOT_WORD)),
+        frozenset((sre_constants.CATEGORY_DIGIT, sre_constants.CATEGORY_NOT_WORD)),
+    }
+
+
+class CustomRuleError(ValueError):
+    """Erreur attribuée à une règle personnalisée précise."""
+
+    def __init__(self, rule_index: int, pattern: str, reason: str):
+        self.rule_index = rule_index
+        self.pattern = pattern
+        preview = (
+            pattern
+            if len(pattern) <= _PATTERN_PREVIEW_LENGTH
+            else pattern[:_PATTERN_PREVIEW_LENGTH] + "…"
+        )
+        super().__init__(
+            f"Règle personnalisée à l'index {rule_index} ({preview!r}) : {reason}"
+        )
+
+
+class UnsafeCustomRuleError(CustomRuleError):
+    """Motif refusé par le filtrage statique (quantificateurs imbriqués)."""
+
+
+class CustomRuleTimeoutError(CustomRuleError):
+    """Budget de temps dépassé sur un bloc : la recherche a été interrompue."""
+
+
+def compile_custom_regex(pattern: str) -> Any:
+    """Compile une règle avec le moteur ``regex`` (insensible à la casse)."""
+    return regex.compile(pattern, flags=regex.IGNORECASE | regex.VERSION0)
+
+
+def bounded_finditer(
+    compiled_pattern: Any,
+    text: str,
+    start: int,
+    end: int,
+    deadline: float,
+) -> Iterator[Any]:
+    """``finditer`` dont chaque recherche reçoit le temps restant avant ``deadline``.
+
+    Le ``timeout`` de ``regex`` s'applique à une recherche, pas à l'itérateur
+    entier : on relance donc ``search`` avec le budget restant (horloge
+    ``time.monotonic``). Lève ``TimeoutError`` une fois le budget épuisé.
+    """
+    position = start
+    while position <= end:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("regex timed out")
+        match = compiled_pattern.search(text, position, end, timeout=remaining)
+        if match is None:
+            return
+        yield match
+        position = match.end() if match.end() > match.start() else match.end() + 1
+
+
+def screen_custom_rule(rule_index: int, pattern: str) -> None:
+    """Lève ``UnsafeCustomRuleError`` si le motif contient des quantificateurs imbriqués."""
+    if has_nested_quantifiers(pattern, re.IGNORECASE):
+        raise UnsafeCustomRuleError(
+            rule_index,
+            pattern,
+            "quantificateurs imbriqués (ex. '(a+)+'), risque de backtracking "
+            "catastrophique. Bornez la répétition interne, rendez-la possessive "
+            "('a++') ou séparez les itérations par un caractère obligatoire.",
+        )
+
+
+def screen_custom_rules(rules: Iterable[Any]) -> None:
+    """Filtre statique des règles regex d'une liste (avant création du job)."""
+    for rule_index, rule in enumerate(rules):
+        if (
+            isinstance(rule, dict)
+            and rule.get("isRegex")
+            and isinstance(rule.get("pattern"), str)
+            and rule["pattern"]
+        ):
+            screen_custom_rule(rule_index, rule["pattern"])
+
+
+def has_nested_quantifiers(pattern: str, flags: int = 0) -> bool:
+    """Vrai si une répétition (max > 1) contient une répétition de longueur variable.
+
+    Exception : le corps de la répétition externe contient un élément
+    obligatoire d'une seule classe de caractères, disjointe de toutes les
+    répétitions internes ; les frontières entre itérations sont alors fixées
+    (``(\\w+\\.)+``, ``(?:[ \\t]+\\w+){0,8}``). Toujours faux si
+    l'API interne de ``re`` est indisponible (``STATIC_SCREEN_AVAILABLE``).
+    """
+    if not STATIC_SCREEN_AVAILABLE:
+        return False
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except (re.error, RecursionError):
+        return False
+    return _find_nested(parsed.data, parsed.state.flags)
+
+
+def _find_nested(items: Iterable[tuple[Any, Any]], flags: int) -> bool:
+    for op, av in items:
+        if op in _REPEAT_OPS:
+            _low, high, body = av
+            if (
+                high > 1
+                and _variable_repeats(body.data)
+                and not _has_separator(body.data, flags)
+            ):
+                return True
+            if _find_nested(body.data, flags):
+                return True
+        else:
+            for child in _children(op, av):
+                if _find_nested(child, flags):
+                    return True
+    return False
+
+
+def _children(op: Any, av: Any) -> list[list[tuple[Any, Any]]]:
+    if op is sre_constants.SUBPATTERN:
+        return [av[3].data]
+    if op is sre_constants.BRANCH:
+        return [branch.data for branch in av[1]]
+    if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return [av[1].data]
+    if op in (sre_constants.ATOMIC_GROUP,):
+        return [av.data]
+    if op is sre_constants.POSSESSIVE_REPEAT:
+        return [av[2].data]
+    if op is sre_constants.GROUPREF_EXISTS:
+        return [branch.data for branch in av[1:] if branch is not None]
+    return []
+
+
+def _variable_repeats(items: Iterable[tuple[Any, Any]]) -> list[tuple[Any, Any]]:
+    """Répétitions de longueur variable (hors possessives/atomiques) d'un corps."""
+    found: list[tuple[Any, Any]] = []
+    for op, av in items:
+        if op in _REPEAT_OPS:
+            low, high, body = av
+            if low != high:
+                found.append((op, av))
+            found.extend(_variable_repeats(body.data))
+        elif op in (sre_constants.SUBPATTERN, sre_constants.BRANCH):
+            for child in _children(op, av):
+                found.extend(_variable_repeats(child))
+    return found
+
+
+def _unwrap(items: list[tuple[Any, Any]]) -> list[tuple[Any, Any]]:
+    while len(items) == 1 and items[0][0] is sre_constants.SUBPATTERN:
+        items = items[0][1][3].data
+    return items
+
+
+def _char_class(item: tuple[Any, Any]) -> tuple[Any, Any] | None:
+    """Élément d'une seule classe de caractères (éventuellement répété)."""
+    op, av = item
+    if op in _REPEAT_OPS or op is sre_constants.POSSESSIVE_REPEAT:
+        body = av[2].data
+        if len(body) == 1 and body[0][0] in (
+            sre_constants.LITERAL,
+            sre_constants.IN,
+        ):
+            return body[0]
+        return None
+    if op in (sre_constants.LITERAL, sre_constants.IN):
+        return item
+    return None
+
+
+def _alphabet(items: Iterable[tuple[Any, Any]]) -> list[tuple[Any, Any]] | None:
+    """Classes de caractères consommables par une séquence (``None`` si inconnues)."""
+    classes: list[tuple[Any, Any]] = []
+    for op, av in items:
+        if op in (sre_constants.LITERAL, sre_constants.IN):
+            classes.append((op, av))
+        elif op in _REPEAT_OPS or op is sre_constants.POSSESSIVE_REPEAT:
+            nested = _alphabet(av[2].data)
+            if nested is None:
+                return None
+            classes.extend(nested)
+        elif op in (
+            sre_constants.SUBPATTERN,
+            sre_constants.BRANCH,
+            sre_constants.ATOMIC_GROUP,
+        ):
+            for child in _children(op, av):
+                nested = _alphabet(child)
+                if nested is None:
+                    return None
+                classes.extend(nested)
+        elif op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            continue  # ne consomme aucun caractère
+        else:
+            return None
+    return classes
+
+
+def _has_separator(body: list[tuple[Any, Any]], flags: int) -> bool:
+    items = _unwrap(body)
+    repeats = _variable_repeats(items)
+    for index, item in enumerate(items):
+        separator = _char_class(item)
+        if separator is None or _min_count(item) < 1:
+            continue
+        if not all(
+            _disjoint_from_all(separator, _alphabet([repeat]), flags)
+            for repeat in repeats
+            if repeat[1] is not item[1]
+        ):
+            continue
+        if _is_variable(item) and not any(
+            _min_count(other) >= 1
+            and _char_class(other) is not None
+            and _disjoint(separator, _char_class(other), flags)
+            for other_index, other in enumerate(items)
+            if other_index != index
+        ):
+            # Séparateur lui-même variable : sans autre élément obligatoire
+            # disjoint, deux itérations peuvent fusionner leurs séparateurs.
+            continue
+        return True
+    return False
+
+
+def _min_count(item: tuple[Any, Any]) -> int:
+    op, av = item
+    if op in _REPEAT_OPS or op is sre_constants.POSSESSIVE_REPEAT:
+        return int(av[0])
+    return 1
+
+
+def _is_variable(item: tuple[Any, Any]) -> bool:
+    # Une répétition possessive ne rend jamais de caractères : ses frontières
+    # sont fixes, comme celles d'une répétition de longueur exacte.
+    op, av = item
+    return op in _REPEAT_OPS and av[0] != av[1]
+
+
+def _disjoint_from_all(
+    separator: tuple[Any, Any], classes: list[tuple[Any, Any]] | None, flags: int
+) -> bool:
+    return classes is not None and all(
+        _disjoint(separator, char_class, flags) for char_class in classes
+    )
+
+
+def _disjoint(
+    first: tuple[Any, Any] | None, second: tuple[Any, Any] | None, flags: int
+) -> bool:
+    """Vrai si les deux classes n'ont aucun caractère commun (prouvé).
+
+    Les caractères explicites (littéraux, intervalles) de chaque côté sont
+    testés contre l'autre classe compilée ; les catégories (``\\d``, ``\\s``,
+    ``\\w``) doivent figurer dans ``_DISJOINT_CATEGORIES``.
+    """
+    if first is None or second is None:
+        return False
+    first_parts = _class_parts(first, flags)
+    second_parts = _class_parts(second, flags)
+    if first_parts is None or second_parts is None:
+        return False
+    first_chars, first_categories = first_parts
+    second_chars, second_categories = second_parts
+    if any(
+        frozenset((first_category, second_category)) not in _DISJOINT_CATEGORIES
+        for first_category in first_categories
+        for second_category in second_categories
+    ):
+        return False
+    for chars, other in ((first_chars, second), (second_chars, first)):
+        if not chars:
+            continue
+        matcher = _compile_item(other, flags)
+        if matcher is None or any(matcher.fullmatch(char) for char in chars):
+            return False
+    return True
+
+
+def _class_parts(item: tuple[Any, Any], flags: int) -> tuple[set[str], set[Any]] | None:
+    """Caractères explicites et catégories d'une classe, ``None`` si non analysable."""
+    op, av = item
+    codes: list[int] = []
+    categories: set[Any] = set()
+    if op is sre_constants.LITERAL:
+        codes.append(av)
+    else:
+        for set_op, set_av in av:
+            if set_op is sre_constants.LITERAL:
+                codes.append(set_av)
+            elif set_op is sre_constants.RANGE and (
+                set_av[1] - set_av[0] < _MAX_ENUMERATED_CHARS
+            ):
+                codes.extend(range(set_av[0], set_av[1] + 1))
+            elif set_op is sre_constants.CATEGORY:
+                categories.add(set_av)
+            else:
+                return None  # classe niée, intervalle trop large…
+    if len(codes) > _MAX_ENUMERATED_CHARS:
+        return None
+    chars = {chr(code) for code in codes}
+    if flags & re.IGNORECASE:
+        chars |= {variant for char in chars for variant in (char.lower(), char.upper())}
+    return chars, categories
+
+
+def _compile_item(item: tuple[Any, Any], flags: int) -> re.Pattern[str] | None:
+    subpattern = sre_parse.SubPattern(sre_parse.State(), [item])
+    try:
+        return sre_compile.compile(subpattern, flags)
+    except (re.error, TypeError, ValueError):
+        return None
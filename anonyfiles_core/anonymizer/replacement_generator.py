@@ -3,7 +3,9 @@
 from typing import Any
 
 from .audit import AuditLogger
+from .entity_index import EntityOccurrenceIndex
 from .replacer import ReplacementSession
+from .type_defs import EntitySpanBlocks
 
 
 class ReplacementGenerator:
@@ -21,29 +23,28 @@ class ReplacementGenerator:
     def generate_spacy_replacements(
         self,
         unique_spacy_entities: list[tuple[str, str]],
-        entities_per_block_with_offsets: list[list[tuple[str, str, int, int]]],
+        entities_per_block_with_offsets: EntitySpanBlocks,
+        entity_index: EntityOccurrenceIndex | None = None,
     ) -> tuple[dict[str, str], dict[str, str]]:
         """
         Génère les remplacements pour les entités spaCy et met à jour l'audit log.
         Retourne le dictionnaire des remplacements (original_text -> anonymized_code)
         et le mapping complet (original_text -> anonymized_code) incluant les entités spaCy.
+        Les labels et nombres d'occurrences viennent de ``entity_index`` (construit
+        ici s'il n'est pas fourni par l'engine).
         """
+        if entity_index is None:
+            entity_index = EntityOccurrenceIndex(
+                unique_spacy_entities, entities_per_block_with_offsets
+            )
         replacements_map_spacy, mapping_dict_spacy = self.session.generate_replacements(
             unique_spacy_entities, replacement_rules=self.replacement_rules_spacy_config
         )
 
         # Journaliser les remplacements spaCy
         for original, code in mapping_dict_spacy.items():
-            label = next(
-                (lbl for txt, lbl in unique_spacy_entities if txt == original),
-                "UNKNOWN_SPACY_LABEL",
-            )
-            n_repl_spacy_in_block = 0
-            # Compter les occurrences dans tous les blocs pour l'audit log
-            for block_entities in entities_per_block_with_offsets:
-                for ent_text_offset, ent_label_offset, _, _ in block_entities:
-                    if ent_text_offset == original and ent_label_offset == label:
-                        n_repl_spacy_in_block += 1
+            label = entity_index.label(original)
+            n_repl_spacy_in_block = entity_index.count(original, label)
 
             if n_repl_spacy_in_block > 0:
                 self.audit_logger.log(
@@ -1,13 +1,15 @@
-import hashlib
 import logging
+from collections import Counter, deque
 from collections.abc import Callable
-from typing import Any
-
-from faker import Faker
+from typing import TYPE_CHECKING, Any
 
+from .faker_backend import DEFAULT_FAKER_LOCALE, get_faker_backend
 from .format_utils import create_placeholder
 from .type_defs import Entity, ReplacementMap
 
+if TYPE_CHECKING:
+    from faker import Faker
+
 logger = logging.getLogger(__name__)
 
 GeneratorFunc = Callable[["ReplacementSession", str, int, dict[str, Any], str], str]
@@ -112,14 +114,9 @@ def generate_placeholder_replacement(
         return f"{format_str}_{index + 1}"
 
 
-# Cache pour éviter de recréer l'objet Faker à chaque appel
-_faker_instances: dict[str, Faker] = {}
-
-
-def get_faker(locale: str = "fr_FR") -> Faker:
-    if locale not in _faker_instances:
-        _faker_instances[locale] = Faker(locale)
-    return _faker_instances[locale]
+def get_faker(locale: str = DEFAULT_FAKER_LOCALE) -> "Faker":
+    """Instance Faker du thread courant (générateur aléatoire privé)."""
+    return get_faker_backend().faker(locale)
 
 
 @register_generator("faker")
@@ -130,37 +127,19 @@ def generate_faker_replacement(
     options: dict[str, Any],
     entity_text: str,
 ) -> str:
-    locale = options.get("locale", "fr_FR")
-    fake = get_faker(locale)
-
-    # Mapping entre label SpaCy et méthodes Faker
-    provider_map = {
-        "PER": fake.name,
-        "LOC": fake.city,  # ou fake.address selon préférence
-        "ORG": fake.company,
-        "EMAIL": fake.email,
-        "PHONE": fake.phone_number,
-        "DATE": fake.date,
-        "IBAN": fake.iban,
-    }
-
-    # Fallback générique
-    provider_func = provider_map.get(label, lambda: f"FAKE_{label}")
+    locale = options.get("locale", DEFAULT_FAKER_LOCALE)
 
-    # Pour garantir la cohérence (toujours remplacer "Jean Dupont" par le même faux nom)
+    # Pour garantir la cohérence (toujours remplacer "Jean Dupont" par le même
+    # faux nom) : graine MD5 de l'entité, sur le générateur privé du thread.
     if options.get("consistent", False):
-        # Utilisation d'un hash stable (MD5) pour la seed, car hash() est aléatoire par processus
-        seed_int = int(
-            hashlib.md5(entity_text.encode("utf-8"), usedforsecurity=False).hexdigest(),
-            16,
-        )
-        Faker.seed(seed_int)
-        result = provider_func()
-        # Reset seed pour ne pas casser l'aléatoire global
-        Faker.seed(None)
+        result = get_faker_backend().generate(label, locale, seed_text=entity_text)
         return f"{result}_{index}"  # On garde l'index si besoin unicité stricte
 
-    return f"{provider_func()}"
+    # Valeurs pré-générées en lot par ``ReplacementSession.generate_replacements``.
+    pool = session.faker_pools.get((label, locale))
+    if pool:
+        return pool.popleft()
+    return get_faker_backend().generate(label, locale)
 
 
 class ReplacementSession:
@@ -170,6 +149,33 @@ class ReplacementSession:
 
     def __init__(self) -> None:
         self.entity_to_code: ReplacementMap = {}
+        # Index suivant par label : conservé d'un appel à l'autre pour que les
+        # tranches successives d'un même fichier ne réutilisent pas un code.
+        self.label_counters: dict[str, int] = {}
+        # (label, locale) -> valeurs Faker non cohérentes générées en lot.
+        self.faker_pools: dict[tuple[str, str], deque[str]] = {}
+
+    def _fill_faker_pools(
+        self,
+        unique_spacy_entities: list[Entity],
+        replacement_rules: dict[str, dict[str, Any]],
+    ) -> None:
+        """Pré-génère d'un bloc les valeurs Faker aléatoires nécessaires."""
+        needed: Counter[tuple[str, str]] = Counter()
+        seen: set[str] = set()
+        for entity_text, label in unique_spacy_entities:
+            if entity_text in seen or entity_text in self.entity_to_code:
+                continue
+            seen.add(entity_text)
+            rule = replacement_rules.get(label, {})
+            options = rule.get("options", {})
+            if rule.get("type") == "faker" and not options.get("consistent", False):
+                needed[(label, options.get("locale", DEFAULT_FAKER_LOCALE))] += 1
+        backend = get_faker_backend()
+        for (label, locale), count in needed.items():
+            self.faker_pools.setdefault((label, locale), deque()).extend(
+                backend.generate_many(label, count, locale)
+            )
 
     def _generate_code(self, label: str, index: int) -> str:
         return generate_code_replacement(self, label, index, {}, "")
@@ -184,8 +190,8 @@ class ReplacementSession:
 
         replacements: ReplacementMap = {}
         mapping: ReplacementMap = {}
-        # Compteurs locaux pour la génération séquentielle
-        label_counters: dict[str, int] = {}
+        label_counters = self.label_counters
+        self._fill_faker_pools(unique_spacy_entities, replacement_rules)
 
         for entity_text, label in unique_spacy_entities:
             # Réutilisation si déjà vu
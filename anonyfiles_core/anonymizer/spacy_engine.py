@@ -1,20 +1,35 @@
 # anonyfiles_cli/anonymizer/spacy_engine.py
 
+import hashlib
+import json
 import logging
 import os
 import re
+import shutil
+import time
 from functools import lru_cache
+from pathlib import Path
+from typing import Any
 
 import spacy
 
 from anonyfiles_cli.exceptions import ConfigurationError
 
+from .spacy_status import _distribution_version, _read_model_meta
+
 logger = logging.getLogger(__name__)
 
 # ANCIEN: EMAIL_REGEX = r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'
 # NOUVEAU: Utilise \b (word boundary) pour s'assurer que le match est une adresse email complète
 # et ne capture pas la ponctuation finale si elle n'est pas structurellement une partie de l'email.
-EMAIL_REGEX = r"\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,6}\b"
+# Parties bornées (64 / 255 caractères, limites RFC 5321) : sans borne, une
+# longue suite "a.a.a…" sans "@" coûte un parcours complet par frontière de
+# mot, soit un temps quadratique (scripts/benchmark_strict_regex.py). La garde à
+# gauche remplace le \b initial : une partie locale de plus de 64 caractères
+# n'est pas tronquée en une adresse partielle (préfixe laissé en clair).
+EMAIL_REGEX = (
+    r"(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]{1,64}@[a-zA-Z0-9.-]{1,255}\.[a-zA-Z]{2,6}\b"
+)
 
 DATE_REGEX = (
     r"\b("
@@ -76,11 +91,151 @@ def _install_hint(model_name: str) -> str:
     )
 
 
+# Patterns de l'``entity_ruler`` ajouté avant le NER (les regex ont la priorité).
+# Pour DATE, on s'appuie principalement sur spaCy NER ou une règle plus
+# complexe si besoin ; le NER s'en charge généralement bien.
+_RULER_PATTERNS = [
+    {"label": "EMAIL", "pattern": [{"TEXT": {"REGEX": EMAIL_REGEX}}]},
+    {"label": "PHONE", "pattern": [{"TEXT": {"REGEX": PHONE_REGEX}}]},
+    {"label": "IBAN", "pattern": [{"TEXT": {"REGEX": IBAN_REGEX}}]},
+    {"label": "ADDRESS", "pattern": [{"TEXT": {"REGEX": ADDRESS_REGEX}}]},
+]
+
+
+def _add_entity_ruler(nlp) -> None:
+    """Ajoute l'``entity_ruler`` des regex avant le NER, s'il est absent."""
+    if "entity_ruler" not in nlp.pipe_names:
+        ruler = nlp.add_pipe("entity_ruler", before="ner")
+        ruler.add_patterns(_RULER_PATTERNS)
+
+
+# Instantané du pipeline prêt à l'emploi (composants exclus retirés, ruler
+# ajouté), écrit une fois avec ``nlp.to_disk`` puis rechargé tel quel par les
+# processus suivants (CLI, workers API, sidecar). Le répertoire dépend de la
+# version du modèle, de spaCy et d'une empreinte des patterns : toute
+# modification invalide l'instantané. ``ANONYFILES_SPACY_SNAPSHOT_DIR`` choisit
+# l'emplacement ; une valeur vide ou ``off`` désactive le mécanisme.
+_SNAPSHOT_DIR_ENV = "ANONYFILES_SPACY_SNAPSHOT_DIR"
+_SNAPSHOT_MARKER = "anonyfiles_snapshot.json"
+
+# Coût du dernier chargement par modèle dans ce processus (``spacy_status``).
+_MODEL_LOAD_STATS: dict[str, dict[str, Any]] = {}
+
+
+def ruler_patterns_fingerprint() -> str:
+    """Empreinte des patterns du ruler et des composants exclus."""
+    payload = json.dumps(
+        {"patterns": _RULER_PATTERNS, "exclude": _UNUSED_PIPES}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _snapshot_root() -> Path | None:
+    configured = os.environ.get(_SNAPSHOT_DIR_ENV)
+    if configured is not None:
+        if configured.strip().lower() in ("", "0", "off", "false", "no"):
+            return None
+        return Path(configured).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "anonyfiles" / "spacy"
+
+
+def spacy_snapshot_path(model_name: str) -> Path | None:
+    """Répertoire de l'instantané de ``model_name``, ou None si indisponible."""
+    root = _snapshot_root()
+    model_version = _read_model_meta(model_name).get(
+        "version"
+    ) or _distribution_version(model_name)
+    spacy_version = getattr(spacy, "__version__", None)
+    if root is None or not model_version or not spacy_version:
+        return None
+    return root / (
+        f"{model_name}-{model_version}-spacy{spacy_version}-"
+        f"{ruler_patterns_fingerprint()}"
+    )
+
+
+def _load_snapshot(snapshot_path: Path):
+    if not (snapshot_path / _SNAPSHOT_MARKER).is_file():
+        return None
+    try:
+        return spacy.load(snapshot_path)
+    except Exception as exc:  # instantané corrompu : on repart du modèle
+        logger.warning("Instantané spaCy %s illisible : %s", snapshot_path, exc)
+        return None
+
+
+def _save_snapshot(nlp, model_name: str, snapshot_path: Path) -> bool:
+    """Écrit l'instantané (répertoire temporaire puis renommage atomique)."""
+    temporary_path = snapshot_path.with_name(f"{snapshot_path.name}.tmp-{os.getpid()}")
+    try:
+        nlp.to_disk(temporary_path)
+        (temporary_path / _SNAPSHOT_MARKER).write_text(
+            json.dumps(
+                {
+                    "model": model_name,
+                    "ruler_patterns": ruler_patterns_fingerprint(),
+                    "spacy": spacy.__version__,
+                }
+            ),
+            encoding="utf-8",
+        )
+        temporary_path.rename(snapshot_path)
+        return True
+    except OSError as exc:
+        # Autre processus plus rapide, disque en lecture seule... : sans gravité.
+        logger.debug("Instantané spaCy non écrit (%s) : %s", snapshot_path, exc)
+        return False
+    finally:
+        shutil.rmtree(temporary_path, ignore_errors=True)
+
+
+def model_load_stats(model_name: str) -> dict[str, Any] | None:
+    """Coût du chargement de ``model_name`` dans ce processus, s'il a eu lieu."""
+    stats = _MODEL_LOAD_STATS.get(model_name)
+    return dict(stats) if stats is not None else None
+
+
 @lru_cache(
     maxsize=2
 )  # Cache jusqu'à 2 modèles spaCy (ex: 'fr_core_news_md' et 'fr_core_news_lg')
 def _load_spacy_model_cached(model_name: str):
-    """Charge (et met en cache) un modèle spaCy.
+    """Charge (et met en cache) le pipeline spaCy prêt à l'emploi.
+
+    L'instantané du pipeline est chargé s'il existe ; sinon le modèle est
+    chargé (``_load_installed_model``), complété par l'``entity_ruler`` puis
+    l'instantané est écrit pour les processus suivants. La durée et l'origine
+    du chargement sont conservées pour ``spacy_status``.
+    """
+    started = time.perf_counter()
+    snapshot_path = spacy_snapshot_path(model_name)
+    nlp = _load_snapshot(snapshot_path) if snapshot_path is not None else None
+    source = "snapshot"
+    snapshot_saved = False
+    if nlp is None:
+        source = "model"
+        nlp = _load_installed_model(model_name)
+        _add_entity_ruler(nlp)
+        if snapshot_path is not None:
+            snapshot_saved = _save_snapshot(nlp, model_name, snapshot_path)
+    _MODEL_LOAD_STATS[model_name] = {
+        "seconds": round(time.perf_counter() - started, 3),
+        "source": source,
+        "snapshot_path": str(snapshot_path) if snapshot_path is not None else None,
+        "snapshot_saved": snapshot_saved,
+        "pid": os.getpid(),
+    }
+    logger.info(
+        "spaCy model %s loaded from %s in %.2fs",
+        model_name,
+        source,
+        _MODEL_LOAD_STATS[model_name]["seconds"],
+    )
+    return nlp
+
+
+def _load_installed_model(model_name: str):
+    """Charge un modèle spaCy installé (ou le télécharge une fois).
 
     Stratégie :
     1. Si le paquet est installé, on le charge directement. Toute erreur de
@@ -166,23 +321,8 @@ class SpaCyEngine:
         # Utilise la fonction de chargement mise en cache
         self.nlp = _load_spacy_model_cached(model)
 
-        # Configuration de l'EntityRuler si pas déjà présent
-        if "entity_ruler" not in self.nlp.pipe_names:
-            # On ajoute le ruler AVANT le NER ("ner") pour que les regex aient la priorité
-            ruler = self.nlp.add_pipe("entity_ruler", before="ner")
-
-            patterns = [
-                {"label": "EMAIL", "pattern": [{"TEXT": {"REGEX": EMAIL_REGEX}}]},
-                {"label": "PHONE", "pattern": [{"TEXT": {"REGEX": PHONE_REGEX}}]},
-                {"label": "IBAN", "pattern": [{"TEXT": {"REGEX": IBAN_REGEX}}]},
-                {"label": "ADDRESS", "pattern": [{"TEXT": {"REGEX": ADDRESS_REGEX}}]},
-                # Pour DATE, on s'appuie principalement sur spaCy NER ou une règle plus complexe si besoin
-                # {"label": "DATE", "pattern": [{"TEXT": {"REGEX": DATE_REGEX}}]},
-            ]
-            ruler.add_patterns(patterns)
-
-            # Note: Si DATE via Regex est critique et que la Regex est compatible spaCy ("TEXT" match token unique),
-            # on peut l'ajouter. Sinon, le NER s'en charge généralement bien.
+        # EntityRuler déjà présent si le pipeline vient de l'instantané.
+        _add_entity_ruler(self.nlp)
 
     def detect_entities(self, text, enabled_labels=None):
         """
@@ -232,3 +372,10 @@ class SpaCyEngine:
     def nlp_doc(self, text):
         """Renvoie le doc spaCy (utile pour offsets, etc.)."""
         return self.nlp(text)
+
+    def nlp_pipe(self, texts, batch_size=256):
+        """Traite un flux de textes par lots via ``nlp.pipe``.
+
+        Les docs sont produits paresseusement, dans l'ordre des textes fournis.
+        """
+        return self.nlp.pipe(texts, batch_size=batch_size)
@@ -2,15 +2,24 @@ import contextlib
 import importlib
 import importlib.metadata
 import importlib.resources
+import importlib.util
 import json
 import platform
+import sys
 from typing import Any
 
 DEFAULT_SPACY_MODEL = "fr_core_news_md"
 
 
-def get_spacy_status(model_name: str = DEFAULT_SPACY_MODEL) -> dict[str, Any]:
-    """Return a fast, load-free diagnostic for spaCy and the configured model."""
+def get_spacy_status(
+    model_name: str = DEFAULT_SPACY_MODEL, measure_load: bool = False
+) -> dict[str, Any]:
+    """Return a fast, load-free diagnostic for spaCy and the configured model.
+
+    ``cold_start`` reports the model load already done by this process, if
+    any. With ``measure_load``, a ready model is loaded first (snapshot or
+    full model) so the cold-start cost is measured.
+    """
     model_name = model_name or DEFAULT_SPACY_MODEL
     spacy_version = _distribution_version("spacy")
     spacy_installed = bool(spacy_version or _find_module("spacy"))
@@ -53,6 +62,7 @@ def get_spacy_status(model_name: str = DEFAULT_SPACY_MODEL) -> dict[str, Any]:
             "spacy_version_constraint": spacy_constraint,
             "compatible": compatible,
         },
+        "cold_start": _cold_start_status(model_name, measure_load and ready),
         "commands": {
             "install_model": f"python -m spacy download {model_name}",
             "repair_model": f"python -m spacy download {model_name}",
@@ -61,6 +71,28 @@ def get_spacy_status(model_name: str = DEFAULT_SPACY_MODEL) -> dict[str, Any]:
     }
 
 
+def _cold_start_status(model_name: str, measure_load: bool) -> dict[str, Any]:
+    # Sans ``measure_load``, spacy_engine n'est jamais importé ici : le
+    # diagnostic reste instantané (ni spaCy ni le modèle ne sont chargés).
+    engine = sys.modules.get("anonyfiles_core.anonymizer.spacy_engine")
+    error = None
+    if measure_load:
+        try:
+            engine = importlib.import_module("anonyfiles_core.anonymizer.spacy_engine")
+            engine._load_spacy_model_cached(model_name)
+        except Exception as exc:
+            error = str(exc)
+    stats = engine.model_load_stats(model_name) if engine is not None else None
+    return {
+        "loaded": stats is not None,
+        "source": stats.get("source") if stats else None,
+        "seconds": stats.get("seconds") if stats else None,
+        "snapshot_path": stats.get("snapshot_path") if stats else None,
+        "snapshot_saved": stats.get("snapshot_saved") if stats else None,
+        "error": error,
+    }
+
+
 def format_spacy_status_for_error(status: dict[str, Any]) -> str:
     """Build an actionable one-line error message from ``get_spacy_status``."""
     commands = status.get("commands", {})
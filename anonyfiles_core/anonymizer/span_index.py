@@ -0,0 +1,64 @@
+# anonyfiles_core/anonymizer/span_index.py
+"""Index d'intervalles pour les tests de chevauchement de spans.
+
+Les spans ajoutés sont fusionnés en une liste triée d'intervalles disjoints
+(``[start, end)``) : « chevauche un span existant » équivaut à « intersecte
+leur union », ce qui se teste par dichotomie en O(log n) au lieu d'un
+parcours de tous les spans.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+
+
+class SpanIndex:
+    """Union triée de spans ``[start, end)`` avec test de chevauchement."""
+
+    def __init__(self, spans: Iterable[tuple[int, int]] = ()):
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        for start, end in spans:
+            self.add(start, end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """Vrai si un span indexé vérifie ``s < end and e > start``."""
+        index = bisect_left(self._starts, end) - 1
+        return index >= 0 and self._ends[index] > start
+
+    def gaps(self, start: int, end: int) -> Iterator[tuple[int, int]]:
+        """Itère sur les sous-intervalles non vides de ``[start, end)`` non couverts."""
+        cursor = start
+        for index in range(bisect_right(self._ends, start), len(self._starts)):
+            span_start = self._starts[index]
+            if span_start >= end:
+                break
+            if span_start > cursor:
+                yield cursor, span_start
+            cursor = max(cursor, self._ends[index])
+        if cursor < end:
+            yield cursor, end
+
+    def add(self, start: int, end: int) -> None:
+        """Ajoute ``[start, end)`` en fusionnant les intervalles chevauchants.
+
+        Les intervalles simplement contigus restent séparés : un span vide
+        placé à leur jonction ne les chevauche pas.
+        """
+        starts = self._starts
+        ends = self._ends
+        # Intervalles dont l'intersection avec [start, end) est non vide (ou
+        # qui contiennent strictement un span vide).
+        low = bisect_right(ends, start)
+        high = bisect_left(starts, end)
+        if low < high:
+            start = min(start, starts[low])
+            end = max(end, ends[high - 1])
+            del starts[low:high]
+            del ends[low:high]
+        starts.insert(low, start)
+        ends.insert(low, end)
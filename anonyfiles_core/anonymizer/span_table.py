@@ -0,0 +1,159 @@
+# anonyfiles_core/anonymizer/span_table.py
+"""Table compacte des spans d'entités par bloc.
+
+Une liste de listes de tuples ``(texte, label, début, fin)`` coûte un tuple,
+une liste et souvent une copie de la chaîne par occurrence : sur un classeur
+d'un million de cellules, des centaines de Mo d'objets Python. ``SpanTable``
+range les mêmes spans dans des tableaux ``array`` parallèles (bloc, début,
+fin, label, texte) et interne les textes et labels dans des pools partagés.
+
+La table se comporte comme une séquence de blocs en lecture : ``table[i]``
+matérialise la liste de tuples du bloc ``i`` à la demande, ce qui la rend
+utilisable partout où une liste de listes était attendue.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from typing import overload
+
+from .type_defs import EntitySpan
+
+# 4 octets par valeur : offsets, identifiants de bloc et de texte.
+_INDEX_TYPECODE = "I"
+# Quelques dizaines de labels au plus.
+_LABEL_TYPECODE = "H"
+
+
+class StringPool:
+    """Pool de chaînes internées : une seule copie par valeur distincte."""
+
+    __slots__ = ("_ids", "values")
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value: str) -> int:
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self._ids[value] = value_id
+            self.values.append(value)
+        return value_id
+
+
+class SpanTable(Sequence[list[EntitySpan]]):
+    """Spans ``(texte, label, début, fin)`` rangés par bloc dans des tableaux."""
+
+    __slots__ = (
+        "_block_count",
+        "block_ids",
+        "ends",
+        "label_ids",
+        "labels",
+        "starts",
+        "text_ids",
+        "texts",
+    )
+
+    def __init__(self) -> None:
+        self.block_ids = array(_INDEX_TYPECODE)
+        self.starts = array(_INDEX_TYPECODE)
+        self.ends = array(_INDEX_TYPECODE)
+        self.label_ids = array(_LABEL_TYPECODE)
+        self.text_ids = array(_INDEX_TYPECODE)
+        self.texts = StringPool()
+        self.labels = StringPool()
+        self._block_count = 0
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[Iterable[EntitySpan]]) -> SpanTable:
+        """Construit la table bloc par bloc (un générateur reste paresseux)."""
+        table = cls()
+        for block_entities in blocks:
+            table.append_block(block_entities)
+        return table
+
+    def append_block(self, block_entities: Iterable[EntitySpan]) -> None:
+        """Ajoute le bloc suivant (éventuellement vide)."""
+        block_id = self._block_count
+        for ent_text, ent_label, start, end in block_entities:
+            self.block_ids.append(block_id)
+            self.starts.append(start)
+            self.ends.append(end)
+            self.label_ids.append(self.labels.intern(ent_label))
+            self.text_ids.append(self.texts.intern(ent_text))
+        self._block_count += 1
+
+    @property
+    def span_count(self) -> int:
+        return len(self.starts)
+
+    def __len__(self) -> int:
+        return self._block_count
+
+    @overload
+    def __getitem__(self, index: int) -> list[EntitySpan]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[list[EntitySpan]]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> list[EntitySpan] | list[list[EntitySpan]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._block_count))]
+        if index < 0:
+            index += self._block_count
+        if not 0 <= index < self._block_count:
+            raise IndexError("SpanTable index out of range")
+        return list(self.iter_block(index))
+
+    def __iter__(self) -> Iterator[list[EntitySpan]]:
+        # Un seul parcours des tableaux, sans dichotomie par bloc.
+        texts = self.texts.values
+        labels = self.labels.values
+        position = 0
+        span_count = self.span_count
+        for block_index in range(self._block_count):
+            block_entities: list[EntitySpan] = []
+            while position < span_count and self.block_ids[position] == block_index:
+                block_entities.append(
+                    (
+                        texts[self.text_ids[position]],
+                        labels[self.label_ids[position]],
+                        self.starts[position],
+                        self.ends[position],
+                    )
+                )
+                position += 1
+            yield block_entities
+
+    def _block_bounds(self, block_index: int) -> tuple[int, int]:
+        return (
+            bisect_left(self.block_ids, block_index),
+            bisect_right(self.block_ids, block_index),
+        )
+
+    def iter_block(self, block_index: int) -> Iterator[EntitySpan]:
+        """Itère sur les spans d'un bloc sans construire de liste."""
+        texts = self.texts.values
+        labels = self.labels.values
+        first, last = self._block_bounds(block_index)
+        for position in range(first, last):
+            yield (
+                texts[self.text_ids[position]],
+                labels[self.label_ids[position]],
+                self.starts[position],
+                self.ends[position],
+            )
+
+    def block_span_count(self, block_index: int) -> int:
+        first, last = self._block_bounds(block_index)
+        return last - first
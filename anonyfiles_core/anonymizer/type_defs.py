@@ -1,10 +1,16 @@
-from typing import Any, TypeAlias, TypedDict
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, TypeAlias, TypedDict
+
+if TYPE_CHECKING:
+    from .entity_index import EntityOccurrenceIndex
 
 TextBlock: TypeAlias = str
 TextBlocks: TypeAlias = list[TextBlock]
 Entity: TypeAlias = tuple[str, str]
 EntitySpan: TypeAlias = tuple[str, str, int, int]
 EntitySpansByBlock: TypeAlias = list[list[EntitySpan]]
+# Spans par bloc en lecture seule : liste de listes ou ``SpanTable`` compacte.
+EntitySpanBlocks: TypeAlias = Sequence[list[EntitySpan]]
 EntityLabelOverrides: TypeAlias = dict[str, str]
 ReplacementMap: TypeAlias = dict[str, str]
 ProcessorKwargs: TypeAlias = dict[str, Any]
@@ -29,6 +35,8 @@ class EngineResult(TypedDict, total=False):
     entities_detected: list[Entity]
     output_path: str | None
     replacements_applied_spacy: ReplacementMap | None
+    detection_stats: dict[str, Any]
+    column_profiles: list[dict[str, Any]]
 
 
 class ProcessContentResult(TypedDict, total=False):
@@ -36,9 +44,10 @@ class ProcessContentResult(TypedDict, total=False):
     blocks_after_custom: TextBlocks
     final_blocks: TextBlocks
     unique_spacy_entities: list[Entity]
-    spacy_entities_per_block: EntitySpansByBlock
+    spacy_entities_per_block: EntitySpanBlocks
     replacements_map_spacy: ReplacementMap
     mapping_dict_spacy: ReplacementMap
+    entity_index: "EntityOccurrenceIndex"
 
 
 class SpacyStatusPayload(TypedDict):
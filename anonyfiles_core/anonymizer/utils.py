@@ -1,12 +1,13 @@
 # anonyfiles_cli/anonymizer/utils.py
 
+from collections.abc import Iterable
 from io import StringIO  # Nécessaire pour la fonction
 
 
 def apply_positional_replacements(
     text: str,
     entity_replacements: dict[str, str],
-    entities_in_text_block: list[tuple[str, str, int, int]],
+    entities_in_text_block: Iterable[tuple[str, str, int, int]],
 ) -> str:
     """
     Applique les remplacements d'entités dans un bloc de texte en respectant leurs positions.
@@ -16,7 +17,8 @@ def apply_positional_replacements(
         text (str): Le bloc de texte original.
         entity_replacements (Dict[str, str]): Dictionnaire des remplacements où la clé est le texte original de l'entité
                                               et la valeur est le texte anonymisé.
-        entities_in_text_block (List[Tuple[str, str, int, int]]): Liste des entités détectées dans ce bloc,
+        entities_in_text_block (Iterable[Tuple[str, str, int, int]]): Entités détectées dans ce bloc
+                                                                 (liste ou ``SpanTable.iter_block``),
                                                                  incluant le texte de l'entité, son label,
                                                                  sa position de début et sa position de fin
                                                                  (par rapport au texte original).
@@ -58,3 +60,47 @@ def apply_positional_replacements(
     output.write(text[current_original_cursor:])
 
     return output.getvalue()
+
+
+def apply_positional_replacements_with_spans(
+    text: str,
+    entity_replacements: dict[str, str],
+    entities_in_text_block: Iterable[tuple[str, str, int, int]],
+    carried_spans: Iterable[tuple[int, int]] = (),
+) -> tuple[str, list[tuple[int, int]]]:
+    """
+    Variante de ``apply_positional_replacements`` qui renvoie aussi, dans le
+    texte produit, les spans des valeurs de remplacement et des
+    ``carried_spans`` (spans du texte d'entrée, ex. tokens des règles
+    personnalisées) recalés après les remplacements qui les précèdent.
+    """
+    output = StringIO()
+    output_spans: list[tuple[int, int]] = []
+    sorted_entities = sorted(entities_in_text_block, key=lambda x: x[2])
+    pending_spans = sorted(carried_spans, reverse=True)
+
+    cursor = 0
+    output_length = 0
+
+    def carry_spans_before(limit: int) -> None:
+        while pending_spans and pending_spans[-1][0] < limit:
+            span_start, span_end = pending_spans.pop()
+            shifted_start = output_length + max(0, span_start - cursor)
+            output_spans.append((shifted_start, shifted_start + span_end - span_start))
+
+    for ent_text, _ent_label, ent_start_char, ent_end_char in sorted_entities:
+        carry_spans_before(ent_start_char)
+        replacement_value = entity_replacements.get(ent_text, ent_text)
+        before = text[cursor:ent_start_char]
+        output.write(before)
+        output_length += len(before)
+        output.write(replacement_value)
+        if replacement_value != ent_text:
+            output_spans.append((output_length, output_length + len(replacement_value)))
+        output_length += len(replacement_value)
+        cursor = ent_end_char
+
+    carry_spans_before(len(text) + 1)
+    output.write(text[cursor:])
+    output_spans.sort()
+    return output.getvalue(), output_spans
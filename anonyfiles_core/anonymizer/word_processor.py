@@ -1,34 +1,56 @@
 # anonymizer/word_processor.py
 
 import logging
+import zipfile
 from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
+from xml.parsers import expat
 
 from docx import Document
 
+from . import docx_stream
 from .base_processor import BaseProcessor
 from .type_defs import TextBlocks
 
 logger = logging.getLogger(__name__)
 
+# "ooxml" : lecture/réécriture en flux des parties XML (docx_stream) ;
+# "python-docx" : modèle objet python-docx (ancien chemin).
+DOCX_ENGINES = ("ooxml", "python-docx")
+DEFAULT_DOCX_ENGINE = "ooxml"
+
 
 class DocxProcessor(BaseProcessor):
     """
     Processor pour les fichiers .docx.
-    - Traverse hiérarchiquement : Paragraphes du corps -> Tableaux (récursifs).
+    - ``docx_engine="ooxml"`` (défaut) : paragraphes lus en flux dans
+      ``word/document.xml``, les en-têtes et pieds de page ; seuls les runs
+      modifiés sont réécrits (voir ``docx_stream``).
+    - ``docx_engine="python-docx"`` : traverse hiérarchiquement Paragraphes du
+      corps -> Tableaux (récursifs) -> En-têtes/Pieds via python-docx.
     - Préserve l'intégrité de la structure tout en anonymisant l'ensemble du contenu.
     """
 
+    # Moteur retenu à l'extraction, réutilisé à la reconstruction (l'ordre
+    # des blocs diffère d'un moteur à l'autre).
+    docx_engine: str = DEFAULT_DOCX_ENGINE
+    # Nombre de paragraphes par partie XML, relevé à l'extraction OOXML.
+    _part_counts: tuple[Path, dict[str, int]] | None = None
+
     @staticmethod
-    def _open_document(path: Path) -> Any:
+    def _unreadable(path: Path, exc: Exception) -> ValueError:
+        return ValueError(
+            f"Fichier .docx illisible ou corrompu: {Path(path).name} ({exc})"
+        )
+
+    @classmethod
+    def _open_document(cls, path: Path) -> Any:
         """Ouvre un document .docx en remontant une erreur claire si illisible."""
         try:
             return Document(str(path))
         except Exception as exc:
-            raise ValueError(
-                f"Fichier .docx illisible ou corrompu: {Path(path).name} ({exc})"
-            ) from exc
+            raise cls._unreadable(path, exc) from exc
 
     def _iter_block_items(self, parent_elt: Any) -> Iterator[Any]:
         """
@@ -87,6 +109,20 @@ class DocxProcessor(BaseProcessor):
         Extrait TOUS les blocs de texte (Body + Tables + En-têtes/Pieds de page).
         Retourne une liste plate de chaînes de caractères.
         """
+        engine = kwargs.get("docx_engine", DEFAULT_DOCX_ENGINE)
+        if engine not in DOCX_ENGINES:
+            raise ValueError(
+                f"docx_engine inconnu: {engine!r} (attendu: {', '.join(DOCX_ENGINES)})"
+            )
+        self.docx_engine = engine
+        if engine == "ooxml":
+            try:
+                paragraphs, counts = docx_stream.extract_paragraphs(Path(input_path))
+            except (zipfile.BadZipFile, expat.ExpatError, KeyError, ValueError) as exc:
+                raise self._unreadable(input_path, exc) from exc
+            self._part_counts = (Path(input_path), counts)
+            return paragraphs
+
         doc = self._open_document(input_path)
         blocks: TextBlocks = []
 
@@ -106,6 +142,16 @@ class DocxProcessor(BaseProcessor):
         Reconstruit le document DOCX en injectant les blocs anonymisés.
         Gère le corps du texte ET les tableaux.
         """
+        output_dir = Path(output_path).parent
+        if not output_dir.exists():
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.docx_engine == "ooxml":
+            self._write_ooxml(
+                Path(output_path), final_processed_blocks, Path(original_input_path)
+            )
+            return
+
         doc = self._open_document(original_input_path)
         target_paragraphs = list(self._iter_document_paragraphs(doc))
 
@@ -183,8 +229,32 @@ class DocxProcessor(BaseProcessor):
             if remaining_text and runs:
                 runs[-1].text += remaining_text
 
-        output_dir = Path(output_path).parent
-        if not output_dir.exists():
-            output_dir.mkdir(parents=True, exist_ok=True)
-
         doc.save(output_path)
+
+    def _write_ooxml(
+        self, output_path: Path, blocks: TextBlocks, original_input_path: Path
+    ) -> None:
+        """Réécrit l'archive en ne remplaçant que les ``w:t`` modifiés."""
+        try:
+            if self._part_counts and self._part_counts[0] == original_input_path:
+                counts = self._part_counts[1]
+            else:
+                counts = docx_stream.count_paragraphs(original_input_path)
+        except (zipfile.BadZipFile, expat.ExpatError, KeyError, ValueError) as exc:
+            raise self._unreadable(original_input_path, exc) from exc
+
+        count_expected = sum(counts.values())
+        if count_expected != len(blocks):
+            raise ValueError(
+                "Mismatch Reconstruct Word: "
+                f"{count_expected} paragraphes (corps + tableaux + en-têtes/pieds) "
+                f"vs {len(blocks)} blocs fournis."
+            )
+        try:
+            docx_stream.write_paragraphs(
+                original_input_path, output_path, list(blocks), counts
+            )
+        except Exception:
+            # Pas de document à moitié réécrit (potentiellement non anonymisé).
+            output_path.unlink(missing_ok=True)
+            raise
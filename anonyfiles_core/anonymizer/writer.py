@@ -8,8 +8,9 @@ from typing import Any
 import aiofiles
 
 from .base_processor import BaseProcessor
+from .entity_index import EntityOccurrenceIndex
 from .pdf_processor import PdfProcessor  # Spécifique pour kwargs de PDF
-from .type_defs import Entity, EntitySpansByBlock, ReplacementMap, TextBlocks
+from .type_defs import Entity, EntitySpanBlocks, ReplacementMap, TextBlocks
 
 
 class AnonymizedFileWriter:
@@ -26,7 +27,7 @@ class AnonymizedFileWriter:
         output_path: Path,
         final_processed_blocks: TextBlocks,
         original_input_path: Path,
-        spacy_entities_per_block_with_offsets: EntitySpansByBlock | None = None,
+        spacy_entities_per_block_with_offsets: EntitySpanBlocks | None = None,
         **kwargs: Any,
     ) -> None:
         """
@@ -64,7 +65,7 @@ class AnonymizedFileWriter:
         output_path: Path,
         final_processed_blocks: TextBlocks,
         original_input_path: Path,
-        spacy_entities_per_block_with_offsets: EntitySpansByBlock | None = None,
+        spacy_entities_per_block_with_offsets: EntitySpanBlocks | None = None,
         **kwargs: Any,
     ) -> None:
         if self.dry_run:
@@ -132,12 +133,15 @@ class AnonymizedFileWriter:
         custom_replacements_mapping: ReplacementMap,
         mapping_dict_spacy: ReplacementMap,
         unique_spacy_entities: list[Entity],
+        entity_index: EntityOccurrenceIndex | None = None,
     ) -> None:
         """
         Écrit le fichier CSV de mapping complet (règles custom + spaCy).
         """
         if self.dry_run:
             return
+        if entity_index is None:
+            entity_index = EntityOccurrenceIndex(unique_spacy_entities)
 
         mapping_output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(mapping_output_path, "w", encoding="utf-8", newline="") as f_map:
@@ -150,12 +154,9 @@ class AnonymizedFileWriter:
 
             # Ajouter les mappings spaCy
             for original, code in mapping_dict_spacy.items():
-                # Trouver le label pour l'entité spaCy
-                label = next(
-                    (lbl for txt, lbl in unique_spacy_entities if txt == original),
-                    "UNKNOWN_SPACY_LABEL",
+                map_writer.writerow(
+                    [code, original, entity_index.label(original), "spacy"]
                 )
-                map_writer.writerow([code, original, label, "spacy"])
 
     async def write_mapping_file_async(
         self,
@@ -163,9 +164,12 @@ class AnonymizedFileWriter:
         custom_replacements_mapping: ReplacementMap,
         mapping_dict_spacy: ReplacementMap,
         unique_spacy_entities: list[Entity],
+        entity_index: EntityOccurrenceIndex | None = None,
     ) -> None:
         if self.dry_run:
             return
+        if entity_index is None:
+            entity_index = EntityOccurrenceIndex(unique_spacy_entities)
 
         mapping_output_path.parent.mkdir(parents=True, exist_ok=True)
         buf = io.StringIO()
@@ -174,11 +178,7 @@ class AnonymizedFileWriter:
         for original, anonymized in custom_replacements_mapping.items():
             map_writer.writerow([anonymized, original, "CUSTOM", "custom_rule"])
         for original, code in mapping_dict_spacy.items():
-            label = next(
-                (lbl for txt, lbl in unique_spacy_entities if txt == original),
-                "UNKNOWN_SPACY_LABEL",
-            )
-            map_writer.writerow([code, original, label, "spacy"])
+            map_writer.writerow([code, original, entity_index.label(original), "spacy"])
         async with aiofiles.open(
             mapping_output_path, "w", encoding="utf-8", newline=""
         ) as f_map:
@@ -36,6 +36,7 @@ WORK_DIR = REPO_ROOT / "packaging" / "sidecar"
 TARGET_DIR = REPO_ROOT / "anonyfiles_gui" / "src-tauri" / "sidecar"
 ENTRY = REPO_ROOT / "anonyfiles_api" / "__main__.py"
 CONFIG_DIR = REPO_ROOT / "anonyfiles_core" / "config"
+LEXICON_DIR = REPO_ROOT / "anonyfiles_core" / "anonymizer" / "data"
 
 KNOWN_MODELS = {"md", "sm", "lg"}
 
@@ -106,6 +107,9 @@ def build(model: str, clean: bool) -> Path:
         # config YAML expected by anonyfiles_api/core_config.py
         "--add-data",
         f"{CONFIG_DIR}{sep}anonyfiles_core/config",
+        # lexique de prénoms précompilé (anonymizer/first_name_lexicon.py)
+        "--add-data",
+        f"{LEXICON_DIR}{sep}anonyfiles_core/anonymizer/data",
         # uvicorn imports dynamiques
         "--hidden-import",
         "uvicorn.logging",
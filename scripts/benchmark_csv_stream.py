@@ -0,0 +1,112 @@
+"""Benchmark du traitement CSV par tranches (``stream_chunk_rows``).
+
+Anonymise le même CSV généré en une fois puis par tranches, mesure le temps
+et le pic mémoire Python (``tracemalloc``) et vérifie que les fichiers de
+sortie et de mapping sont identiques. spaCy est remplacé par un modèle sans
+entité : seules les regex (emails, téléphones) produisent des remplacements,
+ce qui isole le coût de lecture, de remplacement et d'écriture.
+
+Usage : python scripts/benchmark_csv_stream.py --rows 200000 --chunk-rows 20000
+"""
+
+import argparse
+import csv
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from anonyfiles_core.anonymizer import engine as engine_module
+
+NOTES = [
+    "",
+    "RAS",
+    "Rappeler le client au 06 12 34 56 78",
+    "Relance envoyée par email",
+    "Dossier complet, validé",
+]
+
+
+class _NoEntityDoc:
+    def __init__(self) -> None:
+        self.ents: list = []
+
+
+class _NoEntitySpaCyEngine:
+    def __init__(self, model: str):
+        self.model = model
+
+    def nlp_pipe(self, texts, batch_size=256):
+        for _text in texts:
+            yield _NoEntityDoc()
+
+
+def build_csv(path: Path, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "email", "telephone", "montant", "note"])
+        for index in range(rows):
+            phone = " ".join(str(rng.randrange(10, 99)) for _ in range(4))
+            writer.writerow(
+                [
+                    index,
+                    f"client{rng.randrange(rows // 10 + 1)}@example.com",
+                    f"06 {phone}",
+                    f"{rng.uniform(0, 5000):.2f}",
+                    rng.choice(NOTES),
+                ]
+            )
+
+
+def run(input_path: Path, workdir: Path, name: str, chunk_rows: int) -> Path:
+    engine = engine_module.AnonyfilesEngine(config={"stream_chunk_rows": chunk_rows})
+    output_path = workdir / f"{name}.csv"
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=output_path,
+        entities=None,
+        dry_run=False,
+        log_entities_path=None,
+        mapping_output_path=workdir / f"{name}_mapping.csv",
+        has_header=True,
+    )
+    seconds = time.perf_counter() - started
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert result["status"] == "success", result
+    print(
+        f"{name:<10}: {seconds:.2f} s, pic mémoire {peak / 2**20:.1f} Mio, "
+        f"{result['total_replacements']} remplacements"
+    )
+    return output_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--chunk-rows", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine_module.SpaCyEngine = _NoEntitySpaCyEngine  # type: ignore[misc]
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        input_path = workdir / "input.csv"
+        build_csv(input_path, args.rows, args.seed)
+        size_mb = input_path.stat().st_size / 2**20
+        print(f"CSV : {args.rows} lignes, {size_mb:.1f} Mio")
+
+        whole = run(input_path, workdir, "en bloc", 0)
+        chunked = run(input_path, workdir, "tranches", args.chunk_rows)
+        assert whole.read_bytes() == chunked.read_bytes(), "Sorties différentes"
+        assert (workdir / "en bloc_mapping.csv").read_bytes() == (
+            workdir / "tranches_mapping.csv"
+        ).read_bytes(), "Mappings différents"
+
+
+if __name__ == "__main__":
+    main()
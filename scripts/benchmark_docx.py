@@ -0,0 +1,164 @@
+"""Benchmark DOCX : flux OOXML (``docx_engine: ooxml``) vs python-docx.
+
+Génère un contrat (paragraphes, tableaux, en-tête et pied de page), puis
+l'anonymise avec chaque moteur dans un interpréteur neuf pour mesurer le
+temps et le pic mémoire du processus (``ru_maxrss``, qui inclut l'arbre lxml
+de python-docx, invisible pour ``tracemalloc``). spaCy est remplacé par un
+modèle sans entité : seules les regex (emails, téléphones) produisent des
+remplacements, ce qui isole le coût de lecture et de réécriture du document.
+La ligne « processor » mesure la lecture et la réécriture seules (chaque
+adresse email remplacée). Vérifie que les deux sorties contiennent les mêmes
+paragraphes.
+
+Usage : python scripts/benchmark_docx.py --pages 500
+"""
+
+import argparse
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+
+from anonyfiles_core.anonymizer import engine as engine_module
+from anonyfiles_core.anonymizer.word_processor import DOCX_ENGINES, DocxProcessor
+
+PARAGRAPHS_PER_PAGE = 12
+# Les codes sont numérotés dans l'ordre des blocs, propre à chaque moteur.
+CODE_NUMBER = re.compile(r"(\{\{[A-Z]+)_\d+(\}\})")
+CLAUSES = [
+    "Le prestataire s'engage à exécuter la mission décrite en annexe.",
+    "Toute notification est adressée par courrier recommandé.",
+    "Les parties conviennent de se rapprocher en cas de différend.",
+    "La présente clause survit à la résiliation du contrat.",
+]
+
+
+class _NoEntityDoc:
+    def __init__(self) -> None:
+        self.ents: list = []
+
+
+class _NoEntitySpaCyEngine:
+    def __init__(self, model: str):
+        self.model = model
+
+    def nlp_pipe(self, texts, batch_size=256):
+        for _text in texts:
+            yield _NoEntityDoc()
+
+
+def build_docx(path: Path, pages: int, seed: int) -> None:
+    rng = random.Random(seed)
+    doc = Document()
+    section = doc.sections[0]
+    section.header.paragraphs[0].text = "Contrat n° 2024-001 — contact@example.com"
+    section.footer.paragraphs[0].text = "Service juridique : 01 23 45 67 89"
+    for page in range(pages):
+        doc.add_heading(f"Article {page + 1}", level=2)
+        for _ in range(PARAGRAPHS_PER_PAGE - 4):
+            paragraph = doc.add_paragraph()
+            paragraph.add_run(rng.choice(CLAUSES) + " ")
+            paragraph.add_run(f"Contact : client{rng.randrange(500)}@example.com")
+            paragraph.runs[-1].bold = True
+            paragraph.add_run(f", tél. 06 {rng.randrange(10, 99)} 12 34 56.")
+        table = doc.add_table(rows=2, cols=3)
+        for row in table.rows:
+            for cell in row.cells:
+                cell.text = f"Réf. {rng.randrange(10_000)} — 07 98 76 54 32"
+    doc.save(str(path))
+
+
+def run_processor(docx_engine: str, input_path: Path, output_path: Path) -> None:
+    """Exécuté dans un interpréteur neuf : extraction + réécriture seules."""
+    processor = DocxProcessor()
+    started = time.perf_counter()
+    blocks = processor.extract_blocks(input_path, docx_engine=docx_engine)
+    final_blocks = [block.replace("@example.com", "@x.invalid") for block in blocks]
+    processor.reconstruct_and_write_anonymized_file(
+        output_path, final_blocks, input_path
+    )
+    seconds = time.perf_counter() - started
+    maxrss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{seconds:.2f} {maxrss_mb:.0f} {len(blocks)}")
+
+
+def run_engine(docx_engine: str, input_path: Path, output_path: Path) -> None:
+    """Exécuté dans un interpréteur neuf : affiche durée, pic RSS, remplacements."""
+    engine_module.SpaCyEngine = _NoEntitySpaCyEngine  # type: ignore[misc]
+    engine = engine_module.AnonyfilesEngine(config={"docx_engine": docx_engine})
+    started = time.perf_counter()
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=output_path,
+        entities=None,
+        dry_run=False,
+        log_entities_path=None,
+        mapping_output_path=None,
+    )
+    seconds = time.perf_counter() - started
+    assert result["status"] == "success", result
+    maxrss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{seconds:.2f} {maxrss_mb:.0f} {result['total_replacements']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--run", nargs=4, metavar=("MODE", "ENGINE", "INPUT", "OUTPUT"))
+    args = parser.parse_args()
+
+    if args.run:
+        mode, docx_engine, input_path, output_path = args.run
+        runner = run_processor if mode == "processor" else run_engine
+        runner(docx_engine, Path(input_path), Path(output_path))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        input_path = workdir / "contrat.docx"
+        build_docx(input_path, args.pages, args.seed)
+        size_mb = input_path.stat().st_size / 2**20
+        print(f"DOCX : {args.pages} pages, {size_mb:.1f} Mio")
+
+        outputs = {}
+        for mode, unit in (("processor", "blocs"), ("engine", "remplacements")):
+            for docx_engine in DOCX_ENGINES:
+                output_path = workdir / f"{mode}_{docx_engine}.docx"
+                stdout = subprocess.run(
+                    [sys.executable, __file__, "--run", mode, docx_engine]
+                    + [str(input_path), str(output_path)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                seconds, maxrss, count = stdout.split()[-3:]
+                print(
+                    f"{mode:<9} {docx_engine:<12}: {float(seconds):.2f} s, "
+                    f"pic RSS {maxrss} Mio, {count} {unit}"
+                )
+                if mode == "engine":
+                    outputs[docx_engine] = output_path
+
+        # Ordre des blocs propre à chaque moteur : on compare les paragraphes,
+        # numéros de code masqués.
+        paragraphs = {
+            docx_engine: sorted(
+                CODE_NUMBER.sub(r"\1\2", text)
+                for text in DocxProcessor().extract_blocks(
+                    path, docx_engine="python-docx"
+                )
+            )
+            for docx_engine, path in outputs.items()
+        }
+        assert paragraphs["ooxml"] == paragraphs["python-docx"], "Sorties différentes"
+
+
+if __name__ == "__main__":
+    main()
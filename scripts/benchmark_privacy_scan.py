@@ -0,0 +1,146 @@
+"""Benchmark du scanner anti-fuite sur un document et sur des cellules.
+
+Compare l'ancien scanner (parcours complet de chaque bloc final par toutes
+les regex, puis un ``re.finditer`` par valeur de remplacement et par bloc) au
+scanner actuel (candidats calculés une fois par texte source distinct, seules
+les zones remplacées revérifiées, valeurs ignorées dans un automate
+d'Aho-Corasick) et vérifie que les avertissements sont identiques.
+
+Usage : python scripts/benchmark_privacy_scan.py --cells 20000 --values 500
+"""
+
+import argparse
+import random
+import re
+import time
+
+from anonyfiles_core.anonymizer import privacy_warning_scanner as scanner
+from anonyfiles_core.anonymizer.span_index import SpanIndex
+
+ENABLED = {"PER", "ORG", "MISC", "EMAIL", "PHONE", "IBAN", "ADDRESS"}
+SENTENCES = [
+    "Jean Dupont habite 12 rue de la Paix, 75002 Paris.",
+    "Contact : jean.dupont@example.com ou 06 12 34 56 78.",
+    "Le dossier ACME transmis par Marie est clos.",
+    "Réunion reportée au lendemain, sans autre précision.",
+    "IBAN FR76 3000 6000 0112 3456 7890 189 à vérifier.",
+]
+
+
+def legacy_scan(
+    blocks: list[str],
+    ignored_values: list[str],
+    placeholder_spans: list[list[tuple[int, int]]],
+) -> list[dict[str, object]]:
+    """Ancien scanner : toutes les regex sur tout le texte final."""
+    collector: dict = {}
+    for block_text, known_spans in zip(blocks, placeholder_spans, strict=True):
+        mask = SpanIndex(known_spans)
+        for value in ignored_values:
+            for match in re.finditer(re.escape(value), block_text):
+                mask.add(match.start(), match.end())
+        for candidate_pass in scanner._CANDIDATE_PASSES:
+            if not candidate_pass.labels & ENABLED:
+                continue
+            for match in candidate_pass.pattern.finditer(block_text):
+                value = match.group(candidate_pass.group)
+                span = match.span(candidate_pass.group)
+                if mask.overlaps(*span):
+                    continue
+                if candidate_pass.accept is None or candidate_pass.accept(value):
+                    scanner._add_warning(collector, candidate_pass.kind, value, span)
+    return [
+        {"kind": kind, "count": warning["count"], "examples": warning["examples"]}
+        for kind, warning in sorted(collector.items())
+    ]
+
+
+def summary(warnings: list[dict[str, object]]) -> list[dict[str, object]]:
+    return sorted(
+        (
+            {"kind": w["kind"], "count": w["count"], "examples": w["examples"]}
+            for w in warnings
+        ),
+        key=lambda warning: str(warning["kind"]),
+    )
+
+
+def replace_names(
+    text: str, names: dict[str, str]
+) -> tuple[str, list[tuple[int, int]], list[tuple[int, int, int]]]:
+    """Remplace chaque nom connu ; renvoie texte final, spans finaux et sources."""
+    pattern = re.compile("|".join(map(re.escape, sorted(names, key=len, reverse=True))))
+    output: list[str] = []
+    final_spans: list[tuple[int, int]] = []
+    source_spans: list[tuple[int, int, int]] = []
+    cursor = length = 0
+    for match in pattern.finditer(text):
+        before = text[cursor : match.start()]
+        output.append(before)
+        length += len(before)
+        replacement = names[match.group(0)]
+        output.append(replacement)
+        final_spans.append((length, length + len(replacement)))
+        source_spans.append((match.start(), match.end(), len(replacement)))
+        length += len(replacement)
+        cursor = match.end()
+    output.append(text[cursor:])
+    return "".join(output), final_spans, source_spans
+
+
+def run(label: str, sources: list[str], names: dict[str, str]) -> None:
+    finals, final_spans, source_spans = [], [], []
+    for source in sources:
+        final, spans, replaced = replace_names(source, names)
+        finals.append(final)
+        final_spans.append(spans)
+        source_spans.append(replaced)
+    ignored = list(names.values())
+
+    started = time.perf_counter()
+    legacy = legacy_scan(finals, ignored, final_spans)
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    current = scanner.scan_blocks_for_privacy_warnings(
+        finals,
+        enabled_labels=ENABLED,
+        ignored_values=ignored,
+        placeholder_spans=final_spans,
+        source_blocks=sources,
+        replaced_spans=source_spans,
+    )
+    current_seconds = time.perf_counter() - started
+
+    assert summary(current) == legacy, "Avertissements différents"
+    print(f"{label:<22}: ancien {legacy_seconds:.2f} s, actuel {current_seconds:.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cells", type=int, default=20_000)
+    parser.add_argument("--lines", type=int, default=5_000)
+    parser.add_argument("--values", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = {"Jean Dupont": "NOM_0001", "Marie": "PRENOM_0001", "ACME": "ORG_0001"}
+    for index in range(args.values):
+        names[f"Client{index:05d}"] = f"CLIENT_{index:05d}"
+
+    document = "\n".join(
+        f"{rng.choice(SENTENCES)} Client{rng.randrange(args.values):05d}."
+        for _ in range(args.lines)
+    )
+    run("Document (1 bloc)", [document], names)
+
+    cells = [
+        rng.choice(SENTENCES) if rng.random() < 0.5 else f"{rng.randint(0, 9999)} €"
+        for _ in range(args.cells)
+    ]
+    run("Cellules", cells, names)
+
+
+if __name__ == "__main__":
+    main()
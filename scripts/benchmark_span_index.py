@@ -0,0 +1,68 @@
+"""Micro-benchmark des tests de chevauchement : parcours linéaire vs SpanIndex.
+
+Simule le mode strict sur un bloc long : chaque span candidat est testé contre
+les spans déjà retenus puis ajouté s'il ne chevauche rien.
+
+Usage : python scripts/benchmark_span_index.py --spans 10000
+"""
+
+import argparse
+import random
+import time
+
+from anonyfiles_core.anonymizer.span_index import SpanIndex
+
+
+def build_candidates(count: int, seed: int) -> list[tuple[int, int]]:
+    rng = random.Random(seed)
+    candidates = []
+    for _ in range(count):
+        start = rng.randint(0, count * 20)
+        candidates.append((start, start + rng.randint(3, 30)))
+    return candidates
+
+
+def linear(candidates: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    kept: list[tuple[int, int]] = []
+    for start, end in candidates:
+        if any(start < kept_end and end > kept_start for kept_start, kept_end in kept):
+            continue
+        kept.append((start, end))
+    return kept
+
+
+def indexed(candidates: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    kept: list[tuple[int, int]] = []
+    occupied = SpanIndex()
+    for start, end in candidates:
+        if occupied.overlaps(start, end):
+            continue
+        kept.append((start, end))
+        occupied.add(start, end)
+    return kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--spans", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'spans':>8} {'linéaire':>10} {'SpanIndex':>10}")
+    for count in (args.spans // 10, args.spans // 2, args.spans):
+        candidates = build_candidates(count, args.seed)
+
+        started = time.perf_counter()
+        expected = linear(candidates)
+        linear_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = indexed(candidates)
+        indexed_seconds = time.perf_counter() - started
+
+        assert result == expected
+        print(f"{count:>8} {linear_seconds:>9.3f}s {indexed_seconds:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
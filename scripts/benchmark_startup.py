@@ -0,0 +1,60 @@
+"""Benchmark du démarrage : lexique de prénoms précompilé vs construit par Faker.
+
+Chaque mesure est faite dans un interpréteur neuf (import à froid, cache
+``__pycache__`` chaud) et la médiane de ``--runs`` exécutions est reportée.
+« Import engine + Faker » reproduit l'ancien démarrage, où ``ner_processor``
+et ``replacer`` importaient Faker dès le chargement du moteur.
+
+Usage : python scripts/benchmark_startup.py --runs 7
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    "Lexique (artefact)": (
+        "from anonyfiles_core.anonymizer.first_name_lexicon import "
+        "french_first_names as load"
+    ),
+    "Lexique (Faker)": (
+        "from anonyfiles_core.anonymizer.first_name_lexicon import "
+        "build_french_first_names as load"
+    ),
+}
+IMPORT_SCENARIOS = {
+    "Import engine": "import anonyfiles_core.anonymizer.engine",
+    "Import engine + Faker": (
+        "import faker.providers.person.fr_FR, faker; "
+        "import anonyfiles_core.anonymizer.engine"
+    ),
+}
+
+
+def measure(setup: str, statement: str) -> float:
+    code = (
+        f"{setup}\nimport time\nstarted = time.perf_counter()\n{statement}\n"
+        "print(time.perf_counter() - started)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    for name, setup in SCENARIOS.items():
+        timings = [measure(setup, "load()") for _ in range(args.runs)]
+        print(f"{name:<24}: {statistics.median(timings) * 1000:8.2f} ms")
+    for name, statement in IMPORT_SCENARIOS.items():
+        timings = [measure("", statement) for _ in range(args.runs)]
+        print(f"{name:<24}: {statistics.median(timings) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark des regex intégrées face à des entrées adverses (ReDoS).
+
+Chaque regex du mode strict (``ner_processor.py``), du détecteur regex et du
+scanner anti-fuite est exécutée (``finditer`` complet) sur des entrées
+construites pour maximiser le backtracking : longues suites de caractères
+presque valides, sans le terminateur attendu. La taille est doublée deux fois
+et l'exposant de croissance ``log2(t(4n) / t(2n))`` est reporté : ~1 pour un
+coût linéaire, ~2 pour un coût quadratique. Le filtrage statique appliqué aux
+règles personnalisées (``regex_safety.has_nested_quantifiers``) est aussi
+évalué sur chaque motif.
+
+Usage : python scripts/benchmark_strict_regex.py --size 20000
+"""
+
+import argparse
+import math
+import re
+import time
+from collections.abc import Callable
+
+from anonyfiles_core.anonymizer import ner_processor, privacy_warning_scanner
+from anonyfiles_core.anonymizer.regex_safety import has_nested_quantifiers
+
+ADVERSARIAL_INPUTS: dict[str, Callable[[int], str]] = {
+    "mot long": lambda n: "a" * n + "!",
+    "majuscules": lambda n: "A" * n + "!",
+    "mots pointés": lambda n: "a." * (n // 2) + "!",
+    "email sans TLD": lambda n: "x@" + "a." * (n // 2) + "!",
+    "email obfusqué": lambda n: "x [at] " + "a " * (n // 2) + "!",
+    "adresse sans fin": lambda n: "12 rue " + "Ab " * (n // 3) + "!",
+    "chiffres": lambda n: "0" + "1" * n + "a",
+    "chiffres espacés": lambda n: "06 " + "12 " * (n // 3) + "a",
+    "espaces": lambda n: " " * n + "!",
+    "tirets": lambda n: "A" + "-" * n + "!",
+    "clé contexte": lambda n: "nom: " + "x" * n,
+    "crochets": lambda n: "[" * n + "A",
+    "accolades": lambda n: "{{" * (n // 2) + "A",
+}
+
+
+def builtin_patterns() -> dict[str, re.Pattern[str]]:
+    patterns: dict[str, re.Pattern[str]] = {}
+    for module in (ner_processor, privacy_warning_scanner):
+        for name in sorted(vars(module)):
+            value = getattr(module, name)
+            if isinstance(value, re.Pattern):
+                patterns[f"{module.__name__.rsplit('.', 1)[-1]}.{name}"] = value
+    for label, source in ner_processor._REGEX_SOURCES.items():
+        patterns[f"RegexEntityDetector.{label}"] = re.compile(
+            source, ner_processor._REGEX_FLAGS.get(label, 0)
+        )
+    return patterns
+
+
+def run_time(pattern: re.Pattern[str], text: str) -> float:
+    started = time.perf_counter()
+    for _match in pattern.finditer(text):
+        pass
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    sizes = (args.size, args.size * 2, args.size * 4)
+    print(
+        f"{'Regex':<52} {'Pire entrée':<18} "
+        + " ".join(f"{f'n={size:,}':>12}" for size in sizes)
+        + f" {'Exposant':>9} {'Imbriqués':>10}"
+    )
+    for name, pattern in builtin_patterns().items():
+        worst_input = ""
+        worst_timings: list[float] = []
+        for input_name, build in ADVERSARIAL_INPUTS.items():
+            timings = [run_time(pattern, build(size)) for size in sizes]
+            if not worst_timings or timings[-1] > worst_timings[-1]:
+                worst_input, worst_timings = input_name, timings
+        exponent = math.log2(max(worst_timings[2], 1e-9) / max(worst_timings[1], 1e-9))
+        nested = has_nested_quantifiers(pattern.pattern, pattern.flags)
+        print(
+            f"{name:<52} {worst_input:<18} "
+            + " ".join(f"{timing * 1000:>10.1f}ms" for timing in worst_timings)
+            + f" {exponent:>9.2f} {'oui' if nested else 'non':>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
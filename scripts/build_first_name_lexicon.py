@@ -0,0 +1,39 @@
+"""Régénère l'artefact du lexique de prénoms depuis Faker.
+
+À relancer après une mise à jour de Faker ou de
+``EXTRA_FRENCH_FIRST_NAMES`` ; ``--check`` échoue si l'artefact livré n'est
+plus à jour (utilisable en CI).
+
+Usage : python scripts/build_first_name_lexicon.py [--check]
+"""
+
+import argparse
+import sys
+
+from anonyfiles_core.anonymizer.first_name_lexicon import (
+    LEXICON_PATH,
+    build_french_first_names,
+    format_lexicon,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    content = format_lexicon(build_french_first_names())
+    if args.check:
+        current = LEXICON_PATH.read_text(encoding="utf-8")
+        if current != content:
+            sys.exit(f"{LEXICON_PATH} n'est pas à jour : relancer ce script.")
+        print(f"{LEXICON_PATH} est à jour.")
+        return
+
+    LEXICON_PATH.parent.mkdir(parents=True, exist_ok=True)
+    LEXICON_PATH.write_text(content, encoding="utf-8")
+    print(f"{LEXICON_PATH} : {content.count(chr(10)) - 1} prénoms.")
+
+
+if __name__ == "__main__":
+    main()
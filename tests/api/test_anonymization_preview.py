@@ -46,7 +46,13 @@ def test_anonymize_preview_returns_detected_entities(monkeypatch):
         "/anonymize_preview/",
         files={"file": ("input.txt", b"Jean Dupont vit a Paris.")},
         data={
-            "config_options": json.dumps({"anonymizePersons": True, "strictMode": True})
+            "config_options": json.dumps(
+                {
+                    "anonymizePersons": True,
+                    "strictMode": True,
+                    "anonymizeColumns": ["email", 3],
+                }
+            )
         },
     )
 
@@ -58,6 +64,8 @@ def test_anonymize_preview_returns_detected_entities(monkeypatch):
     assert captured["anonymize_kwargs"]["dry_run"] is True
     assert captured["anonymize_kwargs"]["output_path"] is None
     assert captured["kwargs"]["strict_mode"] is True
+    assert captured["kwargs"]["anonymize_columns"] == ["email", 3]
+    assert captured["kwargs"]["anonymize_json_paths"] is None
 
 
 def test_entity_decisions_are_parsed_for_engine_options():
@@ -96,3 +104,27 @@ def test_entity_decisions_reject_invalid_labels():
         _parse_entity_decisions(
             json.dumps([{"text": "Jean Dupont", "label": "UNKNOWN"}])
         )
+
+
+def test_anonymize_preview_rejects_nested_quantifier_rules():
+    from anonyfiles_api.api import app
+
+    app.state.BASE_CONFIG = {"spacy_model": "fake_model"}
+
+    client = TestClient(app)
+    response = client.post(
+        "/anonymize_preview/",
+        files={"file": ("input.txt", b"aaaa")},
+        data={
+            "config_options": "{}",
+            "custom_replacement_rules": json.dumps(
+                [
+                    {"pattern": "ACME", "replacement": "[ORG]"},
+                    {"pattern": r"(\w+\s?)+$", "replacement": "[X]", "isRegex": True},
+                ]
+            ),
+        },
+    )
+
+    assert response.status_code == 400
+    assert "index 1" in response.json()["detail"]
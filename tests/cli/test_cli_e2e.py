@@ -30,6 +30,9 @@ class DummyModel:
     def __call__(self, text):
         return SimpleNamespace(ents=[])
 
+    def pipe(self, texts, batch_size=None):
+        return (self(text) for text in texts)
+
 
 def _fake_spacy(load):
     """Faux module ``spacy`` complet (``util.is_package`` + ``load``)."""
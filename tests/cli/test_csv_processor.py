@@ -5,6 +5,7 @@ import csv
 import tempfile
 from pathlib import Path
 
+from anonyfiles_core.anonymizer.column_selection import ColumnSelectionError
 from anonyfiles_core.anonymizer.csv_processor import CsvProcessor
 
 
@@ -58,3 +59,86 @@ def test_reconstruct_and_write_anonymized_file_csv():
         assert "VILLE_Y" in content
         assert "NAME003" in content
         assert "CITY_X" in content
+
+
+def test_extract_sparse_blocks_csv_skips_empty_cells(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("nom,ville,note\nAlice,,\n,,Lyon\n", encoding="utf-8")
+    processor = CsvProcessor()
+
+    blocks = processor.extract_sparse_blocks(input_path, has_header=True)
+
+    assert blocks == ["Alice", "Lyon"]
+    assert processor.sparse_block_ids == [0, 5]
+    assert processor.block_count == 6
+    assert processor.block_columns == ["nom", "note"]
+
+    output_path = tmp_path / "output.csv"
+    processor.reconstruct_and_write_anonymized_file(
+        output_path, ["PER_1", "LOC_1"], input_path, has_header=True
+    )
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "nom,ville,note",
+        "PER_1,,",
+        ",,LOC_1",
+    ]
+
+
+def test_iter_row_chunks_keeps_header_and_skips_empty_cells(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("nom,ville\nAlice,\n,Lyon\nBob,Paris\n", encoding="utf-8")
+    processor = CsvProcessor()
+
+    chunks = list(processor.iter_row_chunks(input_path, 2, has_header=True))
+
+    assert [chunk.blocks for chunk in chunks] == [["Alice", "Lyon"], ["Bob", "Paris"]]
+    assert chunks[0].block_columns == ["nom", "ville"]
+    assert [chunk.cell_count for chunk in chunks] == [4, 2]
+
+    output_path = tmp_path / "output.csv"
+    with processor.open_row_writer(output_path) as write_rows:
+        write_rows(chunks[0].filled_rows(["PER_1", "LOC_1"]))
+        write_rows(chunks[1].filled_rows(["PER_2", "LOC_2"]))
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "nom,ville",
+        "PER_1,",
+        ",LOC_1",
+        "PER_2,LOC_2",
+    ]
+
+
+def test_column_selection_copies_unselected_columns(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text(
+        "id,email,note\n1,a@x.com,RAS\n2,,b@y.com\n", encoding="utf-8"
+    )
+    output_path = tmp_path / "output.csv"
+    processor = CsvProcessor()
+
+    blocks = processor.extract_sparse_blocks(
+        input_path, has_header=True, columns=["email", 1]
+    )
+
+    assert blocks == ["1", "a@x.com", "2"]
+    assert processor.block_columns == ["id", "email", "id"]
+    processor.reconstruct_and_write_anonymized_file(
+        output_path, ["ID_1", "EMAIL_1", "ID_2"], input_path, has_header=True
+    )
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "id,email,note",
+        "ID_1,EMAIL_1,RAS",
+        "ID_2,,b@y.com",
+    ]
+
+    chunks = list(
+        processor.iter_row_chunks(input_path, 1, has_header=True, columns=["#2"])
+    )
+    assert [chunk.blocks for chunk in chunks] == [["a@x.com"], []]
+
+
+def test_column_selection_rejects_unknown_column(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("id,email\n1,a@x.com\n", encoding="utf-8")
+
+    with pytest.raises(ColumnSelectionError, match="mail"):
+        CsvProcessor().extract_blocks(input_path, has_header=True, columns=["mail"])
@@ -2,6 +2,7 @@ import pytest
 
 Document = pytest.importorskip("docx").Document
 import tempfile
+import zipfile
 from pathlib import Path
 
 from anonyfiles_core.anonymizer.word_processor import DocxProcessor
@@ -140,3 +141,132 @@ def test_reconstruct_and_write_anonymized_file_docx_mismatch():
             [],
             Path(tmp_in.name),
         )
+
+
+@pytest.mark.parametrize("docx_engine", ["ooxml", "python-docx"])
+def test_docx_engines_roundtrip_tables(docx_engine):
+    tmp_in = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    tmp_out = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    doc = Document()
+    doc.add_paragraph("Contrat de Jean Dupont")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Client : Jean Dupont"
+    table.cell(0, 1).add_table(rows=1, cols=1).cell(0, 0).text = "Paris"
+    doc.save(tmp_in.name)
+
+    processor = DocxProcessor()
+    blocks = processor.extract_blocks(tmp_in.name, docx_engine=docx_engine)
+    final_blocks = [
+        b.replace("Jean Dupont", "{{PER_1}}").replace("Paris", "{{LOC_1}}")
+        for b in blocks
+    ]
+    processor.reconstruct_and_write_anonymized_file(
+        Path(tmp_out.name), final_blocks, Path(tmp_in.name)
+    )
+
+    again = DocxProcessor().extract_blocks(tmp_out.name, docx_engine=docx_engine)
+    assert again == final_blocks
+    assert any("{{LOC_1}}" in b for b in again)
+
+
+def test_ooxml_rewrites_only_changed_text_parts():
+    tmp_in = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    tmp_out = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    doc = Document()
+    doc.add_paragraph("Inchangé")
+    doc.add_paragraph("Pierre & <Marie>")
+    doc.sections[0].header.paragraphs[0].text = "En-tête sans nom"
+    doc.save(tmp_in.name)
+
+    processor = DocxProcessor()
+    blocks = processor.extract_blocks(tmp_in.name)
+    final_blocks = [b.replace("Pierre", "PER_1") for b in blocks]
+    processor.reconstruct_and_write_anonymized_file(
+        Path(tmp_out.name), final_blocks, Path(tmp_in.name)
+    )
+
+    with (
+        zipfile.ZipFile(tmp_in.name) as source,
+        zipfile.ZipFile(tmp_out.name) as result,
+    ):
+        assert result.namelist() == source.namelist()
+        changed = [
+            name for name in source.namelist() if source.read(name) != result.read(name)
+        ]
+        document_xml = result.read("word/document.xml")
+    assert changed == ["word/document.xml"]
+    assert b"PER_1 &amp; &lt;Marie&gt;" in document_xml
+    assert Document(tmp_out.name).paragraphs[1].text == "PER_1 & <Marie>"
+
+
+def test_ooxml_keeps_tabs_breaks_and_run_formatting():
+    tmp_in = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    tmp_out = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    doc = Document()
+    p = doc.add_paragraph()
+    p.add_run("Jean ").bold = True
+    p.add_run("Dupont").italic = True
+    p.add_run("\tà Lyon")
+    run = p.add_run("Adresse")
+    run.add_break()
+    run.add_text("12 rue Victor")
+    doc.save(tmp_in.name)
+
+    processor = DocxProcessor()
+    blocks = processor.extract_blocks(tmp_in.name)
+    assert blocks == ["Jean Dupont\tà LyonAdresse\n12 rue Victor"]
+    final_blocks = [
+        blocks[0].replace("Jean Dupont", "PER_1").replace("Adresse\n12", "ADR_1")
+    ]
+    processor.reconstruct_and_write_anonymized_file(
+        Path(tmp_out.name), final_blocks, Path(tmp_in.name)
+    )
+
+    assert DocxProcessor().extract_blocks(tmp_out.name) == final_blocks
+    runs = Document(tmp_out.name).paragraphs[0].runs
+    assert runs[0].text == "PER_1"
+    assert runs[0].bold
+    assert runs[2].text == "\tà Lyon"
+
+
+def test_ooxml_text_box_paragraphs_are_blocks():
+    tmp_in = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    tmp_box = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    tmp_out = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    doc = Document()
+    doc.add_paragraph("Corps")
+    doc.save(tmp_in.name)
+
+    # Zone de texte : paragraphe imbriqué dans un run du paragraphe englobant.
+    text_box = (
+        "<w:p><w:r><w:t>Avant </w:t></w:r><w:r><w:pict>"
+        '<v:shape xmlns:v="urn:schemas-microsoft-com:vml"><v:textbox>'
+        "<w:txbxContent><w:p><w:r><w:t>Boîte Jean</w:t></w:r></w:p>"
+        "</w:txbxContent></v:textbox></v:shape></w:pict></w:r>"
+        '<w:r><w:t xml:space="preserve"> après Jean</w:t></w:r></w:p>'
+    )
+    with (
+        zipfile.ZipFile(tmp_in.name) as source,
+        zipfile.ZipFile(tmp_box.name, "w", zipfile.ZIP_DEFLATED) as target,
+    ):
+        for info in source.infolist():
+            data = source.read(info)
+            if info.filename == "word/document.xml":
+                data = data.replace(b"<w:sectPr", text_box.encode() + b"<w:sectPr", 1)
+            target.writestr(info, data)
+
+    processor = DocxProcessor()
+    blocks = processor.extract_blocks(tmp_box.name)
+    assert blocks == ["Corps", "Avant  après Jean", "Boîte Jean"]
+    final_blocks = [b.replace("Jean", "PER_1") for b in blocks]
+    processor.reconstruct_and_write_anonymized_file(
+        Path(tmp_out.name), final_blocks, Path(tmp_box.name)
+    )
+    assert DocxProcessor().extract_blocks(tmp_out.name) == final_blocks
+
+
+def test_extract_blocks_unknown_docx_engine():
+    tmp = tempfile.NamedTemporaryFile("w+b", delete=False, suffix=".docx")
+    Document().save(tmp.name)
+    with pytest.raises(ValueError, match="docx_engine"):
+        DocxProcessor().extract_blocks(tmp.name, docx_engine="lxml")
@@ -48,3 +48,98 @@ def test_reconstruct_and_write_anonymized_file_excel_mismatch():
             [],
             Path(tmp_in.name),
         )
+
+
+def test_extract_sparse_blocks_excel_skips_empty_cells(tmp_path):
+    input_path = tmp_path / "input.xlsx"
+    output_path = tmp_path / "output.xlsx"
+    df = pd.DataFrame({"A": ["Alice", None, None], "B": [None, None, "Paris"]})
+    df.to_excel(input_path, index=False)
+    processor = ExcelProcessor()
+
+    blocks = processor.extract_sparse_blocks(input_path)
+
+    assert blocks == ["A", "B", "Alice", "Paris"]
+    assert processor.sparse_block_ids == [0, 1, 2, 7]
+    assert processor.block_count == 8
+    assert processor.block_columns == ["Sheet1!A", "Sheet1!B", "Sheet1!A", "Sheet1!B"]
+
+    processor.reconstruct_and_write_anonymized_file(
+        output_path, ["A", "B", "NOM004", "VILLE_W"], input_path
+    )
+    result = pd.read_excel(output_path, dtype=str)
+    assert result["A"].tolist()[0] == "NOM004"
+    assert result["B"].tolist()[2] == "VILLE_W"
+    assert result.isna().sum().sum() == 4
+
+
+def test_column_selection_excel_keeps_other_columns(tmp_path):
+    input_path = tmp_path / "input.xlsx"
+    output_path = tmp_path / "output.xlsx"
+    with pd.ExcelWriter(input_path) as writer:
+        pd.DataFrame([["nom", "email"], ["Alice", "a@x.com"]]).to_excel(
+            writer, sheet_name="Clients", header=False, index=False
+        )
+        pd.DataFrame([["Bob", "b@x.com"]]).to_excel(
+            writer, sheet_name="Notes", header=False, index=False
+        )
+    processor = ExcelProcessor()
+
+    blocks = processor.extract_sparse_blocks(input_path, columns=["email", "Notes!A"])
+
+    assert blocks == ["email", "a@x.com", "Bob"]
+    assert processor.block_columns == ["Clients!B", "Clients!B", "Notes!A"]
+    processor.reconstruct_and_write_anonymized_file(
+        output_path, ["email", "EMAIL_1", "PER_1"], input_path
+    )
+    result = pd.read_excel(output_path, sheet_name=None, header=None, dtype=str)
+    assert result["Clients"].values.tolist() == [
+        ["nom", "email"],
+        ["Alice", "EMAIL_1"],
+    ]
+    assert result["Notes"].values.tolist() == [["PER_1", "b@x.com"]]
+
+
+def test_row_chunks_keep_typed_cells_and_sheet_order(tmp_path):
+    from openpyxl import Workbook, load_workbook
+
+    input_path = tmp_path / "input.xlsx"
+    output_path = tmp_path / "output.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Clients"
+    sheet.append(["nom", "montant", "total"])
+    sheet.append(["Alice", 12.5, "=B2*2"])
+    sheet["B2"].number_format = "0.00"
+    workbook.create_sheet("Vide")
+    workbook.create_sheet("Notes").append(["=texte"])
+    workbook["Notes"]["A1"].data_type = "s"
+    workbook.save(input_path)
+    processor = ExcelProcessor()
+
+    chunks = list(processor.iter_row_chunks(input_path, 1))
+
+    assert [chunk.sheet for chunk in chunks] == ["Clients", "Clients", "Vide", "Notes"]
+    assert [chunk.blocks for chunk in chunks] == [
+        ["nom", "montant", "total"],
+        ["Alice"],
+        [],
+        ["=texte"],
+    ]
+    assert chunks[1].block_columns == ["Clients!A"]
+    assert chunks[1].cell_count == 3
+
+    with processor.open_row_writer(output_path) as write_rows:
+        for chunk in chunks:
+            write_rows(
+                chunk.filled_rows([b.upper() for b in chunk.blocks]), chunk.sheet
+            )
+    result = load_workbook(output_path)
+    assert result.sheetnames == ["Clients", "Vide", "Notes"]
+    row = [(cell.value, cell.data_type) for cell in result["Clients"][2]]
+    assert row == [("ALICE", "s"), (12.5, "n"), ("=B2*2", "f")]
+    assert result["Clients"]["B2"].number_format == "0.00"
+    assert (result["Notes"]["A1"].value, result["Notes"]["A1"].data_type) == (
+        "=TEXTE",
+        "s",
+    )
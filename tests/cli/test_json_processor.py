@@ -5,6 +5,7 @@ import json
 import tempfile
 from pathlib import Path
 
+from anonyfiles_core.anonymizer.column_selection import ColumnSelectionError
 from anonyfiles_core.anonymizer.json_processor import JsonProcessor
 
 
@@ -68,3 +69,36 @@ def test_reconstruct_and_write_anonymized_file_json():
         # keys should remain unchanged by default
         assert "name" in result_json
         assert "contact" in result_json
+
+
+def test_json_paths_select_matching_subtrees(tmp_path):
+    input_path = tmp_path / "input.json"
+    output_path = tmp_path / "output.json"
+    input_path.write_text(_nested_sample(), encoding="utf-8")
+    processor = JsonProcessor()
+
+    blocks = processor.extract_blocks(
+        input_path, json_paths=["contact.phones", "pets.*.name"]
+    )
+
+    assert blocks == ["123", "456", "Rex"]
+    processor.reconstruct_and_write_anonymized_file(
+        output_path, ["TEL1", "TEL2", "PET1"], input_path
+    )
+    result = json.loads(output_path.read_text(encoding="utf-8"))
+    assert result["name"] == "Jean Dupont"
+    assert result["contact"] == {
+        "email": "jean.dupont@example.com",
+        "phones": ["TEL1", "TEL2"],
+    }
+    assert result["pets"] == [{"type": "dog", "name": "PET1"}, "goldfish"]
+
+
+def test_json_path_without_match_raises(tmp_path):
+    input_path = tmp_path / "input.json"
+    input_path.write_text(_nested_sample(), encoding="utf-8")
+
+    with pytest.raises(ColumnSelectionError, match=r"pets\.\*\.nom"):
+        JsonProcessor().extract_blocks(
+            input_path, json_paths=["pets.*.name", "pets.*.nom"]
+        )
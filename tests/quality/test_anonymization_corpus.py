@@ -120,3 +120,40 @@ def test_quality_anonymization_corpus(case, tmp_path):
         assert rows_by_original[original]["source"] == "custom_rule"
 
     assert result["total_replacements"] >= len(expectations["mapping_originals"])
+
+
+@pytest.mark.parametrize(
+    "case",
+    _load_corpus_cases(),
+    ids=lambda case: case["id"],
+)
+def test_ner_gate_does_not_change_corpus_results(case, tmp_path):
+    input_path = tmp_path / f"{case['id']}.txt"
+    input_path.write_text(case["input"], encoding="utf-8")
+
+    outputs = {}
+    for gate in (False, True):
+        output_path = tmp_path / f"{case['id']}_gate_{gate}.txt"
+        try:
+            engine = AnonyfilesEngine(
+                config={**QUALITY_CONFIG, "ner_gate": gate},
+                custom_replacement_rules=case.get("custom_rules", []),
+            )
+        except ConfigurationError as exc:
+            pytest.skip(f"Modele spaCy indisponible pour le corpus qualite: {exc}")
+
+        result = engine.anonymize(
+            input_path=input_path,
+            output_path=output_path,
+            entities=None,
+            dry_run=False,
+            mapping_output_path=None,
+            log_entities_path=None,
+        )
+        assert result["status"] == "success", result.get("error")
+        outputs[gate] = (
+            output_path.read_text(encoding="utf-8"),
+            sorted(result["entities_detected"]),
+        )
+
+    assert outputs[True] == outputs[False]
@@ -0,0 +1,97 @@
+from anonyfiles_core.anonymizer.column_profiler import (
+    classify_value,
+    non_text_block_indices,
+    profile_columns,
+)
+from anonyfiles_core.anonymizer.engine import AnonyfilesEngine
+
+
+def test_profile_classifies_numeric_date_categorical_and_free_text_columns():
+    rows = [
+        ["1001", "2024-01-05T10:00:00Z", "Paris", "Client mécontent, rappeler Jean"],
+        ["1002", "2024-01-06", "Lyon", "Livraison en retard chez ACME"],
+        ["1003", "06/01/2024", "Paris", "RAS"],
+        ["1004", "2024-01-08 08:15", "Paris", "Demande de remboursement"],
+    ]
+    blocks = [cell for row in rows for cell in row]
+    columns = ["id", "created_at", "ville", "commentaire"] * len(rows)
+
+    profiles = profile_columns(blocks, columns)
+
+    assert {column: profile["kind"] for column, profile in profiles.items()} == {
+        "id": "numeric",
+        "created_at": "date",
+        "ville": "categorical",
+        "commentaire": "free_text",
+    }
+    assert profiles["id"]["cells"] == 4
+    assert non_text_block_indices(blocks, columns, profiles) == [
+        0,
+        1,
+        4,
+        5,
+        8,
+        9,
+        12,
+        13,
+    ]
+
+
+def test_atypical_cell_in_numeric_column_keeps_full_detection():
+    blocks = ["Montant", "12,50 €", "1 200", "true", "-3.5", "7", "8", "9", "10", "11"]
+    columns = ["B"] * len(blocks)
+
+    profiles = profile_columns(blocks, columns)
+
+    assert profiles["B"]["kind"] == "numeric"
+    assert classify_value("Montant") is None
+    assert 0 not in non_text_block_indices(blocks, columns, profiles)
+
+
+def test_engine_runs_only_regex_on_non_text_columns(monkeypatch, tmp_path):
+    piped_texts = []
+
+    class FakeDoc:
+        ents = []
+
+    class FakeSpaCyEngine:
+        def __init__(self, model):
+            self.model = model
+
+        def nlp_pipe(self, texts, batch_size=256):
+            for text in texts:
+                piped_texts.append(text)
+                yield FakeDoc()
+
+    monkeypatch.setattr(
+        "anonyfiles_core.anonymizer.engine.SpaCyEngine", FakeSpaCyEngine
+    )
+    input_path = tmp_path / "input.csv"
+    input_path.write_text(
+        "id,telephone,nom\n"
+        "1,0612345678,Alice\n"
+        "2,0698765432,Bob\n"
+        "3,0611223344,Alice\n"
+        "4,0622334455,Alice\n",
+        encoding="utf-8",
+    )
+
+    engine = AnonyfilesEngine(config={})
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=None,
+        entities=None,
+        dry_run=True,
+        log_entities_path=None,
+        mapping_output_path=None,
+        has_header=True,
+    )
+
+    assert piped_texts == ["Alice", "Bob"]
+    assert ("0612345678", "PHONE") in result["entities_detected"]
+    assert result["detection_stats"]["regex_only_blocks"] == 8
+    assert [(p["column"], p["kind"], p["mode"]) for p in result["column_profiles"]] == [
+        ("id", "numeric", "regex"),
+        ("telephone", "numeric", "regex"),
+        ("nom", "categorical", "ner"),
+    ]
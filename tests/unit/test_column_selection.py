@@ -0,0 +1,118 @@
+import pytest
+
+from anonyfiles_core.anonymizer.engine import AnonyfilesEngine
+
+
+class FakeDoc:
+    ents = []
+
+
+class FakeSpaCyEngine:
+    def __init__(self, model):
+        self.model = model
+
+    def nlp_pipe(self, texts, batch_size=256):
+        for _text in texts:
+            yield FakeDoc()
+
+
+@pytest.fixture(autouse=True)
+def _fake_spacy(monkeypatch):
+    monkeypatch.setattr(
+        "anonyfiles_core.anonymizer.engine.SpaCyEngine", FakeSpaCyEngine
+    )
+
+
+@pytest.mark.parametrize("stream_chunk_rows", [0, 1])
+def test_only_selected_csv_columns_are_anonymized(tmp_path, stream_chunk_rows):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text(
+        "id,email,note\n1,a@x.com,rappeler b@y.com\n2,,c@z.com\n",
+        encoding="utf-8",
+    )
+    output_path = tmp_path / "output.csv"
+    engine = AnonyfilesEngine(
+        config={"stream_chunk_rows": stream_chunk_rows}, anonymize_columns=["email"]
+    )
+
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=output_path,
+        entities=None,
+        dry_run=False,
+        log_entities_path=None,
+        mapping_output_path=None,
+        has_header=True,
+    )
+
+    assert result["status"] == "success"
+    assert output_path.read_text(encoding="utf-8").splitlines() == [
+        "id,email,note",
+        "1,{{EMAIL_001}},rappeler b@y.com",
+        "2,,c@z.com",
+    ]
+    assert [profile["column"] for profile in result["column_profiles"]] == ["email"]
+
+
+def test_unknown_column_fails_the_job(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("id,email\n1,a@x.com\n", encoding="utf-8")
+    engine = AnonyfilesEngine(config={"anonymize_columns": ["emial"]})
+
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=tmp_path / "output.csv",
+        entities=None,
+        dry_run=True,
+        log_entities_path=None,
+        mapping_output_path=None,
+        has_header=True,
+    )
+
+    assert result["status"] == "error"
+    assert "emial" in result["error"]
+
+
+def test_unmatched_json_path_fails_the_job(tmp_path):
+    input_path = tmp_path / "input.json"
+    input_path.write_text(
+        '{"clients": [{"email": "a@x.com", "note": "b@y.com"}]}', encoding="utf-8"
+    )
+    engine = AnonyfilesEngine(
+        config={}, anonymize_json_paths=["clients.*.email", "clients.*.emial"]
+    )
+
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=tmp_path / "output.json",
+        entities=None,
+        dry_run=True,
+        log_entities_path=None,
+        mapping_output_path=None,
+    )
+
+    assert result["status"] == "error"
+    assert "clients.*.emial" in result["error"]
+    assert "clients.*.email," not in result["error"]
+
+
+def test_json_paths_leave_the_rest_of_the_document(tmp_path):
+    input_path = tmp_path / "input.json"
+    input_path.write_text(
+        '{"clients": [{"email": "a@x.com", "note": "b@y.com"}]}', encoding="utf-8"
+    )
+    output_path = tmp_path / "output.json"
+    engine = AnonyfilesEngine(config={}, anonymize_json_paths=["clients.*.email"])
+
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=output_path,
+        entities=None,
+        dry_run=False,
+        log_entities_path=None,
+        mapping_output_path=None,
+    )
+
+    assert result["status"] == "success"
+    assert "a@x.com" not in output_path.read_text(encoding="utf-8")
+    assert "b@y.com" in output_path.read_text(encoding="utf-8")
@@ -0,0 +1,126 @@
+from anonyfiles_core.anonymizer.audit import AuditLogger
+from anonyfiles_core.anonymizer.custom_rules_processor import CustomRulesProcessor
+
+
+def _processor(rules):
+    return CustomRulesProcessor(rules, AuditLogger())
+
+
+def test_earlier_rules_keep_priority_on_overlapping_matches():
+    processor = _processor(
+        [
+            {"pattern": "Dupont", "replacement": "[NOM]"},
+            {"pattern": "Jean Dupont", "replacement": "[PERSONNE]"},
+            {"pattern": r"ref-\d+", "replacement": "[REF]", "isRegex": True},
+        ]
+    )
+
+    assert (
+        processor.apply_to_block("Jean Dupont, REF-12 et ref-12")
+        == "Jean [NOM_1], [REF_1] et [REF_2]"
+    )
+    assert processor.get_custom_replacements_mapping() == {
+        "Dupont": "[NOM_1]",
+        "Jean Dupont": "[PERSONNE_1]",
+        "REF-12": "[REF_1]",
+        "ref-12": "[REF_2]",
+    }
+
+
+def test_tokens_are_stable_across_blocks_and_counted_per_rule():
+    processor = _processor(
+        [
+            {"pattern": r"\bX\d\b", "replacement": "CODE", "isRegex": True},
+            {"pattern": "ACME", "replacement": "ORG"},
+        ]
+    )
+
+    blocks = [processor.apply_to_block(text) for text in ["X1", "ACME X2", "X1 ACME"]]
+
+    assert blocks == ["CODE_1", "ORG_1 CODE_2", "CODE_1 ORG_1"]
+    # Regex : un remplacement compté par texte distinct ; littéral : chaque occurrence.
+    assert processor.get_custom_replacements_count() == 4
+    assert processor.get_rule_hit_stats() == [
+        {"rule": 0, "is_regex": True, "hits": 3},
+        {"rule": 1, "is_regex": False, "hits": 2},
+    ]
+
+
+def test_regex_rule_matches_between_earlier_replacements():
+    processor = _processor(
+        [
+            {"pattern": "abb", "replacement": "<Y>"},
+            {"pattern": "b+a", "replacement": "R", "isRegex": True},
+        ]
+    )
+
+    assert processor.apply_to_block("abbbaa") == "<Y>_1R_1a"
+
+
+def test_regex_assertions_see_the_text_next_to_earlier_replacements():
+    processor = _processor(
+        [
+            {"pattern": "b", "replacement": "X"},
+            {"pattern": r"a\b", "replacement": "Y", "isRegex": True},
+        ]
+    )
+
+    # Le second « a » est suivi de « b » (remplacé par X_1) : pas de frontière.
+    assert processor.apply_to_block("a ab") == "Y_1 aX_1"
+
+
+def test_regex_match_never_spans_an_earlier_replacement():
+    processor = _processor(
+        [
+            {"pattern": "Dupont", "replacement": "[NOM]"},
+            {"pattern": r"M\. \w+ \w+", "replacement": "[CIV]", "isRegex": True},
+        ]
+    )
+
+    # « M. Jean Dupont » chevauche [NOM_1] : la recherche reprend bornée à
+    # « M. Jean », où la règle ne correspond plus.
+    assert processor.apply_to_block("M. Jean Dupont") == "M. Jean [NOM_1]"
+
+
+def test_uncombinable_regex_rules_still_apply():
+    processor = _processor(
+        [
+            {"pattern": "", "replacement": "VIDE"},
+            {"pattern": r"(\w)\1", "replacement": "DOUBLE", "isRegex": True},
+            {"pattern": r"(?P<n>\d)x", "replacement": "NX", "isRegex": True},
+        ]
+    )
+
+    assert processor.apply_to_block("allo 3x") == "aDOUBLE_1o NX_1"
+    assert [stat["rule"] for stat in processor.get_rule_hit_stats()] == [1, 2]
+
+
+def test_reset_restarts_hits_and_mapping():
+    processor = _processor([{"pattern": "ACME", "replacement": "ORG"}])
+    processor.apply_to_block("ACME")
+
+    processor.reset()
+
+    assert processor.get_custom_replacements_mapping() == {}
+    assert processor.get_rule_hit_stats()[0]["hits"] == 0
+    assert processor.apply_to_block("rien") == "rien"
+    assert "ACME" in processor.get_custom_replacements_mapping()
+
+
+def test_apply_to_block_with_spans_returns_token_positions():
+    processor = _processor(
+        [
+            {"pattern": "ACME", "replacement": "[ORG]"},
+            {"pattern": r"\d{4}", "replacement": "[NUM]", "isRegex": True},
+        ]
+    )
+
+    text, spans = processor.apply_to_block_with_spans("ACME paie 2024 à ACME")
+
+    assert text == "[ORG_1] paie [NUM_1] à [ORG_1]"
+    assert [text[start:end] for start, end in spans] == [
+        "[ORG_1]",
+        "[NUM_1]",
+        "[ORG_1]",
+    ]
+    assert processor.apply_to_block_with_spans("rien") == ("rien", [])
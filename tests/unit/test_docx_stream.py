@@ -0,0 +1,23 @@
+from anonyfiles_core.anonymizer.docx_stream import distribute_text
+
+
+def test_distribute_text_keeps_replacement_in_first_run():
+    # "Jean " | "Dupont" | " vit ici" : le remplacement prend le run de "Jean".
+    texts, removed = distribute_text(
+        "Jean Dupont vit ici", [(0, 5), (5, 11), (11, 19)], "PER_1 vit ici"
+    )
+    assert texts == ["PER_1", "", " vit ici"]
+    assert removed == set()
+
+
+def test_distribute_text_removes_replaced_separator():
+    # "Adresse" \n "12 rue" : le saut de ligne fait partie du remplacement.
+    texts, removed = distribute_text("Adresse\n12 rue", [(0, 7), (8, 14)], "ADR_1 rue")
+    assert "".join(texts) == "ADR_1 rue"
+    assert removed == {7}
+
+
+def test_distribute_text_unchanged():
+    texts, removed = distribute_text("a\tb", [(0, 1), (2, 3)], "a\tb")
+    assert texts == ["a", "b"]
+    assert removed == set()
@@ -55,6 +55,35 @@ def test_add_manual_entities_skips_overlapping_detected_spans():
     assert per_block == [[("Ambre Lenoir", "PER", 0, 12)]]
 
 
+def test_add_manual_entities_keeps_list_order_priority_for_nested_texts():
+    unique, per_block = add_manual_entities_to_detected_entities(
+        ["Jean Dupont voit Jean, puis aaaa.", "Rien ici."],
+        [[], [("Rien", "MISC", 0, 4)]],
+        manual_entities=[
+            {"text": "Jean Dupont", "label": "PER"},
+            {"text": "Jean", "label": "PER"},
+            {"text": "Dupont", "label": "MISC"},
+            {"text": "aa", "label": "MISC"},
+        ],
+    )
+
+    assert per_block == [
+        [
+            ("Jean Dupont", "PER", 0, 11),
+            ("Jean", "PER", 17, 21),
+            ("aa", "MISC", 28, 30),
+            ("aa", "MISC", 30, 32),
+        ],
+        [("Rien", "MISC", 0, 4)],
+    ]
+    assert unique == [
+        ("Jean Dupont", "PER"),
+        ("Jean", "PER"),
+        ("aa", "MISC"),
+        ("Rien", "MISC"),
+    ]
+
+
 def test_engine_manual_entities_are_replaced_when_ner_misses_them(
     monkeypatch, tmp_path
 ):
@@ -68,6 +97,9 @@ def test_engine_manual_entities_are_replaced_when_ner_misses_them(
         def nlp_doc(self, text):
             return FakeDoc()
 
+        def nlp_pipe(self, texts, batch_size=256):
+            return (FakeDoc() for _text in texts)
+
     monkeypatch.setattr(
         "anonyfiles_core.anonymizer.engine.SpaCyEngine", FakeSpaCyEngine
     )
@@ -117,6 +149,9 @@ def test_engine_strict_mode_replaces_heuristic_entities(monkeypatch, tmp_path):
         def nlp_doc(self, text):
             return FakeDoc()
 
+        def nlp_pipe(self, texts, batch_size=256):
+            return (FakeDoc() for _text in texts)
+
     monkeypatch.setattr(
         "anonyfiles_core.anonymizer.engine.SpaCyEngine", FakeSpaCyEngine
     )
@@ -167,6 +202,9 @@ def test_engine_warns_when_suspicious_values_remain_without_changes(
         def nlp_doc(self, text):
             return FakeDoc()
 
+        def nlp_pipe(self, texts, batch_size=256):
+            return (FakeDoc() for _text in texts)
+
     monkeypatch.setattr(
         "anonyfiles_core.anonymizer.engine.SpaCyEngine", FakeSpaCyEngine
     )
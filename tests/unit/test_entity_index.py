@@ -0,0 +1,62 @@
+from anonyfiles_core.anonymizer.entity_index import (
+    UNKNOWN_SPACY_LABEL,
+    EntityOccurrenceIndex,
+)
+from anonyfiles_core.anonymizer.replacement_generator import ReplacementGenerator
+from anonyfiles_core.anonymizer.span_table import SpanTable
+
+
+def test_entity_index_labels_counts_and_block_texts():
+    index = EntityOccurrenceIndex(
+        [("Paris", "LOC"), ("Paris", "ORG"), ("Jean", "PER")],
+        [
+            [("Paris", "LOC", 0, 5), ("Jean", "PER", 10, 14), ("Paris", "LOC", 20, 25)],
+            [],
+            [("Jean", "PER", 0, 4)],
+        ],
+    )
+
+    assert index.label("Paris") == "LOC"
+    assert index.label("Inconnu") == UNKNOWN_SPACY_LABEL
+    assert index.count("Paris", "LOC") == 2
+    assert index.count("Paris", "ORG") == 0
+    assert index.count("Jean", "PER") == 2
+    assert index.block_texts(0) == ["Paris", "Jean"]
+    assert index.block_texts(1) == []
+    assert index.block_texts(5) == []
+
+
+def test_entity_index_reads_block_texts_from_span_table():
+    blocks = [
+        [("Paris", "LOC", 0, 5), ("Paris", "LOC", 9, 14)],
+        [],
+        [("Jean", "PER", 0, 4)],
+    ]
+    index = EntityOccurrenceIndex([], SpanTable.from_blocks(blocks))
+
+    assert index.count("Paris", "LOC") == 2
+    assert [index.block_texts(i) for i in range(4)] == [["Paris"], [], ["Jean"], []]
+
+
+def test_generate_spacy_replacements_logs_indexed_counts():
+    class RecordingAudit:
+        def __init__(self):
+            self.calls = []
+
+        def log(self, original, code, rule, count):
+            self.calls.append((original, code, rule, count))
+
+    audit = RecordingAudit()
+    generator = ReplacementGenerator(config={}, audit_logger=audit)
+    unique = [("Jean Dupont", "PER"), ("Paris", "LOC")]
+    per_block = [
+        [("Jean Dupont", "PER", 0, 11), ("Paris", "LOC", 15, 20)],
+        [("Jean Dupont", "PER", 3, 14)],
+    ]
+
+    replacements, _mapping = generator.generate_spacy_replacements(unique, per_block)
+
+    counts = {original: count for original, _code, _rule, count in audit.calls}
+    assert set(replacements) == {"Jean Dupont", "Paris"}
+    assert counts == {"Jean Dupont": 2, "Paris": 1}
+    assert {rule for _o, _c, rule, _n in audit.calls} == {"spacy_PER", "spacy_LOC"}
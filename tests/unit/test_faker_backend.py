@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import faker.generator
+
+from anonyfiles_core.anonymizer.faker_backend import FakerBackend
+from anonyfiles_core.anonymizer.replacer import ReplacementSession
+
+
+def test_consistent_values_do_not_touch_shared_random():
+    backend = FakerBackend()
+    shared_state = faker.generator.random.getstate()
+
+    first = backend.generate("PER", seed_text="Jean Dupont")
+    backend.generate("PER")
+    second = backend.generate("PER", seed_text="Jean Dupont")
+
+    assert first == second
+    assert faker.generator.random.getstate() == shared_state
+
+
+def test_random_values_stay_unpredictable_after_consistent_value():
+    def random_after_consistent() -> list[str]:
+        backend = FakerBackend()
+        backend.generate("PER", seed_text="Jean Dupont")
+        return [backend.generate("PER") for _ in range(3)] + backend.generate_many(
+            "PER", 3
+        )
+
+    assert random_after_consistent() != random_after_consistent()
+
+
+def test_consistent_values_are_identical_across_threads():
+    backend = FakerBackend()
+    texts = [f"Entité {index}" for index in range(200)]
+    expected = [backend.generate("ORG", seed_text=text) for text in texts]
+
+    def generate(text: str) -> str:
+        backend.generate("ORG")  # tirage aléatoire intercalé dans le thread
+        return backend.generate("ORG", seed_text=text)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(generate, texts)) == expected
+
+
+def test_generate_many_and_unknown_label():
+    backend = FakerBackend()
+
+    assert len(backend.generate_many("EMAIL", 5)) == 5
+    assert backend.generate_many("MISC", 2) == ["FAKE_MISC", "FAKE_MISC"]
+    assert backend.generate("MISC", seed_text="x") == "FAKE_MISC"
+
+
+def test_session_draws_random_faker_values_from_bulk_pool():
+    session = ReplacementSession()
+    entities = [("Jean", "PER"), ("Marie", "PER"), ("Jean", "PER")]
+    rules = {"PER": {"type": "faker", "options": {"locale": "fr_FR"}}}
+
+    replacements, _mapping = session.generate_replacements(entities, rules)
+
+    assert set(replacements) == {"Jean", "Marie"}
+    assert all(value and "FAKE" not in value for value in replacements.values())
+    assert not session.faker_pools[("PER", "fr_FR")]
@@ -0,0 +1,35 @@
+from anonyfiles_core.anonymizer import first_name_lexicon
+from anonyfiles_core.anonymizer.first_name_lexicon import (
+    LEXICON_PATH,
+    build_french_first_names,
+    format_lexicon,
+    is_french_first_name,
+)
+
+
+def test_shipped_lexicon_matches_faker_build():
+    # Échoue après une mise à jour de Faker : relancer
+    # scripts/build_first_name_lexicon.py.
+    assert LEXICON_PATH.read_text(encoding="utf-8") == format_lexicon(
+        build_french_first_names()
+    )
+
+
+def test_lookup_normalizes_accents_and_case():
+    assert is_french_first_name("Amélie")
+    assert is_french_first_name("AMBRE")
+    assert not is_french_first_name("Dupont")
+
+
+def test_stale_lexicon_falls_back_to_faker(tmp_path, monkeypatch):
+    stale = tmp_path / "french_first_names.txt"
+    stale.write_text("# anonyfiles-first-names v0\nzorglub\n", encoding="utf-8")
+    monkeypatch.setattr(first_name_lexicon, "LEXICON_PATH", stale)
+    first_name_lexicon.french_first_names.cache_clear()
+    try:
+        names = first_name_lexicon.french_first_names()
+    finally:
+        first_name_lexicon.french_first_names.cache_clear()
+
+    assert "zorglub" not in names
+    assert names == build_french_first_names()
@@ -23,6 +23,37 @@ class FakeSpaCyEngine:
     def nlp_doc(self, text):
         return FakeDoc(self.entities)
 
+    def nlp_pipe(self, texts, batch_size=256):
+        return (self.nlp_doc(text) for text in texts)
+
+
+class RecordingSpaCyEngine(FakeSpaCyEngine):
+    """Mémorise les appels à ``nlp_pipe`` ; trouve chaque nom de ``names`` (PER)."""
+
+    def __init__(self, names=()):
+        super().__init__([])
+        self.names = names
+        self.pipe_calls = []
+        self.piped = []
+
+    def nlp_doc(self, text):
+        raise AssertionError("detect_entities_in_blocks doit passer par nlp_pipe")
+
+    def find_entities(self, text):
+        found = []
+        for name in self.names:
+            start = text.find(name)
+            while start != -1:
+                found.append(FakeEntity(name, "PER", start, start + len(name)))
+                start = text.find(name, start + 1)
+        return found
+
+    def nlp_pipe(self, texts, batch_size=256):
+        texts = list(texts)
+        self.pipe_calls.append((texts, batch_size))
+        self.piped.extend(texts)
+        return (FakeDoc(self.find_entities(text)) for text in texts)
+
 
 def test_per_block_offsets_align_with_empty_blocks():
     """Chaque bloc d'entrée doit produire une entrée par-bloc, même vide.
@@ -174,3 +205,175 @@ def test_strict_mode_still_respects_disabled_labels():
     assert ("ambre [at] exemple [dot] fr", "EMAIL") in unique
     assert ("Pierre", "PER") not in unique
     assert ("KMCL", "ORG") not in unique
+
+
+def test_non_empty_blocks_go_through_a_single_batched_pipe_call():
+    engine = RecordingSpaCyEngine()
+    processor = NERProcessor(
+        engine,
+        enabled_labels={"EMAIL"},
+        excluded_labels=set(),
+        batch_size=2,
+        gate=False,
+    )
+
+    blocks = ["a@example.com", "", "rien", "  ", "b@example.com"]
+    unique, per_block = processor.detect_entities_in_blocks(blocks)
+
+    assert engine.pipe_calls == [(["a@example.com", "rien", "b@example.com"], 2)]
+    assert per_block == [
+        [("a@example.com", "EMAIL", 0, 13)],
+        [],
+        [],
+        [],
+        [("b@example.com", "EMAIL", 0, 13)],
+    ]
+    assert unique == [("a@example.com", "EMAIL"), ("b@example.com", "EMAIL")]
+
+
+def test_oversized_block_is_windowed_without_boundary_duplicates():
+    lines = [
+        f"Ligne {index} : Jean Dupont écrit à user{index}@example.com"
+        for index in range(60)
+    ]
+    text = "\n".join(lines) + "\n"
+
+    reference_engine = RecordingSpaCyEngine(names=("Jean Dupont",))
+    reference = NERProcessor(
+        reference_engine, enabled_labels={"PER", "EMAIL"}, excluded_labels=set()
+    )
+    _unique, expected = reference.detect_entities_in_blocks([text])
+
+    windowed_engine = RecordingSpaCyEngine(names=("Jean Dupont",))
+    windowed = NERProcessor(
+        windowed_engine,
+        enabled_labels={"PER", "EMAIL"},
+        excluded_labels=set(),
+        window_size=400,
+        window_overlap=50,
+    )
+    _unique, per_block = windowed.detect_entities_in_blocks([text])
+
+    assert per_block == expected
+    assert len(per_block[0]) == 120
+    assert windowed.stats["windowed_blocks"] == 1
+    assert windowed.stats["windows"] > 1
+    assert max(len(text) for text in windowed_engine.piped) <= 400 + 2 * 50
+
+
+def test_repeated_blocks_reuse_memoized_spans():
+    engine = RecordingSpaCyEngine()
+    processor = NERProcessor(
+        engine,
+        enabled_labels={"EMAIL"},
+        excluded_labels=set(),
+        memo_size=2,
+        gate=False,
+    )
+
+    blocks = ["a@example.com", "Paris", "a@example.com", "Paris", "Lyon"]
+    _unique, per_block = processor.detect_entities_in_blocks(blocks)
+
+    assert engine.piped == ["a@example.com", "Paris", "Lyon"]
+    assert per_block[0] == per_block[2] == [("a@example.com", "EMAIL", 0, 13)]
+    assert processor.stats["memo_hits"] == 2
+    assert processor.stats["memo_misses"] == 3
+
+    # LRU de taille 2 : "a@example.com" a été évincé, "Lyon" est encore en cache.
+    processor.detect_entities_in_blocks(["Lyon", "a@example.com"])
+    assert engine.piped[3:] == ["a@example.com"]
+    assert processor.stats["memo_hits"] == 1
+    assert processor.stats["memo_misses"] == 1
+
+
+def test_regex_detector_matches_per_label_finditer_spans():
+    import re
+
+    from anonyfiles_core.anonymizer.ner_processor import (
+        _REGEX_SOURCES,
+        RegexEntityDetector,
+    )
+
+    samples = [
+        "",
+        "Paris",
+        "Jean Dupont",
+        "jean.dupont@example.com",
+        "0612345678@sms.example.fr",
+        "Né le 1er janvier 2020, tel 06 12 34 56 78",
+        "RDV 12/06/1980 puis 1980-06-12 ; IBAN FR76 3000 6000 0112 3456 7890 189",
+        "12 rue de la Paix, 75002 Paris.",
+        "Montant 1 200,50 €",
+        "contact: a@b.fr, b@c.org\n+33 6 12 34 56 78",
+    ]
+    labels = set(_REGEX_SOURCES)
+    detector = RegexEntityDetector(labels)
+
+    for text in samples:
+        expected = [
+            (label, match.start(), match.end())
+            for label, pattern in _REGEX_SOURCES.items()
+            for match in re.finditer(
+                pattern,
+                text,
+                re.IGNORECASE if label in {"ADDRESS", "DATE"} else 0,
+            )
+        ]
+        assert list(detector.finditer(text)) == expected, text
+
+    assert list(RegexEntityDetector({"PHONE"}).finditer("a@b.fr 0612345678")) == [
+        ("PHONE", 7, 17)
+    ]
+
+
+def test_gate_skips_spacy_for_blocks_ner_cannot_help():
+    engine = RecordingSpaCyEngine()
+    processor = NERProcessor(
+        engine, enabled_labels={"PER", "EMAIL"}, excluded_labels=set()
+    )
+
+    blocks = [
+        "a@example.com",
+        "12,50",
+        "OK",
+        "{{NOM_1}} [EMAIL_1]",
+        "Jean Dupont",
+        "Ambre",
+        "contacter jean",
+    ]
+    _unique, per_block = processor.detect_entities_in_blocks(blocks)
+
+    assert engine.piped == ["Jean Dupont", "Ambre"]
+    assert per_block[0] == [("a@example.com", "EMAIL", 0, 13)]
+    assert processor.stats["gate_skipped_blocks"] == 5
+    assert processor.stats["spacy_blocks"] == 2
+
+
+def test_packed_blocks_map_entities_back_and_drop_cross_separator_spans():
+    class PackingSpaCyEngine(RecordingSpaCyEngine):
+        def find_entities(self, text):
+            found = super().find_entities(text)
+            # Entité factice à cheval sur le séparateur "Lyon\n\nMarie".
+            start = text.find("Lyon\n\nMarie")
+            if start != -1:
+                found.append(FakeEntity("", "LOC", start, start + 11))
+            return found
+
+    engine = PackingSpaCyEngine(names=("Jean Dupont", "Marie"))
+    processor = NERProcessor(
+        engine, enabled_labels={"PER", "LOC"}, excluded_labels=set(), pack_size=40
+    )
+
+    blocks = ["Jean Dupont", "Lyon", "Marie", "Paris", "A" * 70]
+    _unique, per_block = processor.detect_entities_in_blocks(blocks)
+
+    assert engine.piped == ["Jean Dupont\n\nLyon\n\nMarie\n\nParis", "A" * 70]
+    assert per_block == [
+        [("Jean Dupont", "PER", 0, 11)],
+        [],
+        [("Marie", "PER", 0, 5)],
+        [],
+        [],
+    ]
+    assert processor.stats["packed_docs"] == 1
+    assert processor.stats["packed_blocks"] == 4
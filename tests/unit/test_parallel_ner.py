@@ -0,0 +1,155 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from anonyfiles_core.anonymizer import parallel_ner
+from anonyfiles_core.anonymizer.engine import AnonyfilesEngine
+from anonyfiles_core.anonymizer.ner_processor import NERProcessor
+
+
+class FakeSpaCyEngine:
+    def nlp_pipe(self, texts, batch_size=256):
+        return (SimpleNamespace(ents=[]) for _text in texts)
+
+
+def test_shard_bounds_are_contiguous_and_cover_all_blocks():
+    bounds = list(parallel_ner.iter_shard_bounds(10, 4))
+
+    assert bounds == [(0, 3), (3, 6), (6, 8), (8, 10)]
+    assert list(parallel_ner.iter_shard_bounds(2, 8)) == [(0, 1), (1, 2)]
+    assert list(parallel_ner.iter_shard_bounds(0, 4)) == []
+
+
+def test_parallel_detection_matches_single_process_output(monkeypatch):
+    monkeypatch.setattr(parallel_ner, "_WORKER_SPACY_ENGINE", FakeSpaCyEngine())
+    options = {
+        "enabled_labels": {"PER", "EMAIL", "PHONE"},
+        "excluded_labels": set(),
+        "strict_mode": True,
+        "batch_size": 8,
+    }
+    blocks = [
+        "Pierre",
+        "",
+        "pierre@example.com",
+        "Tel: 06 12 34 56 78",
+        "Ambre",
+        "pierre@example.com",
+        "   ",
+        "Contact: Ambre",
+    ] * 5
+
+    expected = NERProcessor(FakeSpaCyEngine(), **options).detect_entities_in_blocks(
+        blocks
+    )
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        unique, per_block, stats = parallel_ner.detect_entities_in_blocks_parallel(
+            blocks,
+            model_name="fake",
+            processor_options=options,
+            workers=3,
+            executor=executor,
+        )
+
+    assert (unique, per_block) == expected
+    assert stats["mode"] == "parallel"
+    assert stats["workers"] == 3
+    assert stats["shards"] == 3 * parallel_ner.SHARDS_PER_WORKER
+    assert stats["blocks"] == len(blocks)
+
+
+class LastSubmittedFirstExecutor(ThreadPoolExecutor):
+    """Les premières tranches soumises sont les dernières terminées."""
+
+    def __init__(self):
+        super().__init__(max_workers=16)
+        self.submitted = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        delay = 0.2 / (self.submitted + 1)
+        self.submitted += 1
+
+        def delayed():
+            time.sleep(delay)
+            return fn(*args, **kwargs)
+
+        return super().submit(delayed)
+
+
+def test_part_shards_never_straddle_two_sheets():
+    parts = [("Clients", 7), ("Vide", 0), ("Notes", 2), ("Export", 3)]
+
+    bounds = list(parallel_ner.iter_part_shard_bounds(parts, 12, 4))
+
+    assert bounds == [(0, 3), (3, 5), (5, 7), (7, 9), (9, 12)]
+
+
+def test_sheet_shards_merge_in_file_order_whatever_the_completion_order(
+    monkeypatch,
+):
+    monkeypatch.setattr(parallel_ner, "_WORKER_SPACY_ENGINE", FakeSpaCyEngine())
+    options = {
+        "enabled_labels": {"PER", "EMAIL"},
+        "excluded_labels": set(),
+        "strict_mode": True,
+        "batch_size": 8,
+    }
+    blocks = [f"client{index % 5}@example.com" for index in range(30)]
+    expected = NERProcessor(FakeSpaCyEngine(), **options).detect_entities_in_blocks(
+        blocks
+    )
+
+    with LastSubmittedFirstExecutor() as executor:
+        unique, per_block, stats = parallel_ner.detect_entities_in_blocks_parallel(
+            blocks,
+            model_name="fake",
+            processor_options=options,
+            workers=2,
+            executor=executor,
+            parts=[("S1", 10), ("S2", 15), ("S3", 5)],
+        )
+
+    assert (unique, per_block) == expected
+    assert stats["parts"] == 3
+    assert stats["shards"] == 9  # taille cible 4 : 3 + 4 + 2 tranches
+
+
+def test_engine_shards_workbooks_by_sheet(monkeypatch, tmp_path):
+    pd = pytest.importorskip("pandas")
+    monkeypatch.setattr(
+        "anonyfiles_core.anonymizer.engine.SpaCyEngine",
+        lambda model: FakeSpaCyEngine(),
+    )
+    captured = {}
+
+    def fake_parallel(text_blocks, *, parts=None, **kwargs):
+        captured["parts"] = parts
+        return [], [[] for _block in text_blocks], {"mode": "parallel"}
+
+    monkeypatch.setattr(
+        "anonyfiles_core.anonymizer.engine.detect_entities_in_blocks_parallel",
+        fake_parallel,
+    )
+    input_path = tmp_path / "input.xlsx"
+    with pd.ExcelWriter(input_path) as writer:
+        pd.DataFrame([["Alice", "Paris"], ["Bob", None]]).to_excel(
+            writer, sheet_name="Clients", header=False, index=False
+        )
+        pd.DataFrame([["Note"]]).to_excel(
+            writer, sheet_name="Notes", header=False, index=False
+        )
+    engine = AnonyfilesEngine(config={"ner_workers": 2, "ner_parallel_min_blocks": 1})
+
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=None,
+        entities=None,
+        dry_run=True,
+        log_entities_path=None,
+        mapping_output_path=None,
+    )
+
+    assert result["status"] == "success"
+    assert captured["parts"] == [("Clients", 3), ("Notes", 1)]
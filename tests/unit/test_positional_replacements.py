@@ -0,0 +1,30 @@
+from anonyfiles_core.anonymizer.utils import (
+    apply_positional_replacements,
+    apply_positional_replacements_with_spans,
+)
+
+
+def test_with_spans_shifts_carried_token_spans():
+    text = "Jean voit [ORG_1] puis Paul."
+    entities = [("Jean", "PER", 0, 4), ("Paul", "PER", 23, 27)]
+    replacements = {"Jean": "NOM_0001", "Paul": "NOM_0002"}
+
+    output, spans = apply_positional_replacements_with_spans(
+        text, replacements, entities, [(10, 17)]
+    )
+
+    assert output == apply_positional_replacements(text, replacements, entities)
+    assert [output[start:end] for start, end in spans] == [
+        "NOM_0001",
+        "[ORG_1]",
+        "NOM_0002",
+    ]
+
+
+def test_with_spans_skips_unchanged_entities():
+    output, spans = apply_positional_replacements_with_spans(
+        "Jean", {}, [("Jean", "PER", 0, 4)]
+    )
+
+    assert output == "Jean"
+    assert spans == []
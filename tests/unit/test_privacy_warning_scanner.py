@@ -44,3 +44,65 @@ def test_scanner_respects_disabled_labels():
 
     by_kind = {warning["kind"]: warning for warning in warnings}
     assert set(by_kind) == {"EMAIL"}
+
+
+def test_scanner_masks_only_given_placeholder_spans():
+    block = "[KMCL] KMCL"
+    warnings = scan_blocks_for_privacy_warnings(
+        [block],
+        enabled_labels={"ORG", "MISC"},
+        placeholder_spans=[[(0, 6)]],
+    )
+
+    assert warnings[0]["kind"] == "UPPERCASE_TOKEN"
+    assert warnings[0]["count"] == 1
+
+
+def test_scanner_accepts_sparse_spans_by_block():
+    blocks = ["[KMCL] ACME", "[ZZTP]"]
+    warnings = scan_blocks_for_privacy_warnings(
+        blocks,
+        enabled_labels={"ORG", "MISC"},
+        placeholder_spans={0: [(0, 6)]},
+        source_blocks=blocks,
+        replaced_spans={},
+    )
+
+    # Bloc absent du dict : aucun span masqué, pas de repli sur la regex.
+    assert warnings[0]["kind"] == "UPPERCASE_TOKEN"
+    assert sorted(warnings[0]["examples"]) == ["ACME", "ZZTP"]
+
+
+def test_scanner_rechecks_only_replaced_lines_with_same_result():
+    source = "\n".join(
+        ["Jean Dupont appelle le 06 12 34 56 78."]
+        + [f"Ligne {index} : rien à signaler." for index in range(50)]
+        + ["Écrire à KMCL, 12 rue de la Paix."]
+    )
+    final = source.replace("Jean Dupont", "NOM_1", 1)
+    enabled = {"PER", "ORG", "MISC", "PHONE", "ADDRESS"}
+
+    full_scan = scan_blocks_for_privacy_warnings(
+        [final], enabled_labels=enabled, placeholder_spans=[[(0, 5)]]
+    )
+    rechecked = scan_blocks_for_privacy_warnings(
+        [final],
+        enabled_labels=enabled,
+        placeholder_spans=[[(0, 5)]],
+        source_blocks=[source],
+        replaced_spans=[[(0, 11, 5)]],
+    )
+
+    assert rechecked == full_scan
+    by_kind = {warning["kind"]: warning for warning in rechecked}
+    assert set(by_kind) == {"PHONE", "ADDRESS", "UPPERCASE_TOKEN"}
+
+
+def test_scanner_masks_candidates_overlapping_ignored_values():
+    warnings = scan_blocks_for_privacy_warnings(
+        ["Réf. ACME-KMCL et ZORG"],
+        enabled_labels={"ORG"},
+        ignored_values={"CME-KM", "RG"},
+    )
+
+    assert warnings == []
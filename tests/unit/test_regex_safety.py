@@ -0,0 +1,162 @@
+import re
+import time
+
+import pytest
+
+from anonyfiles_core.anonymizer import (
+    ner_processor,
+    privacy_warning_scanner,
+    regex_safety,
+    spacy_engine,
+)
+from anonyfiles_core.anonymizer.audit import AuditLogger
+from anonyfiles_core.anonymizer.custom_rules_processor import CustomRulesProcessor
+from anonyfiles_core.anonymizer.regex_safety import (
+    SCREEN_CONSTANT_NAMES,
+    CustomRuleTimeoutError,
+    UnsafeCustomRuleError,
+    has_nested_quantifiers,
+)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"(a+)+b", r"(a*)*", r"(\w+\s?)+$", r"(x+x+)+y", r"(\d+\w){0,8}"],
+)
+def test_nested_quantifiers_are_flagged(pattern):
+    assert has_nested_quantifiers(pattern, re.IGNORECASE)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"\d{4}-\d{4}",
+        r"(\w+\.)+",
+        r"[\w.-]+@([\w-]+\.)+\w+",
+        r"(\d{1,3}\.){3}\d{1,3}",
+        r"(?:[ \t]+\w+){0,8}",
+        r"(\s+\w+)+",
+        r"(\w++\s?)+",
+        r"(a|aa)+b",
+    ],
+)
+def test_separated_or_simple_repeats_are_accepted(pattern):
+    assert not has_nested_quantifiers(pattern, re.IGNORECASE)
+
+
+def test_builtin_regexes_pass_the_static_screening():
+    patterns = [
+        value
+        for module in (ner_processor, privacy_warning_scanner)
+        for value in vars(module).values()
+        if isinstance(value, re.Pattern)
+    ]
+    patterns += [
+        re.compile(source, ner_processor._REGEX_FLAGS.get(label, 0))
+        for label, source in ner_processor._REGEX_SOURCES.items()
+    ]
+
+    assert patterns
+    assert not [
+        p.pattern for p in patterns if has_nested_quantifiers(p.pattern, p.flags)
+    ]
+
+
+def test_re_internals_used_by_the_screen_still_exist():
+    # Échoue bruyamment si une version de Python renomme ou retire les opcodes
+    # lus par le filtrage statique : sans eux, seul le budget de temps protège.
+    from re import _constants, _parser  # type: ignore[attr-defined]
+
+    missing = [name for name in SCREEN_CONSTANT_NAMES if not hasattr(_constants, name)]
+    assert not missing, f"Opcodes absents de re._constants : {missing}"
+    assert hasattr(_parser, "parse") and hasattr(_parser, "SubPattern")
+    assert regex_safety.STATIC_SCREEN_AVAILABLE
+
+
+def test_without_static_screen_the_budget_still_applies(monkeypatch):
+    monkeypatch.setattr(regex_safety, "STATIC_SCREEN_AVAILABLE", False)
+    assert not has_nested_quantifiers(r"(a+)+b", re.IGNORECASE)
+
+    processor = CustomRulesProcessor(
+        [{"pattern": r"(a|aa)+b", "replacement": "[X]", "isRegex": True}],
+        AuditLogger(),
+        regex_timeout=0.05,
+    )
+    with pytest.raises(CustomRuleTimeoutError, match="index 0"):
+        processor.apply_to_block("a" * 60)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        re.compile(spacy_engine.EMAIL_REGEX),
+        ner_processor._STRICT_EMAIL_OBFUSCATED_RE,
+        privacy_warning_scanner._OBFUSCATED_EMAIL_RE,
+    ],
+)
+def test_email_patterns_match_whole_address_or_nothing(pattern):
+    address = "x.y-" + "a" * 60 + "@ex.com"  # partie locale de 64 caractères
+
+    assert [m.group() for m in pattern.finditer(f"Écrire à {address}.")] == [address]
+    assert [m.group() for m in pattern.finditer("cc +x@ex.com")] == ["+x@ex.com"]
+    # Au-delà de 64 caractères, pas de correspondance partielle (préfixe en clair).
+    assert not pattern.search("x.y-" + "a" * 61 + "@ex.com")
+    assert not pattern.search("a" * 70 + "@ex.com")
+
+
+def test_unsafe_rule_is_rejected_with_its_index():
+    with pytest.raises(UnsafeCustomRuleError, match="index 1"):
+        CustomRulesProcessor(
+            [
+                {"pattern": "ACME", "replacement": "[ORG]"},
+                {"pattern": r"(a+)+b", "replacement": "[X]", "isRegex": True},
+            ],
+            AuditLogger(),
+        )
+
+
+def test_catastrophic_regex_is_interrupted_by_the_budget():
+    processor = CustomRulesProcessor(
+        [{"pattern": r"(a|aa)+b", "replacement": "[X]", "isRegex": True}],
+        AuditLogger(),
+        regex_timeout=0.05,
+    )
+
+    started = time.monotonic()
+    with pytest.raises(CustomRuleTimeoutError, match="index 0") as excinfo:
+        processor.apply_to_block("a" * 60)
+
+    assert excinfo.value.rule_index == 0
+    assert time.monotonic() - started < 5
+
+
+def test_engine_reports_timed_out_rule_as_job_error(monkeypatch, tmp_path):
+    from anonyfiles_core.anonymizer.engine import AnonyfilesEngine
+
+    class FakeSpaCyEngine:
+        def __init__(self, model):
+            self.model = model
+
+    monkeypatch.setattr(
+        "anonyfiles_core.anonymizer.engine.SpaCyEngine", FakeSpaCyEngine
+    )
+    input_path = tmp_path / "input.txt"
+    input_path.write_text("a" * 60, encoding="utf-8")
+    engine = AnonyfilesEngine(
+        config={"spacy_model": "fake", "custom_regex_timeout": 0.05},
+        custom_replacement_rules=[
+            {"pattern": r"(a|aa)+b", "replacement": "[X]", "isRegex": True}
+        ],
+    )
+
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=tmp_path / "output.txt",
+        entities=None,
+        dry_run=True,
+        log_entities_path=None,
+        mapping_output_path=None,
+    )
+
+    assert result["status"] == "error"
+    assert "index 0" in result["error"]
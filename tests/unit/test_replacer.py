@@ -28,3 +28,13 @@ def test_generate_replacements_with_rules():
     assert mapping["Jean"] == "{{PERS_001}}"
     assert replacements["ACME"] == "{ORGANIZATION:ACME}"
     assert replacements["01/01/2020"] == "{{DATE_REMOVED_1}}"
+
+
+def test_codes_keep_counting_across_calls():
+    session = ReplacementSession()
+
+    first, _ = session.generate_replacements([("Jean", "PER"), ("Marie", "PER")])
+    second, _ = session.generate_replacements([("Marie", "PER"), ("Paul", "PER")])
+
+    assert first == {"Jean": "{{NOM_001}}", "Marie": "{{NOM_002}}"}
+    assert second == {"Marie": "{{NOM_002}}", "Paul": "{{NOM_003}}"}
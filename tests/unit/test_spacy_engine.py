@@ -80,3 +80,53 @@ def test_load_model_failure_raises_configuration_error():
         spacy_engine.SpaCyEngine(model="missing")
     msg = str(exc.value)
     assert "python -m spacy download missing" in msg
+
+
+def _blank_pipeline():
+    import spacy
+
+    nlp = spacy.blank("fr")
+    nlp.add_pipe("ner")
+    nlp.initialize()
+    return nlp
+
+
+def test_pipeline_snapshot_is_written_then_reused(monkeypatch, tmp_path):
+    spacy_engine._load_spacy_model_cached.cache_clear()
+    monkeypatch.setenv("ANONYFILES_SPACY_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        spacy_engine, "_read_model_meta", lambda _name: {"version": "1.0"}
+    )
+    loads = []
+
+    def load_installed(name):
+        loads.append(name)
+        return _blank_pipeline()
+
+    monkeypatch.setattr(spacy_engine, "_load_installed_model", load_installed)
+
+    first = spacy_engine._load_spacy_model_cached("blank_fr")
+    stats = spacy_engine.model_load_stats("blank_fr")
+    assert stats["source"] == "model" and stats["snapshot_saved"] is True
+    assert (tmp_path / stats["snapshot_path"]).is_dir()
+
+    spacy_engine._load_spacy_model_cached.cache_clear()
+    second = spacy_engine._load_spacy_model_cached("blank_fr")
+
+    assert loads == ["blank_fr"]
+    assert spacy_engine.model_load_stats("blank_fr")["source"] == "snapshot"
+    assert second.pipe_names == first.pipe_names == ["entity_ruler", "ner"]
+    doc = second("Écrire à jean.dupont@example.com")
+    assert [(ent.text, ent.label_) for ent in doc.ents] == [
+        ("jean.dupont@example.com", "EMAIL")
+    ]
+    spacy_engine._load_spacy_model_cached.cache_clear()
+
+
+def test_pipeline_snapshot_can_be_disabled(monkeypatch, tmp_path):
+    monkeypatch.setenv("ANONYFILES_SPACY_SNAPSHOT_DIR", "off")
+    monkeypatch.setattr(
+        spacy_engine, "_read_model_meta", lambda _name: {"version": "1.0"}
+    )
+
+    assert spacy_engine.spacy_snapshot_path("blank_fr") is None
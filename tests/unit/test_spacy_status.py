@@ -64,3 +64,28 @@ def test_format_spacy_status_for_error_is_actionable(monkeypatch):
 
     assert "python -m spacy download fr_core_news_md" in message
     assert "python -m spacy validate" in message
+
+
+def test_get_spacy_status_reports_cold_start_of_loaded_model(monkeypatch):
+    import sys
+    from types import SimpleNamespace
+
+    fake_engine = SimpleNamespace(
+        model_load_stats=lambda _name: {
+            "seconds": 0.4,
+            "source": "snapshot",
+            "snapshot_path": "/cache/fr_core_news_md",
+            "snapshot_saved": False,
+        }
+    )
+    monkeypatch.setitem(
+        sys.modules, "anonyfiles_core.anonymizer.spacy_engine", fake_engine
+    )
+    monkeypatch.setattr(spacy_status, "_distribution_version", lambda _name: None)
+    monkeypatch.setattr(spacy_status, "_find_module", lambda _name: False)
+
+    cold_start = spacy_status.get_spacy_status("fr_core_news_md")["cold_start"]
+
+    assert cold_start["loaded"] is True
+    assert cold_start["source"] == "snapshot"
+    assert cold_start["seconds"] == 0.4
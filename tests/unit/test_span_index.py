@@ -0,0 +1,40 @@
+import random
+
+from anonyfiles_core.anonymizer.span_index import SpanIndex
+
+
+def test_span_index_matches_linear_overlap_scan():
+    rng = random.Random(7)
+    for _ in range(300):
+        spans: list[tuple[int, int]] = []
+        index = SpanIndex()
+        for _ in range(rng.randint(0, 25)):
+            start = rng.randint(0, 60)
+            end = start + rng.randint(0, 8)
+            query_start = rng.randint(0, 70)
+            query_end = query_start + rng.randint(0, 8)
+            expected = any(
+                query_start < existing_end and query_end > existing_start
+                for existing_start, existing_end in spans
+            )
+            assert index.overlaps(query_start, query_end) is expected
+            spans.append((start, end))
+            index.add(start, end)
+
+
+def test_adjacent_spans_do_not_overlap():
+    index = SpanIndex([(0, 5), (5, 8)])
+
+    assert len(index) == 2
+    assert not index.overlaps(8, 10)
+    assert not index.overlaps(5, 5)
+    assert index.overlaps(4, 6)
+
+
+def test_gaps_lists_uncovered_intervals():
+    index = SpanIndex([(2, 4), (6, 9), (9, 12)])
+
+    assert list(index.gaps(0, 15)) == [(0, 2), (4, 6), (12, 15)]
+    assert list(index.gaps(3, 10)) == [(4, 6)]
+    assert list(index.gaps(6, 12)) == []
+    assert list(SpanIndex().gaps(1, 3)) == [(1, 3)]
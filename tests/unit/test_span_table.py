@@ -0,0 +1,94 @@
+import tracemalloc
+
+from anonyfiles_core.anonymizer.engine import (
+    add_manual_entities_to_detected_entities,
+    apply_entity_decisions_to_detected_entities,
+)
+from anonyfiles_core.anonymizer.span_table import SpanTable
+from anonyfiles_core.anonymizer.utils import apply_positional_replacements
+
+
+def test_span_table_round_trips_blocks():
+    blocks = [
+        [("Jean Dupont", "PER", 0, 11), ("Paris", "LOC", 15, 20)],
+        [],
+        [("Paris", "LOC", 3, 8)],
+    ]
+
+    table = SpanTable.from_blocks(blocks)
+
+    assert len(table) == 3
+    assert table.span_count == 3
+    assert list(table) == blocks
+    assert table[0] == blocks[0]
+    assert table[1] == []
+    assert table[-1] == blocks[2]
+    assert table[1:] == blocks[1:]
+    assert len(table.texts) == 2
+    assert table.block_span_count(0) == 2
+
+
+def test_span_table_is_accepted_by_entity_pipeline():
+    table = SpanTable.from_blocks(
+        [[("Jean", "PER", 0, 4)], [("ACME", "ORG", 0, 4), ("Paris", "LOC", 9, 14)]]
+    )
+
+    unique, filtered = apply_entity_decisions_to_detected_entities(
+        table, ignored_entity_texts={"Paris"}
+    )
+    unique, enriched = add_manual_entities_to_detected_entities(
+        ["Jean voit Lea", "ACME PDG"],
+        filtered,
+        manual_entities=[{"text": "Lea", "label": "PER"}],
+    )
+
+    assert isinstance(enriched, SpanTable)
+    assert list(enriched) == [
+        [("Jean", "PER", 0, 4), ("Lea", "PER", 10, 13)],
+        [("ACME", "ORG", 0, 4)],
+    ]
+    assert unique == [("Jean", "PER"), ("Lea", "PER"), ("ACME", "ORG")]
+    assert (
+        apply_positional_replacements(
+            "Jean voit Lea", {"Jean": "PER_1", "Lea": "PER_2"}, enriched.iter_block(0)
+        )
+        == "PER_1 voit PER_2"
+    )
+
+
+def _traced_size(build):
+    tracemalloc.start()
+    try:
+        value = build()
+        size, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del value
+    return size
+
+
+def test_span_table_uses_less_memory_than_tuple_lists():
+    cells = [f"Client Jean Dupont {i % 50} à Paris" for i in range(20_000)]
+
+    def build_lists():
+        # Comme le NER : une chaîne découpée par occurrence.
+        return [
+            [
+                (cell[7:18], "PER", 7, 18),
+                (cell[cell.index("Paris") :], "LOC", cell.index("Paris"), len(cell)),
+            ]
+            for cell in cells
+        ]
+
+    def build_lists_lazily():
+        for cell in cells:
+            paris = cell.index("Paris")
+            yield [(cell[7:18], "PER", 7, 18), (cell[paris:], "LOC", paris, len(cell))]
+
+    def build_table():
+        return SpanTable.from_blocks(build_lists_lazily())
+
+    lists_size = _traced_size(build_lists)
+    table_size = _traced_size(build_table)
+
+    assert table_size * 4 < lists_size
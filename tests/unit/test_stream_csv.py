@@ -0,0 +1,105 @@
+import pytest
+
+from anonyfiles_core.anonymizer.engine import AnonyfilesEngine
+
+
+class FakeDoc:
+    ents = []
+
+
+class FakeSpaCyEngine:
+    def __init__(self, model):
+        self.model = model
+
+    def nlp_pipe(self, texts, batch_size=256):
+        for _text in texts:
+            yield FakeDoc()
+
+
+def _anonymize(tmp_path, input_path, name, config):
+    engine = AnonyfilesEngine(config=config)
+    output_path = tmp_path / f"{name}.csv"
+    mapping_path = tmp_path / f"{name}_mapping.csv"
+    result = engine.anonymize(
+        input_path=input_path,
+        output_path=output_path,
+        entities=None,
+        dry_run=False,
+        log_entities_path=None,
+        mapping_output_path=mapping_path,
+        has_header=True,
+    )
+    return result, output_path.read_text(encoding="utf-8"), mapping_path
+
+
+def test_chunked_csv_matches_whole_file_processing(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "anonyfiles_core.anonymizer.engine.SpaCyEngine", FakeSpaCyEngine
+    )
+    input_path = tmp_path / "input.csv"
+    rows = ["id,email,commentaire"]
+    for index in range(50):
+        email = f"client{index % 7}@example.com"
+        note = "" if index % 3 else f"rappeler {email}"
+        rows.append(f"{index},{email},{note}")
+    input_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+
+    whole, whole_output, whole_mapping = _anonymize(tmp_path, input_path, "whole", {})
+    chunked, chunked_output, chunked_mapping = _anonymize(
+        tmp_path, input_path, "chunked", {"stream_chunk_rows": 4}
+    )
+
+    assert chunked["status"] == "success"
+    assert chunked_output == whole_output
+    assert chunked_mapping.read_bytes() == whole_mapping.read_bytes()
+    assert chunked["entities_detected"] == whole["entities_detected"]
+    assert chunked["total_replacements"] == whole["total_replacements"]
+    # Profil établi sur la première tranche, cellules comptées sur tout le fichier.
+    assert [
+        (profile["column"], profile["cells"]) for profile in chunked["column_profiles"]
+    ] == [(profile["column"], profile["cells"]) for profile in whole["column_profiles"]]
+    assert chunked["detection_stats"]["stream_chunks"] == 13
+    assert (
+        chunked["detection_stats"]["empty_blocks_skipped"]
+        == whole["detection_stats"]["empty_blocks_skipped"]
+    )
+    # Même code pour une entité vue dans la première et la dernière tranche.
+    assert whole_output.splitlines()[1].split(",")[1] == (
+        whole_output.splitlines()[50].split(",")[1]
+    )
+
+
+class FailingSpaCyEngine(FakeSpaCyEngine):
+    calls = 0
+
+    def nlp_pipe(self, texts, batch_size=256):
+        FailingSpaCyEngine.calls += 1
+        if FailingSpaCyEngine.calls > 1:
+            raise OSError("No space left on device")
+        yield from super().nlp_pipe(texts, batch_size)
+
+
+def test_chunked_csv_removes_partial_output_on_any_error(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "anonyfiles_core.anonymizer.engine.SpaCyEngine", FailingSpaCyEngine
+    )
+    input_path = tmp_path / "input.csv"
+    rows = ["id,commentaire"] + [f"{index},texte {index}" for index in range(20)]
+    input_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    output_path = tmp_path / "output.csv"
+    engine = AnonyfilesEngine(config={"stream_chunk_rows": 4})
+
+    with pytest.raises(OSError):
+        engine.anonymize(
+            input_path=input_path,
+            output_path=output_path,
+            entities=None,
+            dry_run=False,
+            log_entities_path=None,
+            mapping_output_path=None,
+            has_header=True,
+        )
+
+    # La première tranche a été écrite avant l'erreur : le fichier est supprimé.
+    assert FailingSpaCyEngine.calls == 2
+    assert not output_path.exists()